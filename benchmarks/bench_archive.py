@@ -0,0 +1,113 @@
+"""
+Measures archive compression ratios and encode/decode throughput on synthetic data.
+
+Builds a synthetic database, archives all of it with each compressor, and reports
+the stored size against the raw row size and the VACUUMed database file, plus
+rows per second for archiving and for streaming the archive back:
+
+    python -m benchmarks.bench_archive --days 30 --cells 3 --rate 1
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from time import perf_counter
+from typing import Any, Dict
+from benchmarks.synthetic import generate_database
+from database.archive import ArchiveStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+
+_TABLES = (SensorDatabase.get_sensor_table_name(), SensorDatabase.get_cell_output_table_name())
+
+
+def _vacuumed_size(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM;")
+    conn.close()
+    return os.path.getsize(db_path)
+
+
+def bench_compression(source: str, work_dir: str, compression: str, block_rows: int) -> Dict[str, Any]:
+    """
+    Archives a copy of the source database and streams every archived row back.
+    """
+    db_path = os.path.join(work_dir, f"{compression}.db")
+    shutil.copy(source, db_path)
+
+    db = SensorDatabase(db_path)
+    store = ArchiveStore(db, block_rows=block_rows, compression=compression)
+    started = perf_counter()
+    totals = {table: store.archive(table, "9999-12-31T23:59:59") for table in _TABLES}
+    encode_seconds = perf_counter() - started
+    db.close_conn()
+
+    reader = SensorDataReader(db_path, read_only=True)
+    started = perf_counter()
+    decoded = sum(
+        1 for table in _TABLES for _ in reader.iter_data_between(table, "0000-01-01T00:00:00", "9999-12-31T23:59:59")
+    )
+    decode_seconds = perf_counter() - started
+    reader.close()
+
+    rows = sum(total["rows"] for total in totals.values())
+    return {
+        "rows": rows,
+        "decoded_rows": decoded,
+        "ratio_vs_raw": {
+            table: round(total["raw_bytes"] / max(total["stored_bytes"], 1), 2) for table, total in totals.items()
+        },
+        "stored_bytes": sum(total["stored_bytes"] for total in totals.values()),
+        "file_bytes_after_vacuum": _vacuumed_size(db_path),
+        "encode_rows_per_second": round(rows / encode_seconds),
+        "decode_rows_per_second": round(decoded / decode_seconds),
+    }
+
+
+def run(days: int, cells: int, rate: int, block_rows: int) -> Dict[str, Any]:
+    """
+    Runs the benchmark for every compressor.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable sizes, ratios and throughputs.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, "source.db")
+        rows = generate_database(source, days=days, cells=cells, rate_per_minute=rate)
+        baseline = SensorDataReader(source, read_only=True)
+        started = perf_counter()
+        live_rows = sum(
+            1 for table in _TABLES for _ in baseline.iter_data_between(table, "0000-01-01T00:00:00", "9999-12-31T23:59:59")
+        )
+        live_seconds = perf_counter() - started
+        baseline.close()
+        return {
+            "parameters": {"days": days, "cells": cells, "rate_per_minute": rate, "block_rows": block_rows},
+            "rows": rows,
+            "sqlite_file_bytes": _vacuumed_size(source),
+            "sqlite_read_rows_per_second": round(live_rows / live_seconds),
+            "archive": {
+                compression: bench_compression(source, work_dir, compression, block_rows)
+                for compression in ("zlib", "lzma")
+            },
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=1, help="Samples per minute per series.")
+    parser.add_argument("--block-rows", type=int, default=4096, help="Readings per archive block.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.cells, args.rate, args.block_rows), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compares the SQLite and columnar storage backends on synthetic INA219 capture.
+
+Measures batched ingest rate, size on disk and range-read latency, and prints the
+results as JSON:
+
+    python -m benchmarks.bench_backends --days 2 --cells 3 --rate 60
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Dict, List, Any
+from database.backend import StorageBackend
+from database.columnar import ColumnarStore
+from database.db import SensorDatabase
+from database.timestamps import iso_to_micros
+from benchmarks.synthetic import synthetic_cell_rows
+
+
+def _size_of(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def bench_backend(
+    name: str,
+    backend: StorageBackend,
+    path: str,
+    records: List[Dict[str, Any]],
+    batch_size: int,
+    windows: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Ingests the records in batches and times range reads on one backend.
+    """
+    started = perf_counter()
+    for offset in range(0, len(records), batch_size):
+        backend.insert_cell_output_many(records[offset:offset + batch_size])
+    ingest_seconds = perf_counter() - started
+
+    table = SensorDatabase.get_cell_output_table_name()
+    read_latencies = []
+    for window in windows:
+        started = perf_counter()
+        backend.fetch_between(table, window["start"], window["end"])
+        read_latencies.append(perf_counter() - started)
+
+    result = {
+        "backend": name,
+        "rows": len(records),
+        "ingest_rows_per_s": len(records) / ingest_seconds,
+        "size_bytes": _size_of(path),
+        "range_read_ms": [latency * 1000 for latency in read_latencies],
+    }
+
+    if isinstance(backend, ColumnarStore):
+        # Array-level reads skip row materialisation entirely.
+        array_latencies = []
+        for window in windows:
+            started = perf_counter()
+            backend.read_range(table, iso_to_micros(window["start"]), iso_to_micros(window["end"]), cell_id="cell_1")
+            array_latencies.append(perf_counter() - started)
+        result["array_read_ms"] = [latency * 1000 for latency in array_latencies]
+
+    backend.close_conn()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=1, help="Days of synthetic capture.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=60, help="Samples per minute per cell.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert batch.")
+    args = parser.parse_args()
+
+    records = synthetic_cell_rows(args.days, args.cells, args.rate)
+    first, last = records[0]["timestamp"], records[-1]["timestamp"]
+    middle = records[len(records) // 2]["timestamp"]
+    windows = [
+        {"start": middle, "end": (datetime.fromisoformat(middle) + timedelta(minutes=1)).isoformat()},
+        {"start": middle, "end": (datetime.fromisoformat(middle) + timedelta(hours=1)).isoformat()},
+        {"start": first, "end": last},
+    ]
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        sqlite_path = os.path.join(work_dir, "bench.db")
+        columnar_path = os.path.join(work_dir, "columns")
+        results = [
+            bench_backend("sqlite", SensorDatabase(sqlite_path), sqlite_path, records, args.batch_size, windows),
+            bench_backend("columnar", ColumnarStore(columnar_path), columnar_path, records, args.batch_size, windows),
+        ]
+    finally:
+        shutil.rmtree(work_dir)
+
+    print(json.dumps({"parameters": vars(args), "windows": windows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Measures INA219 acquisition time versus cell count for different bus layouts.
+
+Simulated INA219s with a fixed per-transaction latency are spread over one bus,
+several buses, or TCA9548A channels on one bus, and run_cycle's INA219 phase is
+timed for each layout. Results are printed as JSON:
+
+    python -m benchmarks.bench_bus --cells 3 8 16 32 --buses 4 --latency-ms 1.5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+from statistics import median
+from time import perf_counter, sleep
+from typing import Any, Dict, List, Optional, Tuple
+from sensors.bus import BusTopology, DEFAULT_BUS
+
+
+class _NullBus:
+    """
+    Bus object that accepts multiplexer writes without any hardware.
+    """
+
+    def try_lock(self) -> bool:
+        return True
+
+    def unlock(self) -> None:
+        pass
+
+    def writeto(self, address, buffer, **kwargs) -> None:
+        pass
+
+
+class SimulatedINA219:
+    """
+    INA219 stand-in whose every register read takes `latency` seconds on its bus.
+    """
+
+    def __init__(self, i2c: Any, bus: str, latency: float) -> None:
+        self.i2c = i2c
+        self.bus = bus
+        self.latency = latency
+
+    def _read(self) -> float:
+        while not self.i2c.try_lock():
+            pass
+        try:
+            sleep(self.latency)
+            return 1.0
+        finally:
+            self.i2c.unlock()
+
+    def read_voltage(self) -> float:
+        return self._read()
+
+    def read_current(self) -> float:
+        return self._read()
+
+    def read_power(self) -> float:
+        return self._read()
+
+
+def _layout(layout: str, cells: int, buses: int) -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+    if layout == "single-bus":
+        return [(DEFAULT_BUS, None)] * cells
+    if layout == "multi-bus":
+        return [(f"i2c-{idx % buses + 1}", None) for idx in range(cells)]
+    # Eight channels per multiplexer, up to eight multiplexers on the default bus
+    return [(DEFAULT_BUS, (0x70 + idx // 8, idx % 8)) for idx in range(cells)]
+
+
+def bench_layout(layout: str, cells: int, buses: int, latency: float, cycles: int) -> float:
+    """
+    Returns the median seconds taken to read every cell once.
+    """
+    from main import run_cycle
+
+    class _Logger:
+        def log_data(self, **kwargs) -> None:
+            pass
+
+        def log_cell_output(self, **kwargs) -> None:
+            pass
+
+        def flush(self) -> None:
+            pass
+
+    class _Ambient:
+        def read(self):
+            return 21.0, 40.0
+
+        def read_lux(self) -> float:
+            return 100.0
+
+    topology = BusTopology(bus_factory=lambda name, scl, sda: _NullBus())
+    sensors = [
+        SimulatedINA219(topology.i2c(bus, mux), bus, latency)
+        for bus, mux in _layout(layout, cells, buses)
+    ]
+    durations = []
+    try:
+        for _ in range(cycles):
+            started = perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_cycle(_Ambient(), _Ambient(), sensors, _Logger(), topology)
+            durations.append(perf_counter() - started)
+    finally:
+        topology.close()
+    return median(durations)
+
+
+def run(cell_counts: List[int], buses: int, latency_ms: float, cycles: int) -> Dict[str, Any]:
+    """
+    Benchmarks every layout for every cell count.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable median cycle times in milliseconds.
+    """
+    latency = latency_ms / 1000
+    results: Dict[str, Dict[str, float]] = {}
+    for layout in ("single-bus", "multi-bus", "mux"):
+        results[layout] = {
+            str(cells): round(bench_layout(layout, cells, buses, latency, cycles) * 1000, 2)
+            for cells in cell_counts
+        }
+    return {
+        "parameters": {"buses": buses, "latency_ms": latency_ms, "cycles": cycles},
+        "cycle_ms": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cells", type=int, nargs="+", default=[3, 8, 16, 32], help="Cell counts to compare.")
+    parser.add_argument("--buses", type=int, default=4, help="Buses in the multi-bus layout.")
+    parser.add_argument("--latency-ms", type=float, default=1.5, help="Simulated time per register read.")
+    parser.add_argument("--cycles", type=int, default=5, help="Cycles per measurement.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.cells, args.buses, args.latency_ms, args.cycles), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares typed DataFrame loading with show_all_dataframes on a large synthetic database.
+
+For each method the load time, the peak Python heap allocation (tracemalloc) and
+the resulting DataFrames' deep memory footprint are reported, plus the time the
+untyped frames need for the date parsing every consumer otherwise repeats:
+
+    python -m benchmarks.bench_dataframes --days 90 --cells 3 --rate 1
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Dict
+import pandas as pd
+from benchmarks.synthetic import generate_database
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+
+_TABLES = (SensorDatabase.get_sensor_table_name(), SensorDatabase.get_cell_output_table_name())
+
+
+def _measure(load: Callable[[], Dict[str, pd.DataFrame]]) -> Dict[str, Any]:
+    """
+    Runs a loader once, recording its time, peak allocation and result size.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = perf_counter()
+    frames = load()
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 3),
+        "peak_memory_mb": round(peak / 2**20, 1),
+        "dataframe_memory_mb": round(sum(df.memory_usage(deep=True).sum() for df in frames.values()) / 2**20, 1),
+        "rows": sum(len(df) for df in frames.values()),
+    }
+
+
+def run(days: int, cells: int, rate: int) -> Dict[str, Any]:
+    """
+    Runs every loading variant against one synthetic database.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable timings and memory figures per variant.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(work_dir, "bench.db")
+        rows = generate_database(db_path, days=days, cells=cells, rate_per_minute=rate)
+        reader = SensorDataReader(db_path, read_only=True)
+
+        def untyped_then_parsed() -> Dict[str, pd.DataFrame]:
+            frames = reader.show_all_dataframes(print_dfs=False)
+            for df in frames.values():
+                df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+            return frames
+
+        def last_day_power() -> Dict[str, pd.DataFrame]:
+            end = reader.get_latest_entry(_TABLES[1])["timestamp"]
+            start = (pd.Timestamp(end) - pd.Timedelta(days=1)).isoformat()
+            return {"power": reader.load_dataframe(_TABLES[1], start, end, columns=["power"], float32=True, layout="wide")}
+
+        try:
+            results = {
+                "show_all_dataframes": _measure(lambda: reader.show_all_dataframes(print_dfs=False)),
+                "show_all_dataframes_plus_to_datetime": _measure(untyped_then_parsed),
+                "load_dataframe": _measure(lambda: {table: reader.load_dataframe(table) for table in _TABLES}),
+                "load_dataframe_float32": _measure(
+                    lambda: {table: reader.load_dataframe(table, float32=True) for table in _TABLES}
+                ),
+                "load_dataframe_wide_float32": _measure(
+                    lambda: {table: reader.load_dataframe(table, float32=True, layout="wide") for table in _TABLES}
+                ),
+                "load_dataframe_last_day_power": _measure(last_day_power),
+            }
+        finally:
+            reader.close()
+        return {
+            "parameters": {"days": days, "cells": cells, "rate_per_minute": rate},
+            "source_rows": rows,
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=1, help="Samples per minute per series.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.cells, args.rate), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measures the speedup of partitioned analytics and export versus the worker count.
+
+Builds a synthetic multi-month database, times the single-call SensorDataReader
+baseline and PartitionedExecutor with an increasing number of worker processes,
+and prints the results as JSON:
+
+    python -m benchmarks.bench_partitioned --days 90 --cells 3 --workers 1 2 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+from benchmarks.synthetic import generate_database
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.partitioned import PartitionedExecutor
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    started = perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    return perf_counter() - started
+
+
+def bench_baseline(db_path: str, work_dir: str) -> Dict[str, float]:
+    """
+    Times the existing single-threaded reader calls.
+    """
+    table = SensorDatabase.get_cell_output_table_name()
+    reader = SensorDataReader(db_path, read_only=True)
+    try:
+        return {
+            "aggregate_hourly": _timed(
+                lambda: reader.get_aggregates(table, "0000-01-01T00:00:00", "9999-12-31T23:59:59", 3600)
+            ),
+            "export_csv": _timed(lambda: reader.export_to_csv(
+                sensor_file=os.path.join(work_dir, "baseline", "sensor_data.csv"),
+                cell_file=os.path.join(work_dir, "baseline", "cell_output.csv"),
+                confirm=False,
+            )),
+        }
+    finally:
+        reader.close()
+
+
+def bench_workers(db_path: str, work_dir: str, workers: int) -> Dict[str, float]:
+    """
+    Times every partitioned operation with a fixed number of worker processes.
+    """
+    executor = PartitionedExecutor(db_path, max_workers=workers)
+    table = SensorDatabase.get_cell_output_table_name()
+    out_dir = os.path.join(work_dir, f"workers_{workers}")
+    return {
+        "aggregate_hourly": _timed(lambda: executor.aggregate(table, 3600)),
+        "export_csv": _timed(lambda: (
+            executor.export_csv(SensorDatabase.get_sensor_table_name(), os.path.join(out_dir, "sensor_data.csv")),
+            executor.export_csv(table, os.path.join(out_dir, "cell_output.csv")),
+        )),
+        "export_columnar": _timed(lambda: executor.export_columnar(table, os.path.join(out_dir, "npz"))),
+        "efficiency": _timed(lambda: executor.efficiency()),
+    }
+
+
+def run(days: int, cells: int, rate: int, worker_counts: List[int]) -> Dict[str, Any]:
+    """
+    Builds the synthetic database and runs the baseline and every worker count.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable timings (seconds) and speedups relative to one worker.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(work_dir, "partitioned.db")
+        rows = generate_database(db_path, days=days, cells=cells, rate_per_minute=rate)
+        timings = {str(workers): bench_workers(db_path, work_dir, workers) for workers in worker_counts}
+        reference = timings[str(min(worker_counts))]
+        return {
+            "parameters": {"days": days, "cells": cells, "rate_per_minute": rate, "cpu_count": os.cpu_count()},
+            "rows": rows,
+            "baseline": bench_baseline(db_path, work_dir),
+            "partitioned": timings,
+            "speedup": {
+                workers: {operation: reference[operation] / seconds for operation, seconds in results.items()}
+                for workers, results in timings.items()
+            },
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=1, help="Samples per minute per series.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.cells, args.rate, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Measures QualityValidator throughput and its share of a typed load.
+
+Validates synthetic arrays with injected DHT11 glitches, TSL2591 overflow zeros,
+duplicates and a clock step back, then times load_dataframe on a synthetic
+database with and without validation. Results are printed as JSON:
+
+    python -m benchmarks.bench_quality --rows 1000000 --cells 3 --days 30
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from time import perf_counter
+from typing import Any, Dict
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_database
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.quality import QualityValidator
+
+_TABLES = (SensorDatabase.get_sensor_table_name(), SensorDatabase.get_cell_output_table_name())
+
+
+def synthetic_arrays(rows: int, cells: int, seed: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds one minute-resolution array set per table with 0.1 % faulty readings,
+    0.01 % repeated rows, and the last 1 % of rows logged after the clock was set
+    back by an hour and a half minute.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = np.arange(rows, dtype=np.int64) * 60
+    step_back = rows - rows // 100
+    seconds[step_back:] -= 3630
+    # Repeated rows, e.g. a spool replayed into a backend without a primary key
+    rows_taken = np.sort(np.r_[np.arange(rows), rng.choice(rows, rows // 10000, replace=False)])
+    rows = len(rows_taken)
+    timestamps = (seconds[rows_taken] * 1_000_000_000).astype("datetime64[ns]")
+    faulty = rng.choice(rows, rows // 1000, replace=False)
+
+    temperature = 21 + rng.normal(0, 0.5, rows).round()
+    temperature[faulty] = 255.0
+    lux = rng.uniform(20000, 40000, rows)
+    lux[faulty[::2]] = 0.0
+    sensor = {"timestamp": timestamps, "lux": lux, "temperature": temperature, "humidity": 40 + rng.normal(0, 1, rows)}
+
+    cell_rows = rows * cells
+    cell = {
+        "timestamp": np.repeat(timestamps, cells),
+        "cell_id": pd.Categorical(np.tile([f"cell_{idx}" for idx in range(1, cells + 1)], rows)),
+        "voltage": rng.uniform(0.4, 0.7, cell_rows),
+        "current": rng.uniform(0, 2, cell_rows),
+        "power": rng.uniform(0, 1.4, cell_rows),
+    }
+    return {_TABLES[0]: sensor, _TABLES[1]: cell}
+
+
+def bench_arrays(rows: int, cells: int, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Best-of-`repeat` validation throughput per table.
+    """
+    validator = QualityValidator()
+    results = {}
+    for table, data in synthetic_arrays(rows, cells).items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = perf_counter()
+            cleaned = validator.validate(table, data)
+            best = min(best, perf_counter() - started)
+        results[table] = {
+            "rows": len(data["timestamp"]),
+            "seconds": round(best, 3),
+            "rows_per_second": round(len(data["timestamp"]) / best),
+            "flags": QualityValidator.describe(cleaned["quality"]),
+        }
+    return results
+
+
+def bench_load(days: int, cells: int) -> Dict[str, Any]:
+    """
+    Times load_dataframe on a synthetic database with and without validation.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(work_dir, "bench.db")
+        generate_database(db_path, days=days, cells=cells, rate_per_minute=1)
+        reader = SensorDataReader(db_path, read_only=True)
+        results = {}
+        try:
+            for validate in (False, True, False, True):
+                started = perf_counter()
+                rows = sum(len(reader.load_dataframe(table, validate=validate)) for table in _TABLES)
+                elapsed = round(perf_counter() - started, 3)
+                key = "validated" if validate else "raw"
+                # Best of two, the first raw load also warms the page cache
+                if key not in results or elapsed < results[key]["seconds"]:
+                    results[key] = {"rows": rows, "seconds": elapsed}
+        finally:
+            reader.close()
+        return results
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Sensor rows in the array benchmark.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--days", type=int, default=30, help="Days of synthetic history for the load benchmark.")
+    args = parser.parse_args()
+    print(json.dumps({
+        "parameters": {"rows": args.rows, "cells": args.cells, "days": args.days},
+        "validate": bench_arrays(args.rows, args.cells),
+        "load_dataframe": bench_load(args.days, args.cells),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
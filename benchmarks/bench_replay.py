@@ -0,0 +1,89 @@
+"""
+Measures end-to-end write throughput by replaying synthetic history through SensorLogger.
+
+A synthetic source database is replayed as fast as possible into scratch databases,
+once with direct inserts (a commit per reading) and once through the spool with
+different flush intervals, exercising the same code path as live acquisition.
+Results are printed as JSON:
+
+    python -m benchmarks.bench_replay --days 2 --cells 3 --rate 1 --flush-every 4 1000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+from benchmarks.synthetic import generate_database
+from database.data_access import SensorDataReader
+from logger.replay import ReplayEngine, VirtualClock, reader_events
+from logger.sensor_logger import SensorLogger
+
+
+def bench_replay(source: str, work_dir: str, name: str, flush_every: Optional[int]) -> Dict[str, Any]:
+    """
+    Replays the source database into a fresh scratch database.
+
+    Args:
+        source (str): Source database path.
+        work_dir (str): Directory for the scratch database and spool.
+        name (str): Scratch file name stem.
+        flush_every (Optional[int]): Spool flush interval; None writes without a spool.
+    """
+    clock = VirtualClock()
+    spool_path = os.path.join(work_dir, f"{name}.spool") if flush_every else None
+    logger = SensorLogger(db_path=os.path.join(work_dir, f"{name}.db"), spool_path=spool_path, clock=clock)
+    reader = SensorDataReader(source, read_only=True)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = ReplayEngine(logger, clock, flush_every=flush_every or 1).run(reader_events(reader))
+    finally:
+        reader.close()
+        logger.close()
+    return {
+        "rows": sum(stats["rows"].values()),
+        "wall_seconds": stats["wall_seconds"],
+        "rows_per_second": stats["rows_per_second"],
+        "speedup": stats["speedup"],
+    }
+
+
+def run(days: int, cells: int, rate: int, flush_intervals: List[int]) -> Dict[str, Any]:
+    """
+    Runs the benchmark without a spool and for every spool flush interval.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable throughputs per configuration.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, "source.db")
+        rows = generate_database(source, days=days, cells=cells, rate_per_minute=rate)
+        results = {"direct": bench_replay(source, work_dir, "direct", None)}
+        for flush_every in flush_intervals:
+            results[f"spool_flush_{flush_every}"] = bench_replay(source, work_dir, f"spool_{flush_every}", flush_every)
+        return {
+            "parameters": {"days": days, "cells": cells, "rate_per_minute": rate},
+            "source_rows": rows,
+            "replay": results,
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=2, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=1, help="Samples per minute per series.")
+    parser.add_argument("--flush-every", type=int, nargs="+", default=[4, 1000],
+                        help="Spool flush intervals in readings (4 matches one live cycle of 3 cells).")
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.cells, args.rate, args.flush_every), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares two benchmark JSON reports and flags regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.15
+
+Latency/time metrics regress when they grow, throughput metrics when they shrink.
+Exits with status 1 if any metric regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Any
+
+
+def flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """
+    Flattens nested result dictionaries into 'a/b/c' -> number.
+    """
+    flat: Dict[str, float] = {}
+    for key, value in report.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s") or metric.endswith("speedup")
+
+
+def _is_performance_metric(metric: str) -> bool:
+    leaf = metric.rsplit("/", 1)[-1]
+    return _higher_is_better(leaf) or leaf.endswith(("_ms", "seconds", "_mb"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", help="Report from the reference commit.")
+    parser.add_argument("candidate", help="Report from the commit under test.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression.")
+    args = parser.parse_args()
+
+    with open(args.baseline) as handle:
+        baseline = flatten(json.load(handle)["results"])
+    with open(args.candidate) as handle:
+        candidate = flatten(json.load(handle)["results"])
+
+    regressions = 0
+    for metric in sorted(set(baseline) & set(candidate)):
+        if not _is_performance_metric(metric) or baseline[metric] == 0:
+            continue
+        change = (candidate[metric] - baseline[metric]) / baseline[metric]
+        worse = -change if _higher_is_better(metric) else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{metric:70s} {baseline[metric]:14.4f} -> {candidate[metric]:14.4f} ({change:+.1%}){flag}")
+
+    print(f"[BENCH] {regressions} regression(s) above {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Load test for the local data service while the logger keeps acquiring.
+
+Builds a synthetic database, runs simulated acquisition cycles at a fixed rate and
+measures their latency first without and then with concurrent HTTP clients polling
+/latest, /range and /aggregates plus open /stream connections:
+
+    python -m benchmarks.load_test_service --clients 8 --streams 2 --duration 10
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.request
+from datetime import timedelta
+from time import perf_counter, sleep
+from typing import Any, Dict, List
+from benchmarks.run import _latency_stats
+from benchmarks.synthetic import DEFAULT_START, FakeDHT11, FakeTSL2591, FakeINA219, generate_database
+from logger.sensor_logger import SensorLogger
+from service.data_service import DataService
+
+
+def _acquire(logger: SensorLogger, cells: int, interval: float, stop: threading.Event) -> List[float]:
+    """
+    Runs main.run_cycle every `interval` seconds until stopped and returns each cycle's duration.
+    """
+    from main import run_cycle
+
+    ina_sensors = [FakeINA219(f"cell_{idx}") for idx in range(1, cells + 1)]
+    dht_sensor, tsl_sensor = FakeDHT11(), FakeTSL2591()
+    samples = []
+    while not stop.is_set():
+        started = perf_counter()
+        run_cycle(dht_sensor, tsl_sensor, ina_sensors, logger)
+        samples.append(perf_counter() - started)
+        stop.wait(max(0.0, interval - samples[-1]))
+    return samples
+
+
+def _poll(base_url: str, paths: List[str], stop: threading.Event, latencies: Dict[str, List[float]]) -> None:
+    """
+    Requests each path in turn until stopped, recording latencies per endpoint.
+    """
+    idx = 0
+    while not stop.is_set():
+        path = paths[idx % len(paths)]
+        idx += 1
+        started = perf_counter()
+        with urllib.request.urlopen(base_url + path, timeout=30) as response:
+            response.read()
+        latencies.setdefault(path.split("?", 1)[0], []).append(perf_counter() - started)
+
+
+def _listen(base_url: str, stop: threading.Event, received: List[int]) -> None:
+    """
+    Holds a /stream connection open and counts the events delivered.
+    """
+    with urllib.request.urlopen(base_url + "/stream", timeout=30) as response:
+        for line in response:
+            if line.startswith(b"data: "):
+                received.append(1)
+            if stop.is_set():
+                return
+
+
+def run_load_test(days: int, cells: int, clients: int, streams: int, duration: float, interval: float) -> Dict[str, Any]:
+    """
+    Measures acquisition cycle latency with and without service load.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable results.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(work_dir, "load.db")
+        generate_database(db_path, days=days, cells=cells, rate_per_minute=1)
+        logger = SensorLogger(db_path=db_path, spool_path=os.path.join(work_dir, "load.spool"))
+        service = DataService(db_path, logger, port=0, heartbeat_interval=1.0)
+
+        middle = DEFAULT_START + timedelta(days=days / 2)
+        window = f"start={middle.isoformat()}&end={(middle + timedelta(hours=1)).isoformat()}"
+        day = f"start={DEFAULT_START.isoformat()}&end={(DEFAULT_START + timedelta(days=1)).isoformat()}"
+        paths = [
+            "/latest?table=sensor_data",
+            f"/range?table=cell_output&{window}",
+            f"/aggregates?table=cell_output&{day}&bucket=3600",
+        ]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            base_url = f"http://127.0.0.1:{service.start()}"
+
+            stop = threading.Event()
+            timer = threading.Timer(duration, stop.set)
+            timer.start()
+            baseline = _acquire(logger, cells, interval, stop)
+
+            stop = threading.Event()
+            latencies: Dict[str, List[float]] = {}
+            received: List[int] = []
+            workers = [threading.Thread(target=_poll, args=(base_url, paths, stop, latencies), daemon=True)
+                       for _ in range(clients)]
+            workers += [threading.Thread(target=_listen, args=(base_url, stop, received), daemon=True)
+                        for _ in range(streams)]
+            for worker in workers:
+                worker.start()
+            timer = threading.Timer(duration, stop.set)
+            timer.start()
+            loaded = _acquire(logger, cells, interval, stop)
+            sleep(interval)
+            service.stop()
+            for worker in workers:
+                worker.join(5)
+            logger.close()
+
+        return {
+            "parameters": {"days": days, "cells": cells, "clients": clients, "streams": streams,
+                           "duration_s": duration, "cycle_interval_s": interval},
+            "acquisition_cycle": {"idle": _latency_stats(baseline), "under_load": _latency_stats(loaded)},
+            "requests": {
+                endpoint: {**_latency_stats(samples), "requests_per_s": len(samples) / duration}
+                for endpoint, samples in sorted(latencies.items())
+            },
+            "stream_events_received": len(received),
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=3, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent polling clients.")
+    parser.add_argument("--streams", type=int, default=2, help="Concurrent /stream connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase.")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between acquisition cycles.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    args = parser.parse_args()
+
+    report = run_load_test(args.days, args.cells, args.clients, args.streams, args.duration, args.interval)
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(rendered + "\n")
+        print(f"[BENCH] Results written to {args.output}")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
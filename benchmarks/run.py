@@ -0,0 +1,264 @@
+"""
+Reproducible performance suite for ingest, query, export and the acquisition cycle.
+
+Runs entirely on synthetic data and simulated sensors, and writes the results as JSON
+so runs on different commits can be compared with benchmarks.compare:
+
+    python -m benchmarks.run --days 7 --cells 3 --rate 1 --output bench_output.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import timedelta
+from time import perf_counter, monotonic
+from typing import Callable, Dict, List, Any
+from unittest.mock import patch
+from benchmarks.synthetic import (
+    DEFAULT_START, FakeDHT11, FakeTSL2591, FakeINA219, generate_database, synthetic_cell_rows
+)
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from logger.sensor_logger import SensorLogger
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarises latency samples (seconds) in milliseconds.
+    """
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000,
+    }
+
+
+def _time_repeated(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        samples.append(perf_counter() - started)
+    return _latency_stats(samples)
+
+
+def _time_with_memory(func: Callable[[], Any]) -> Dict[str, float]:
+    """
+    Times a single call and records its peak Python heap allocation.
+    """
+    tracemalloc.start()
+    started = perf_counter()
+    func()
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_memory_mb": peak / 2**20}
+
+
+def bench_insert(work_dir: str, cells: int, rows: int, batch_size: int) -> Dict[str, Any]:
+    """
+    Compares per-row inserts (one commit each) with batched executemany inserts.
+    """
+    records = synthetic_cell_rows(days=1, cells=cells, rate_per_minute=max(1, rows // (1440 * cells) + 1))[:rows]
+    results = {}
+
+    db = SensorDatabase(os.path.join(work_dir, "insert_per_row.db"))
+    started = perf_counter()
+    for record in records:
+        db.insert_cell_output(
+            cell_id=record["cell_id"],
+            reading={"voltage": record["voltage"], "current": record["current"], "power": record["power"]},
+            timestamp=record["timestamp"],
+        )
+    results["per_row_rows_per_s"] = len(records) / (perf_counter() - started)
+    db.close_conn()
+
+    db = SensorDatabase(os.path.join(work_dir, "insert_batched.db"))
+    started = perf_counter()
+    for offset in range(0, len(records), batch_size):
+        db.insert_cell_output_many(records[offset:offset + batch_size])
+    results["batched_rows_per_s"] = len(records) / (perf_counter() - started)
+    db.close_conn()
+
+    results["rows"] = len(records)
+    results["batch_size"] = batch_size
+    return results
+
+
+def bench_queries(reader: SensorDataReader, days: int, repeat: int) -> Dict[str, Any]:
+    """
+    Times get_data_between over several window sizes and get_latest_entry on both tables.
+    """
+    middle = DEFAULT_START + timedelta(days=days / 2)
+    windows = {"1h": timedelta(hours=1), "1d": timedelta(days=1), "all": timedelta(days=days)}
+    results: Dict[str, Any] = {"get_data_between": {}, "get_latest_entry": {}}
+
+    for table in (SensorDatabase.get_sensor_table_name(), SensorDatabase.get_cell_output_table_name()):
+        for label, width in windows.items():
+            start = DEFAULT_START if label == "all" else middle
+            end = start + width
+            stats = _time_repeated(
+                lambda: reader.get_data_between(table, start.isoformat(), end.isoformat()), repeat
+            )
+            stats["rows"] = len(reader.get_data_between(table, start.isoformat(), end.isoformat()))
+            results["get_data_between"][f"{table}/{label}"] = stats
+        results["get_latest_entry"][table] = _time_repeated(lambda: reader.get_latest_entry(table), repeat * 5)
+
+    return results
+
+
+def bench_dataframes(reader: SensorDataReader, work_dir: str) -> Dict[str, Any]:
+    """
+    Times show_all_dataframes, typed loading and export_to_csv, including their peak memory.
+    """
+    export_dir = os.path.join(work_dir, "export")
+    os.makedirs(export_dir, exist_ok=True)
+
+    def export() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            reader.export_to_csv(
+                sensor_file=os.path.join(export_dir, "sensor_data.csv"),
+                cell_file=os.path.join(export_dir, "cell_output.csv"),
+                confirm=False,
+            )
+
+    return {
+        "show_all_dataframes": _time_with_memory(lambda: reader.show_all_dataframes(print_dfs=False)),
+        "load_dataframe": _time_with_memory(
+            lambda: [reader.load_dataframe(table) for table in (SensorDatabase.get_sensor_table_name(),
+                                                                SensorDatabase.get_cell_output_table_name())]
+        ),
+        "export_to_csv": _time_with_memory(export),
+    }
+
+
+def bench_acquisition_cycle(work_dir: str, db_path: str, cells: int, repeat: int) -> Dict[str, Any]:
+    """
+    Times main.run_cycle with simulated sensors, spooling into a copy of the synthetic DB.
+    """
+    from main import run_cycle
+
+    cycle_db = os.path.join(work_dir, "cycle.db")
+    shutil.copyfile(db_path, cycle_db)
+    logger = SensorLogger(db_path=cycle_db, spool_path=os.path.join(work_dir, "cycle.spool"))
+    ina_sensors = [FakeINA219(f"cell_{idx}") for idx in range(1, cells + 1)]
+    dht_sensor, tsl_sensor = FakeDHT11(), FakeTSL2591()
+
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = perf_counter()
+            run_cycle(dht_sensor, tsl_sensor, ina_sensors, logger)
+            samples.append(perf_counter() - started)
+        logger.close()
+    return _latency_stats(samples)
+
+
+def bench_time_to_first_sample(work_dir: str, db_path: str, cells: int) -> Dict[str, Any]:
+    """
+    Runs main.main for one cycle with simulated sensors and a background export,
+    and reports the time from start-up to the first logged sample.
+    """
+    import main as entry_point
+    from monitoring.metrics import REGISTRY
+
+    startup_db = os.path.join(work_dir, "startup.db")
+    shutil.copyfile(db_path, startup_db)
+    sensors = (FakeDHT11(), FakeTSL2591(), [FakeINA219(f"cell_{idx}") for idx in range(1, cells + 1)])
+    argv = [
+        "--db", startup_db, "--spool", os.path.join(work_dir, "startup.spool"),
+        "--export", "--export-dir", os.path.join(work_dir, "startup_export"), "--cycles", "1",
+    ]
+
+    started = perf_counter()
+    with patch.object(entry_point, "setup_sensors", return_value=sensors), \
+            patch.object(entry_point, "_PROCESS_START", monotonic()), \
+            contextlib.redirect_stdout(io.StringIO()):
+        entry_point.main(argv)
+    return {
+        "time_to_first_sample_seconds": REGISTRY.gauge("time_to_first_sample_seconds").value,
+        "run_with_export_seconds": perf_counter() - started,
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(days: int, cells: int, rate: int, repeat: int, insert_rows: int, batch_size: int) -> Dict[str, Any]:
+    """
+    Builds a synthetic database and runs every benchmark against it.
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable results with the run parameters and environment.
+    """
+    work_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(work_dir, "synthetic.db")
+        started = perf_counter()
+        row_counts = generate_database(db_path, days=days, cells=cells, rate_per_minute=rate)
+        generation_seconds = perf_counter() - started
+
+        reader = SensorDataReader(db_path)
+        try:
+            results = {
+                "insert": bench_insert(work_dir, cells, insert_rows, batch_size),
+                "queries": bench_queries(reader, days, repeat),
+                "dataframes": bench_dataframes(reader, work_dir),
+                "acquisition_cycle": bench_acquisition_cycle(work_dir, db_path, cells, repeat),
+                "startup": bench_time_to_first_sample(work_dir, db_path, cells),
+            }
+        finally:
+            reader.close()
+
+        return {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "parameters": {"days": days, "cells": cells, "rate_per_minute": rate, "repeat": repeat},
+            "database": {"rows": row_counts, "size_bytes": os.path.getsize(db_path),
+                         "generation_seconds": generation_seconds},
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=7, help="Days of synthetic history.")
+    parser.add_argument("--cells", type=int, default=3, help="Number of cells.")
+    parser.add_argument("--rate", type=int, default=1, help="Samples per minute per series.")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetitions per latency measurement.")
+    parser.add_argument("--insert-rows", type=int, default=2000, help="Rows used by the insert benchmark.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Batch size for batched inserts.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    args = parser.parse_args()
+
+    report = run_suite(args.days, args.cells, args.rate, args.repeat, args.insert_rows, args.batch_size)
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(rendered + "\n")
+        print(f"[BENCH] Results written to {args.output}")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
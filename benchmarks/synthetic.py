@@ -0,0 +1,147 @@
+"""
+Synthetic data and simulated sensors for hardware-free benchmarks.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from database.db import SensorDatabase
+
+DEFAULT_START = datetime(2025, 6, 1)
+
+
+def synthetic_sensor_rows(days: int, rate_per_minute: int, start: datetime = DEFAULT_START) -> List[Dict[str, Any]]:
+    """
+    Generates sensor_data rows with a daily light cycle.
+
+    Args:
+        days (int): Number of days to cover.
+        rate_per_minute (int): Samples per minute.
+        start (datetime): Timestamp of the first sample.
+    """
+    step = timedelta(minutes=1) / rate_per_minute
+    total = days * 1440 * rate_per_minute
+    rng = random.Random(42)
+    rows = []
+    for i in range(total):
+        timestamp = start + i * step
+        daylight = max(0.0, math.sin((timestamp.hour * 60 + timestamp.minute - 360) / 720 * math.pi))
+        rows.append({
+            "timestamp": timestamp.isoformat(),
+            "lux": round(daylight * 40000 + rng.uniform(0, 50), 2),
+            "temperature": round(21 + 4 * daylight + rng.uniform(-0.5, 0.5), 1),
+            "humidity": round(45 - 10 * daylight + rng.uniform(-1, 1), 1),
+        })
+    return rows
+
+
+def synthetic_cell_rows(
+    days: int,
+    cells: int,
+    rate_per_minute: int,
+    start: datetime = DEFAULT_START
+) -> List[Dict[str, Any]]:
+    """
+    Generates cell_output rows for every cell at the given rate.
+
+    Args:
+        days (int): Number of days to cover.
+        cells (int): Number of cells (cell_1 .. cell_N).
+        rate_per_minute (int): Samples per minute per cell.
+        start (datetime): Timestamp of the first sample.
+    """
+    step = timedelta(minutes=1) / rate_per_minute
+    total = days * 1440 * rate_per_minute
+    rng = random.Random(7)
+    rows = []
+    for i in range(total):
+        timestamp = start + i * step
+        daylight = max(0.0, math.sin((timestamp.hour * 60 + timestamp.minute - 360) / 720 * math.pi))
+        iso = timestamp.isoformat()
+        for cell in range(1, cells + 1):
+            voltage = round(0.45 + 0.2 * daylight + rng.uniform(-0.005, 0.005), 3)
+            current = round(daylight * (1.5 + 0.1 * cell) + rng.uniform(0, 0.01), 3)
+            rows.append({
+                "timestamp": iso,
+                "cell_id": f"cell_{cell}",
+                "voltage": voltage,
+                "current": current,
+                "power": round(voltage * current, 3),
+            })
+    return rows
+
+
+def generate_database(
+    db_path: str,
+    days: int,
+    cells: int,
+    rate_per_minute: int,
+    start: datetime = DEFAULT_START,
+    batch_size: int = 5000
+) -> Dict[str, int]:
+    """
+    Creates (or extends) a SQLite database filled with synthetic readings.
+
+    Args:
+        db_path (str): Path of the database to write.
+        days (int): Number of days to cover.
+        cells (int): Number of cells.
+        rate_per_minute (int): Samples per minute for every series.
+        start (datetime): Timestamp of the first sample.
+        batch_size (int): Rows committed per transaction.
+
+    Returns:
+        Dict[str, int]: Number of rows written per table.
+    """
+    db = SensorDatabase(db_path=db_path)
+    sensor_rows = synthetic_sensor_rows(days, rate_per_minute, start)
+    cell_rows = synthetic_cell_rows(days, cells, rate_per_minute, start)
+    for offset in range(0, len(sensor_rows), batch_size):
+        db.insert_data_many(sensor_rows[offset:offset + batch_size])
+    for offset in range(0, len(cell_rows), batch_size):
+        db.insert_cell_output_many(cell_rows[offset:offset + batch_size])
+    db.close_conn()
+    return {
+        SensorDatabase.get_sensor_table_name(): len(sensor_rows),
+        SensorDatabase.get_cell_output_table_name(): len(cell_rows),
+    }
+
+
+class FakeDHT11:
+    """
+    Simulated DHT11 with the DHT11Sensor interface.
+    """
+
+    def read(self, retries: int = 5, delay: float = 2.0) -> Optional[Tuple[float, float]]:
+        return 22.0, 45.0
+
+    def cleanup(self) -> None:
+        pass
+
+
+class FakeTSL2591:
+    """
+    Simulated TSL2591 with the TSL2591Sensor interface.
+    """
+
+    def read_lux(self, retry_on_overflow: bool = True) -> float:
+        return 1234.5
+
+
+class FakeINA219:
+    """
+    Simulated INA219 with the INA219Sensor interface.
+    """
+
+    def __init__(self, cell_id: str) -> None:
+        self.cell_id = cell_id
+
+    def read_voltage(self) -> float:
+        return 0.612
+
+    def read_current(self) -> float:
+        return 1.734
+
+    def read_power(self) -> float:
+        return 1.061
@@ -0,0 +1,648 @@
+import heapq
+import lzma
+import struct
+import warnings
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from database.timestamps import LAST_TIMESTAMP
+from monitoring.metrics import REGISTRY
+
+# Compressors applied to every encoded column section
+_COMPRESSORS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+# Float column codecs; the smallest compressed candidate is stored
+_RAW = 0
+_GORILLA = 1
+_DECIMAL = 2
+
+# Most decimal places tried by the decimal codec
+_MAX_DECIMALS = 6
+
+_ROWS_PER_BLOCK = 4096
+
+# Compression tag of blocks stored by encode_verbatim_block
+_VERBATIM = "verbatim"
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def _pack_ints(values: np.ndarray) -> bytes:
+    """
+    Stores signed integers zigzag-encoded in the narrowest unsigned width that holds them all.
+    """
+    encoded = _zigzag(values)
+    largest = int(encoded.max()) if len(encoded) else 0
+    for width, dtype in ((1, "<u1"), (2, "<u2"), (4, "<u4"), (8, "<u8")):
+        if largest < 1 << (8 * width):
+            return bytes([width]) + encoded.astype(dtype).tobytes()
+    raise AssertionError("unreachable")
+
+
+def _unpack_ints(data: bytes) -> np.ndarray:
+    dtype = {1: "<u1", 2: "<u2", 4: "<u4", 8: "<u8"}[data[0]]
+    return _unzigzag(np.frombuffer(data, dtype=dtype, offset=1))
+
+
+def encode_timestamps(micros: np.ndarray) -> bytes:
+    """
+    Delta-of-delta encodes increasing microsecond timestamps.
+
+    Readings taken at a fixed rate have an almost constant delta, so the
+    second differences are zero or small jitter and pack into one or two bytes.
+
+    Args:
+        micros (np.ndarray): int64 microseconds since the epoch.
+
+    Returns:
+        bytes: First timestamp, first delta and the packed second differences.
+    """
+    micros = np.asarray(micros, dtype=np.int64)
+    deltas = np.diff(micros)
+    first_delta = int(deltas[0]) if len(deltas) else 0
+    return struct.pack("<qq", int(micros[0]) if len(micros) else 0, first_delta) + _pack_ints(np.diff(deltas))
+
+
+def decode_timestamps(data: bytes, count: int) -> np.ndarray:
+    """
+    Inverse of encode_timestamps.
+    """
+    first, first_delta = struct.unpack_from("<qq", data)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    deltas = np.empty(count - 1, dtype=np.int64)
+    if count > 1:
+        deltas[0] = 0
+        deltas[1:] = np.cumsum(_unpack_ints(data[16:]))
+        deltas += first_delta
+    micros = np.empty(count, dtype=np.int64)
+    micros[0] = first
+    micros[1:] = first + np.cumsum(deltas)
+    return micros
+
+
+def _gorilla_encode(values: np.ndarray) -> bytes:
+    """
+    Gorilla-style XOR encoding, laid out as separate streams so it decodes without a per-value loop.
+
+    Each value is XORed with its predecessor. Unchanged values cost one flag bit;
+    changed values store their leading-zero count and meaningful-bit length (one
+    byte each) plus only the meaningful bits, packed into a shared bitstream.
+    """
+    bits = values.astype("<f8").view(np.uint64)
+    xors = bits[1:] ^ bits[:-1]
+    changed = xors != 0
+    nonzero = xors[changed]
+
+    matrix = np.unpackbits(nonzero.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+    leading = np.argmax(matrix, axis=1).astype(np.uint8)
+    trailing = np.argmax(matrix[:, ::-1], axis=1)
+    lengths = (64 - leading - trailing).astype(np.uint8)
+    columns = np.arange(64)
+    meaningful = (columns >= leading[:, None]) & (columns < (leading + lengths)[:, None])
+
+    flags = np.packbits(changed).tobytes()
+    stream = np.packbits(matrix[meaningful]).tobytes()
+    return (
+        struct.pack("<QIII", int(bits[0]) if len(bits) else 0, len(nonzero), len(flags), len(stream))
+        + flags + leading.tobytes() + lengths.tobytes() + stream
+    )
+
+
+def _gorilla_decode(data: bytes, count: int) -> np.ndarray:
+    first, changed_count, flags_size, stream_size = struct.unpack_from("<QIII", data)
+    offset = struct.calcsize("<QIII")
+    changed = np.unpackbits(np.frombuffer(data, np.uint8, flags_size, offset))[:max(count - 1, 0)].astype(bool)
+    offset += flags_size
+    leading = np.frombuffer(data, np.uint8, changed_count, offset).astype(np.int64)
+    lengths = np.frombuffer(data, np.uint8, changed_count, offset + changed_count).astype(np.int64)
+    stream = np.unpackbits(np.frombuffer(data, np.uint8, stream_size, offset + 2 * changed_count))
+
+    # Bit j of each XOR comes from the bitstream when it falls inside the meaningful window
+    starts = np.cumsum(lengths) - lengths
+    source = np.arange(64) - leading[:, None]
+    inside = (source >= 0) & (source < lengths[:, None])
+    positions = np.clip(starts[:, None] + source, 0, max(len(stream) - 1, 0))
+    matrix = np.where(inside, stream[positions] if len(stream) else 0, 0).astype(np.uint8)
+
+    xors = np.zeros(max(count - 1, 0), dtype=np.uint64)
+    xors[changed] = np.packbits(matrix, axis=1).view(">u8").ravel()
+    bits = np.bitwise_xor.accumulate(np.concatenate(([np.uint64(first)], xors)))
+    return bits[:count].view("<f8")
+
+
+def _decimal_encode(values: np.ndarray) -> Optional[bytes]:
+    """
+    Stores values that are exactly representable with few decimals as deltas of scaled integers.
+
+    Returns None when no scale up to _MAX_DECIMALS reproduces every value bit for bit.
+    """
+    if not np.isfinite(values).all():
+        return None
+    for decimals in range(_MAX_DECIMALS + 1):
+        scale = 10.0 ** decimals
+        scaled = np.round(values * scale)
+        if np.abs(scaled).max(initial=0) >= 2 ** 53:
+            return None
+        if np.array_equal((scaled / scale).view(np.uint64), values.view(np.uint64)):
+            integers = scaled.astype(np.int64)
+            return bytes([decimals]) + struct.pack("<q", int(integers[0])) + _pack_ints(np.diff(integers))
+    return None
+
+
+def _decimal_decode(data: bytes, count: int) -> np.ndarray:
+    scale = 10.0 ** data[0]
+    (first,) = struct.unpack_from("<q", data, 1)
+    integers = np.empty(count, dtype=np.int64)
+    integers[0] = first
+    integers[1:] = first + np.cumsum(_unpack_ints(data[9:]))
+    return integers / scale
+
+
+def encode_floats(values: np.ndarray, compression: str = "zlib") -> bytes:
+    """
+    Encodes a float column with whichever codec compresses it best.
+
+    Candidates are Gorilla-style XOR, scaled decimal deltas and plain float64, each
+    followed by the general-purpose compressor, which is also the fallback for
+    noisy data neither specialised codec helps with. Every codec is lossless;
+    NULLs travel as NaN.
+
+    Args:
+        values (np.ndarray): float64 values.
+        compression (str): 'zlib' or 'lzma'.
+
+    Returns:
+        bytes: Codec identifier followed by the compressed payload.
+    """
+    compress = _COMPRESSORS[compression][0]
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    candidates = [(_RAW, values.astype("<f8").tobytes()), (_GORILLA, _gorilla_encode(values))]
+    decimal = _decimal_encode(values)
+    if decimal is not None:
+        candidates.append((_DECIMAL, decimal))
+    encoded = [bytes([codec]) + compress(payload) for codec, payload in candidates]
+    return min(encoded, key=len)
+
+
+def decode_floats(data: bytes, count: int, compression: str = "zlib") -> np.ndarray:
+    """
+    Inverse of encode_floats.
+    """
+    payload = _COMPRESSORS[compression][1](data[1:])
+    if data[0] == _GORILLA:
+        return _gorilla_decode(payload, count)
+    if data[0] == _DECIMAL:
+        return _decimal_decode(payload, count)
+    return np.frombuffer(payload, dtype="<f8")
+
+
+def micros_to_iso_array(micros: np.ndarray) -> np.ndarray:
+    """
+    Formats microsecond timestamps like datetime.isoformat(), which omits zero microseconds.
+    """
+    stamps = np.asarray(micros, dtype=np.int64).astype("datetime64[us]")
+    strings = np.datetime_as_string(stamps, unit="us")
+    whole = np.asarray(micros) % 1_000_000 == 0
+    if whole.any():
+        strings = strings.astype(object)
+        strings[whole] = np.datetime_as_string(stamps[whole], unit="s")
+    return strings.astype(str)
+
+
+def encode_block(timestamps: List[str], columns: List[np.ndarray], compression: str = "zlib") -> bytes:
+    """
+    Encodes one series chunk: strictly increasing ISO timestamps and its value columns.
+
+    Args:
+        timestamps (List[str]): Naive ISO-format timestamps, as written by the logger.
+        columns (List[np.ndarray]): One float64 array per value column.
+        compression (str): 'zlib' or 'lzma'.
+
+    Returns:
+        bytes: The encoded block.
+
+    Raises:
+        ValueError: If a timestamp would not decode to the identical string, or
+                    timestamps are not strictly increasing.
+    """
+    original = np.array(timestamps, dtype=str)
+    with warnings.catch_warnings():
+        # Offsets are parsed with a warning; the round-trip check below rejects them
+        warnings.simplefilter("ignore")
+        micros = original.astype("datetime64[us]").astype(np.int64)
+    if not np.array_equal(micros_to_iso_array(micros), original):
+        raise ValueError("Timestamps are not in naive datetime.isoformat() form and cannot be archived losslessly.")
+    if (np.diff(micros) <= 0).any():
+        raise ValueError("Timestamps must be strictly increasing within a series.")
+
+    sections = [_COMPRESSORS[compression][0](encode_timestamps(micros))]
+    sections += [encode_floats(column, compression) for column in columns]
+    header = struct.pack("<IB", len(micros), len(sections))
+    return header + b"".join(struct.pack("<I", len(section)) + section for section in sections)
+
+
+def decode_block(data: bytes, compression: str = "zlib") -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Inverse of encode_block.
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: int64 microsecond timestamps and the value columns.
+    """
+    count, section_count = struct.unpack_from("<IB", data)
+    offset = struct.calcsize("<IB")
+    sections = []
+    for _ in range(section_count):
+        (size,) = struct.unpack_from("<I", data, offset)
+        sections.append(data[offset + 4:offset + 4 + size])
+        offset += 4 + size
+    micros = decode_timestamps(_COMPRESSORS[compression][1](sections[0]), count)
+    return micros, [decode_floats(section, count, compression) for section in sections[1:]]
+
+
+def encode_verbatim_block(timestamps: List[str], columns: List[np.ndarray]) -> bytes:
+    """
+    Encodes a series chunk with its timestamp strings kept verbatim, then zlib-compressed.
+
+    The fallback for chunks encode_block refuses (e.g. timestamps with a UTC offset
+    or in another ISO form), so that they can still be archived losslessly.
+
+    Args:
+        timestamps (List[str]): Timestamps in any form, ordered as they should be read back.
+        columns (List[np.ndarray]): One float64 array per value column.
+
+    Returns:
+        bytes: The encoded block.
+    """
+    text = "\n".join(timestamps).encode("utf-8")
+    values = b"".join(np.ascontiguousarray(column, dtype="<f8").tobytes() for column in columns)
+    return struct.pack("<IBI", len(timestamps), len(columns), len(text)) + zlib.compress(text + values, 9)
+
+
+def decode_verbatim_block(data: bytes) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Inverse of encode_verbatim_block.
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: Timestamp strings and the value columns.
+    """
+    count, column_count, text_size = struct.unpack_from("<IBI", data)
+    payload = zlib.decompress(data[struct.calcsize("<IBI"):])
+    timestamps = np.array(payload[:text_size].decode("utf-8").split("\n") if count else [], dtype=str)
+    values = np.frombuffer(payload, dtype="<f8", offset=text_size).reshape(column_count, count)
+    return timestamps, list(values)
+
+
+class ArchiveStore:
+    """
+    Compressed archive of closed time ranges, kept in the archive_blocks table.
+
+    archive() moves rows older than a cutoff out of sensor_data and cell_output into
+    blocks of up to `block_rows` readings of one series (sensor_data, or one cell),
+    indexed by their first and last timestamp. iter_rows() decodes the blocks that
+    overlap a range one at a time per series and merges them back into time order,
+    so reads hold at most one decoded block per series in memory. Blocks of a series
+    only overlap when a late reading was archived after its neighbours; such blocks
+    are decoded together and merged.
+    """
+
+    def __init__(self, db, block_rows: int = _ROWS_PER_BLOCK, compression: str = "zlib") -> None:
+        """
+        Args:
+            db (SensorDatabase): Database whose tables are archived and read back.
+            block_rows (int): Maximum readings per block.
+            compression (str): Compressor for new blocks, 'zlib' or 'lzma'.
+
+        Raises:
+            ValueError: If the compressor is unknown.
+        """
+        if compression not in _COMPRESSORS:
+            raise ValueError(f"Unknown compression {compression!r}; expected one of {sorted(_COMPRESSORS)}.")
+        self.db = db
+        self.conn = db.conn
+        self.block_rows = block_rows
+        self.compression = compression
+        self._available = False
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the database has an archive table (read-only legacy databases may not).
+        """
+        if not self._available:
+            self._available = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (self.db._ARCHIVE_TABLE,)
+            ).fetchone() is not None
+        return self._available
+
+    def _fields(self, table: str) -> Tuple[str, ...]:
+        return tuple(column for column in self.db.columns_for(table) if column not in ("timestamp", "cell_id"))
+
+    # ----------------------------------------------------------------
+    # WRITES
+    # ----------------------------------------------------------------
+    def archive(self, table: str, before: str) -> Dict[str, int]:
+        """
+        Moves every row of a table with timestamp < before into compressed blocks.
+
+        Each block is written and its rows deleted in one short write transaction,
+        so the acquisition writer is never blocked for long and an interruption
+        leaves every reading in exactly one place. Only archive closed ranges that
+        change-feed consumers have already processed: archived rows leave the feed.
+        Blocks whose timestamps the compact encoding cannot reproduce exactly are
+        stored with encode_verbatim_block instead, so they never hold a series back.
+
+        Args:
+            table (str): Table to archive.
+            before (str): Exclusive ISO-format cutoff.
+
+        Returns:
+            Dict[str, int]: 'blocks', 'rows', 'raw_bytes' and 'stored_bytes' written.
+        """
+        fields = self._fields(table)
+        is_cell = table == self.db._CELL_OUTPUT_TABLE
+        if is_cell:
+            series = [row[0] for row in self.conn.execute(
+                f"SELECT DISTINCT cell_id FROM {table} WHERE timestamp < ? ORDER BY cell_id;", (before,)
+            )]
+        else:
+            series = [None]
+
+        totals = {"blocks": 0, "rows": 0, "raw_bytes": 0, "stored_bytes": 0}
+        for cell_id in series:
+            try:
+                while self._archive_block(table, fields, cell_id, before, totals):
+                    pass
+            except ValueError as err:
+                self.conn.rollback()
+                REGISTRY.counter("archive_failures_total", table=table).inc()
+                label = f"{table}/{cell_id}" if is_cell else table
+                print(f"[ARCHIVE] Skipping {label}: {err}")
+        return totals
+
+    def _archive_block(
+        self,
+        table: str,
+        fields: Tuple[str, ...],
+        cell_id: Any,
+        before: str,
+        totals: Dict[str, int]
+    ) -> bool:
+        """
+        Archives the oldest block of one series. Returns False once nothing is left.
+        """
+        cell_filter = "cell_id = ? AND " if cell_id is not None else ""
+        params = ((cell_id,) if cell_id is not None else ()) + (before,)
+        self.conn.execute("BEGIN IMMEDIATE;")
+        rows = self.conn.execute(
+            f"""
+            SELECT timestamp, {", ".join(fields)} FROM {table}
+            WHERE {cell_filter}timestamp < ?
+            ORDER BY timestamp LIMIT ?;
+            """,
+            params + (self.block_rows,),
+        ).fetchall()
+        if not rows:
+            self.conn.rollback()
+            return False
+
+        with REGISTRY.timer("archive_block_seconds", table=table):
+            timestamps = [row[0] for row in rows]
+            values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(fields))
+            compression = self.compression
+            try:
+                payload = encode_block(timestamps, list(values.T), compression)
+            except ValueError as err:
+                compression = _VERBATIM
+                payload = encode_verbatim_block(timestamps, list(values.T))
+                REGISTRY.counter("archive_verbatim_blocks_total", table=table).inc()
+                label = f"{table}/{cell_id}" if cell_id is not None else table
+                print(f"[ARCHIVE] Storing {label} block from {timestamps[0]} verbatim: {err}")
+        raw_bytes = sum(len(timestamp) for timestamp in timestamps) + 8 * len(fields) * len(rows)
+
+        self.conn.execute(
+            f"""
+            INSERT INTO {self.db._ARCHIVE_TABLE}
+                (table_name, cell_id, start_ts, end_ts, row_count, compression, raw_bytes, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            (table, cell_id, timestamps[0], timestamps[-1], len(rows), compression, raw_bytes, payload),
+        )
+        self.conn.execute(
+            f"DELETE FROM {table} WHERE {cell_filter}timestamp BETWEEN ? AND ?;",
+            ((cell_id,) if cell_id is not None else ()) + (timestamps[0], timestamps[-1]),
+        )
+        self.conn.commit()
+
+        REGISTRY.counter("archived_rows_total", table=table).inc(len(rows))
+        totals["blocks"] += 1
+        totals["rows"] += len(rows)
+        totals["raw_bytes"] += raw_bytes
+        totals["stored_bytes"] += len(payload)
+        return True
+
+    # ----------------------------------------------------------------
+    # READS
+    # ----------------------------------------------------------------
+    def overlaps(self, table: str, start: Optional[str] = None, end: Optional[str] = None) -> bool:
+        """
+        Whether any archived block of the table overlaps the inclusive range.
+        """
+        if not self.available:
+            return False
+        return self.conn.execute(
+            f"""
+            SELECT 1 FROM {self.db._ARCHIVE_TABLE}
+            WHERE table_name = ? AND start_ts <= ? AND end_ts >= ? LIMIT 1;
+            """,
+            (table, end or LAST_TIMESTAMP, start or ""),
+        ).fetchone() is not None
+
+    def iter_rows(
+        self,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        cell_id: Any = None
+    ) -> Iterator[Tuple]:
+        """
+        Yields archived rows within the inclusive range in timestamp order.
+
+        Args:
+            table (str): Table whose archive is read.
+            start (Optional[str]): Start timestamp (inclusive) in ISO format; None for no bound.
+            end (Optional[str]): End timestamp (inclusive) in ISO format; None for no bound.
+            cell_id (Any): Restrict cell_output to one cell.
+
+        Yields:
+            Tuple: Rows laid out like columns_for(table).
+        """
+        if not self.overlaps(table, start, end):
+            return
+        cell_filter = " AND cell_id = ?" if cell_id is not None else ""
+        blocks = self.conn.execute(
+            f"""
+            SELECT id, cell_id, start_ts, end_ts FROM {self.db._ARCHIVE_TABLE}
+            WHERE table_name = ? AND start_ts <= ? AND end_ts >= ?{cell_filter}
+            ORDER BY start_ts;
+            """,
+            (table, end or LAST_TIMESTAMP, start or "") + ((cell_id,) if cell_id is not None else ()),
+        ).fetchall()
+        series: Dict[Any, List[Tuple[int, str, str]]] = {}
+        for block_id, block_cell, block_start, block_end in blocks:
+            series.setdefault(block_cell, []).append((block_id, block_start, block_end))
+        streams = [self._iter_series(table, block_cell, ranges, start, end) for block_cell, ranges in series.items()]
+        yield from heapq.merge(*streams, key=lambda row: row[0])
+
+    def latest(self, table: str, cell_id: Any = None) -> Optional[Tuple]:
+        """
+        Returns the newest archived row of a table, or None if nothing is archived.
+
+        Args:
+            table (str): Table whose archive is read.
+            cell_id (Any): Restrict cell_output to one cell.
+        """
+        if not self.available:
+            return None
+        cell_filter = " AND cell_id = ?" if cell_id is not None else ""
+        block = self.conn.execute(
+            f"""
+            SELECT id, cell_id FROM {self.db._ARCHIVE_TABLE}
+            WHERE table_name = ?{cell_filter}
+            ORDER BY end_ts DESC LIMIT 1;
+            """,
+            (table,) + ((cell_id,) if cell_id is not None else ()),
+        ).fetchone()
+        if block is None:
+            return None
+        # Timestamps increase within a block, so its last row is the newest
+        row = None
+        for row in self._iter_block(table, block[1], block[0], None, None):
+            pass
+        return row
+
+    def iter_blocks(self, table: str, after_id: int, up_to_id: int) -> Iterator[Tuple]:
+        """
+        Yields the rows of the blocks with after_id < id <= up_to_id, block by block.
+
+        For incremental consumers that remember the last block they read; the rows
+        are not in timestamp order across blocks.
+
+        Args:
+            table (str): Table whose archive is read.
+            after_id (int): Last block ID already read (exclusive).
+            up_to_id (int): Last block ID to read (inclusive).
+
+        Yields:
+            Tuple: Rows laid out like columns_for(table).
+        """
+        if not self.available:
+            return
+        blocks = self.conn.execute(
+            f"""
+            SELECT id, cell_id FROM {self.db._ARCHIVE_TABLE}
+            WHERE table_name = ? AND id > ? AND id <= ?
+            ORDER BY id;
+            """,
+            (table, after_id, up_to_id),
+        ).fetchall()
+        for block_id, cell_id in blocks:
+            yield from self._iter_block(table, cell_id, block_id, None, None)
+
+    def _iter_series(
+        self,
+        table: str,
+        cell_id: Any,
+        blocks: List[Tuple[int, str, str]],
+        start: Optional[str],
+        end: Optional[str]
+    ) -> Iterator[Tuple]:
+        """
+        Decodes one series block by block, given its (id, start_ts, end_ts) ordered by start_ts.
+
+        Consecutive blocks whose ranges overlap form a run that is decoded together
+        and merged; every other block is decoded on its own.
+        """
+        runs: List[List[int]] = []
+        run_end = ""
+        for block_id, block_start, block_end in blocks:
+            # Blocks are ordered by start_ts, so one overlaps the run iff it starts before the run ends
+            if runs and block_start <= run_end:
+                runs[-1].append(block_id)
+                run_end = max(run_end, block_end)
+            else:
+                runs.append([block_id])
+                run_end = block_end
+        for run in runs:
+            if len(run) == 1:
+                yield from self._iter_block(table, cell_id, run[0], start, end)
+            else:
+                streams = [self._iter_block(table, cell_id, block_id, start, end) for block_id in run]
+                yield from heapq.merge(*streams, key=lambda row: row[0])
+
+    def _iter_block(
+        self,
+        table: str,
+        cell_id: Any,
+        block_id: int,
+        start: Optional[str],
+        end: Optional[str]
+    ) -> Iterator[Tuple]:
+        """
+        Decodes one block, clipped to the inclusive range.
+        """
+        is_cell = table == self.db._CELL_OUTPUT_TABLE
+        payload, compression = self.conn.execute(
+            f"SELECT payload, compression FROM {self.db._ARCHIVE_TABLE} WHERE id = ?;", (block_id,)
+        ).fetchone()
+        with REGISTRY.timer("archive_decode_seconds", table=table):
+            if compression == _VERBATIM:
+                timestamps, columns = decode_verbatim_block(payload)
+            else:
+                micros, columns = decode_block(payload, compression)
+                timestamps = micros_to_iso_array(micros)
+            keep = np.ones(len(timestamps), dtype=bool)
+            if start is not None:
+                keep &= timestamps >= start
+            if end is not None:
+                keep &= timestamps <= end
+            values = []
+            for column in columns:
+                column = column[keep]
+                if np.isnan(column).any():
+                    values.append([None if value != value else value for value in column.tolist()])
+                else:
+                    values.append(column.tolist())
+            timestamps = timestamps[keep].tolist()
+        if is_cell:
+            yield from zip(timestamps, [cell_id] * len(timestamps), *values)
+        else:
+            yield from zip(timestamps, *values)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns block count, rows, raw bytes and stored bytes per archived table.
+        """
+        if not self.available:
+            return {}
+        rows = self.conn.execute(
+            f"""
+            SELECT table_name, COUNT(*), SUM(row_count), SUM(raw_bytes), SUM(LENGTH(payload))
+            FROM {self.db._ARCHIVE_TABLE} GROUP BY table_name;
+            """
+        ).fetchall()
+        return {
+            table: {"blocks": blocks, "rows": count, "raw_bytes": raw, "stored_bytes": stored}
+            for table, blocks, count, raw, stored in rows
+        }
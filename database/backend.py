@@ -0,0 +1,144 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Any, Iterable, List, Tuple
+
+
+class FeatureUnavailableError(Exception):
+    """
+    Raised when a feature is requested from a storage backend that does not provide it.
+    """
+
+    def __init__(self, feature: str, backend: Any, reason: Optional[str] = None) -> None:
+        super().__init__(
+            f"{feature} is unavailable: {reason}" if reason
+            else f"{feature} is only available on the SQLite backend, not on {type(backend).__name__}."
+        )
+        self.feature = feature
+        self.backend = backend
+
+
+class StorageBackend(ABC):
+    """
+    Interface shared by every storage backend used by SensorLogger and SensorDataReader.
+
+    Rows are exchanged as tuples whose layout matches SENSOR_COLUMNS or CELL_COLUMNS,
+    i.e. the column order of the original SQLite tables.
+    """
+    _SENSOR_TABLE = "sensor_data"
+    _CELL_OUTPUT_TABLE = "cell_output"
+
+    SENSOR_COLUMNS: Tuple[str, ...] = ("timestamp", "lux", "temperature", "humidity")
+    CELL_COLUMNS: Tuple[str, ...] = ("timestamp", "cell_id", "voltage", "current", "power")
+
+    @classmethod
+    def get_sensor_table_name(cls) -> str:
+        """
+        Returns the name of the general sensor data table.
+        """
+        return cls._SENSOR_TABLE
+
+    @classmethod
+    def get_cell_output_table_name(cls) -> str:
+        """
+        Returns the name of the cell output data table.
+        """
+        return cls._CELL_OUTPUT_TABLE
+
+    @classmethod
+    def columns_for(cls, table: str) -> Tuple[str, ...]:
+        """
+        Returns the column layout of a table.
+
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+
+        Raises:
+            ValueError: If an invalid table name is provided.
+        """
+        if table == cls._SENSOR_TABLE:
+            return cls.SENSOR_COLUMNS
+        elif table == cls._CELL_OUTPUT_TABLE:
+            return cls.CELL_COLUMNS
+        raise ValueError("Invalid table specified.")
+
+    # ----------------------------------------------------------------
+    # WRITES
+    # ----------------------------------------------------------------
+    @abstractmethod
+    def insert_data(self, data: Dict[str, Any]) -> None:
+        """
+        Stores a sensor reading (timestamp, lux, temperature, humidity).
+        """
+
+    @abstractmethod
+    def insert_cell_output(self, cell_id: Any, reading: Dict[str, float], timestamp: str) -> None:
+        """
+        Stores a DSSC output reading (voltage, current, power).
+        """
+
+    @abstractmethod
+    def insert_data_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Stores several sensor readings at once.
+        """
+
+    @abstractmethod
+    def insert_cell_output_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Stores several DSSC output readings at once.
+        """
+
+    @abstractmethod
+    def commit(self) -> None:
+        """
+        Makes all pending writes durable.
+        """
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """
+        Discards pending writes where the backend supports it.
+        """
+
+    @abstractmethod
+    def clear_all(self) -> None:
+        """
+        Deletes every stored reading from both tables.
+        """
+
+    # ----------------------------------------------------------------
+    # READS
+    # ----------------------------------------------------------------
+    @abstractmethod
+    def fetch_all(self, table: str) -> List[Tuple]:
+        """
+        Returns every row of a table.
+        """
+
+    @abstractmethod
+    def fetch_latest(self, table: str, cell_id: Any = None) -> Optional[Tuple]:
+        """
+        Returns the row with the most recent timestamp, or None if the table is empty.
+        With a cell_id (cell_output only), returns that cell's most recent row.
+        """
+
+    @abstractmethod
+    def fetch_between(self, table: str, start: str, end: str) -> List[Tuple]:
+        """
+        Returns rows with start <= timestamp <= end, ordered chronologically.
+        """
+
+    @abstractmethod
+    def close_conn(self) -> None:
+        """
+        Releases files and connections held by the backend.
+        """
@@ -0,0 +1,527 @@
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Any, Iterable, List, Tuple, BinaryIO
+import numpy as np
+from database.backend import StorageBackend
+from database.timestamps import iso_to_micros
+
+_EPOCH = datetime(1970, 1, 1)
+_MAX_MICROS = (datetime(9999, 12, 31) - _EPOCH) // timedelta(microseconds=1)
+
+
+class ColumnarStore(StorageBackend):
+    """
+    Memory-mapped columnar storage backend for high-rate capture.
+
+    Each series (the sensor_data table, or one cell of cell_output) is stored as one
+    directory per day holding an append-only int64 file of microsecond timestamps and
+    one float32 file per value column:
+
+        <root>/sensor_data/2025-06-12/timestamp.i64, lux.f32, temperature.f32, humidity.f32
+        <root>/cell_output/cell_1/2025-06-12/timestamp.i64, voltage.f32, current.f32, power.f32
+
+    Range reads map the files with numpy.memmap and binary-search the timestamp column,
+    so slices of a single day are returned without copying. Values are stored as
+    float32, and cell identifiers come back as strings.
+    """
+    _TIMESTAMP_FILE = "timestamp.i64"
+    _UNSORTED_MARKER = "UNSORTED"
+    _SENSOR_FIELDS = ("lux", "temperature", "humidity")
+    _CELL_FIELDS = ("voltage", "current", "power")
+    _DEFAULT_ROOT_PATH = "sensor_columns"
+
+    def __init__(self, root_path: Optional[str] = None, fsync_on_commit: bool = False) -> None:
+        """
+        Opens (or creates) a columnar store rooted at the given directory.
+
+        Args:
+            root_path (Optional[str]): Directory that holds the column files.
+                                       Defaults to 'sensor_columns' if None.
+            fsync_on_commit (bool): fsync every written file on commit instead of
+                                    only flushing it to the operating system.
+        """
+        self.root_path: str = root_path or self._DEFAULT_ROOT_PATH
+        self.fsync_on_commit = fsync_on_commit
+        os.makedirs(self.root_path, exist_ok=True)
+
+        # series dir -> (chunk dir, {file name: handle}) for the chunk currently appended to
+        self._open_chunks: Dict[str, Tuple[str, Dict[str, BinaryIO]]] = {}
+        # file path -> size at the last commit, used to undo uncommitted appends
+        self._committed_sizes: Dict[str, int] = {}
+        # files appended to since the last commit, including chunks closed on day rollover
+        self._touched: Dict[str, None] = {}
+        # series dir -> newest appended timestamp in microseconds
+        self._last_micros: Dict[str, int] = {}
+
+    # ----------------------------------------------------------------
+    # LAYOUT HELPERS
+    # ----------------------------------------------------------------
+    def _series_dir(self, table: str, cell_id: Any = None) -> str:
+        """
+        Returns the directory of a series, validating the table and cell identifier.
+        """
+        if table == self._SENSOR_TABLE:
+            return os.path.join(self.root_path, table)
+        elif table == self._CELL_OUTPUT_TABLE:
+            if cell_id is None:
+                raise ValueError("cell_id is required for the cell output table.")
+            name = str(cell_id)
+            if not name or name in {".", ".."} or os.sep in name or (os.altsep and os.altsep in name):
+                raise ValueError(f"Invalid cell_id for columnar storage: {cell_id!r}")
+            return os.path.join(self.root_path, table, name)
+        raise ValueError("Invalid table specified.")
+
+    def _fields_for(self, table: str) -> Tuple[str, ...]:
+        return self._SENSOR_FIELDS if table == self._SENSOR_TABLE else self._CELL_FIELDS
+
+    @staticmethod
+    def _day_of(micros: int) -> str:
+        micros = min(max(int(micros), 0), _MAX_MICROS)
+        return (_EPOCH + timedelta(microseconds=micros)).date().isoformat()
+
+    @staticmethod
+    def _value_file(field: str) -> str:
+        return f"{field}.f32"
+
+    def _series_dirs(self, table: str) -> List[str]:
+        """
+        Lists every existing series directory of a table.
+        """
+        if table == self._SENSOR_TABLE:
+            path = self._series_dir(table)
+            return [path] if os.path.isdir(path) else []
+        elif table == self._CELL_OUTPUT_TABLE:
+            table_dir = os.path.join(self.root_path, table)
+            if not os.path.isdir(table_dir):
+                return []
+            return [os.path.join(table_dir, name) for name in sorted(os.listdir(table_dir))]
+        raise ValueError("Invalid table specified.")
+
+    @staticmethod
+    def _day_dirs(series_dir: str) -> List[str]:
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(name for name in os.listdir(series_dir) if os.path.isdir(os.path.join(series_dir, name)))
+
+    # ----------------------------------------------------------------
+    # WRITES
+    # ----------------------------------------------------------------
+    def _handles_for(self, series_dir: str, chunk_dir: str, fields: Tuple[str, ...]) -> Dict[str, BinaryIO]:
+        """
+        Returns append handles for a chunk, closing the previous chunk of the series on day rollover.
+        """
+        current = self._open_chunks.get(series_dir)
+        if current and current[0] == chunk_dir:
+            return current[1]
+        if current:
+            for handle in current[1].values():
+                handle.close()
+
+        os.makedirs(chunk_dir, exist_ok=True)
+        self._repair_chunk(chunk_dir, fields)
+        handles: Dict[str, BinaryIO] = {}
+        for name in [self._value_file(field) for field in fields] + [self._TIMESTAMP_FILE]:
+            path = os.path.join(chunk_dir, name)
+            handles[name] = open(path, "ab")
+            self._committed_sizes.setdefault(path, handles[name].tell())
+        self._open_chunks[series_dir] = (chunk_dir, handles)
+        return handles
+
+    def _repair_chunk(self, chunk_dir: str, fields: Tuple[str, ...]) -> None:
+        """
+        Truncates every column file of a chunk to the row count they all hold.
+
+        A crash mid-append can leave some columns longer than others; appending at
+        each file's own end would then pair every later row with the wrong values.
+        """
+        files = {self._value_file(field): 4 for field in fields}
+        files[self._TIMESTAMP_FILE] = 8
+        paths = {os.path.join(chunk_dir, name): itemsize for name, itemsize in files.items()}
+        sizes = {path: os.path.getsize(path) if os.path.exists(path) else 0 for path in paths}
+        rows = min(size // paths[path] for path, size in sizes.items())
+        torn = [path for path, size in sizes.items() if size > rows * paths[path]]
+        for path in torn:
+            os.truncate(path, rows * paths[path])
+        if torn:
+            print(f"[COLUMNAR] Discarded a torn append in {chunk_dir}; {rows} rows kept.")
+
+    def _last_appended(self, series_dir: str) -> Optional[int]:
+        """
+        Returns the newest timestamp already stored in a series, reading it from disk once.
+        """
+        if series_dir not in self._last_micros:
+            for day in reversed(self._day_dirs(series_dir)):
+                timestamps = self._load_column(os.path.join(series_dir, day, self._TIMESTAMP_FILE), np.int64)
+                if timestamps is not None and len(timestamps):
+                    self._last_micros[series_dir] = int(timestamps.max())
+                    break
+        return self._last_micros.get(series_dir)
+
+    def _stored_micros(self, series_dir: str, days: Iterable[str]) -> np.ndarray:
+        """
+        Returns every timestamp stored in the given day chunks of a series, including pending appends.
+        """
+        self._flush_pending()
+        stored = [np.zeros(0, dtype=np.int64)]
+        for day in days:
+            timestamps = self._load_column(os.path.join(series_dir, day, self._TIMESTAMP_FILE), "<i8")
+            if timestamps is not None:
+                stored.append(np.asarray(timestamps))
+        return np.concatenate(stored)
+
+    def _append(
+        self,
+        table: str,
+        cell_id: Any,
+        micros: np.ndarray,
+        values: Dict[str, np.ndarray],
+        ignore_duplicates: bool
+    ) -> None:
+        """
+        Appends a batch of one series, splitting it into per-day chunks.
+        """
+        series_dir = self._series_dir(table, cell_id)
+        fields = self._fields_for(table)
+        last = self._last_appended(series_dir)
+
+        if ignore_duplicates and last is not None:
+            keep = micros > last
+            if not keep.all():
+                # Only rows at or before the newest stored one can repeat a stored key
+                older = micros[~keep]
+                stored = self._stored_micros(series_dir, {self._day_of(value) for value in np.unique(older)})
+                keep[~keep] = ~np.isin(older, stored)
+            micros = micros[keep]
+            values = {field: column[keep] for field, column in values.items()}
+        if not len(micros):
+            return
+
+        days = (micros // 86_400_000_000).astype(np.int64)
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for segment in np.split(np.arange(len(micros)), boundaries):
+            chunk_dir = os.path.join(series_dir, self._day_of(micros[segment[0]]))
+            handles = self._handles_for(series_dir, chunk_dir, fields)
+            self._touched.update(dict.fromkeys(handle.name for handle in handles.values()))
+            chunk_micros = micros[segment]
+
+            previous = self._last_micros.get(series_dir)
+            if (previous is not None and chunk_micros[0] < previous) or np.any(np.diff(chunk_micros) < 0):
+                # Out-of-order data (e.g. a clock adjustment): reads fall back to a mask scan.
+                open(os.path.join(chunk_dir, self._UNSORTED_MARKER), "a").close()
+
+            # Values are written before timestamps; readers trim every column to the
+            # shortest file, so a crash mid-append never exposes a half-written row.
+            for field in fields:
+                handles[self._value_file(field)].write(values[field][segment].astype("<f4").tobytes())
+            handles[self._TIMESTAMP_FILE].write(chunk_micros.astype("<i8").tobytes())
+            newest = int(chunk_micros.max())
+            self._last_micros[series_dir] = newest if previous is None else max(previous, newest)
+
+    @staticmethod
+    def _to_float_array(values: List[Optional[float]]) -> np.ndarray:
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float32)
+
+    def insert_data(self, data: Dict[str, Any]) -> None:
+        """
+        Appends a sensor reading (lux, temp, humidity).
+
+        Args:
+            data (Dict[str, Any]): Sensor data dictionary.
+        """
+        self.insert_data_many([data])
+
+    def insert_cell_output(self, cell_id: Any, reading: Dict[str, float], timestamp: str) -> None:
+        """
+        Appends a DSSC output reading.
+
+        Args:
+            cell_id (Any): The identifier for the DSSC.
+            reading (Dict[str, float]): A dictionary with voltage, current, and power.
+            timestamp (str): ISO-format timestamp.
+        """
+        self.insert_cell_output_many([{"timestamp": timestamp, "cell_id": cell_id, **reading}])
+
+    def insert_data_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Appends several sensor readings.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Sensor data dictionaries.
+            ignore_duplicates (bool): Skip rows whose timestamp is already stored.
+            commit (bool): Flush the appended data once all rows are written.
+        """
+        records = list(records)
+        if records:
+            micros = np.array([iso_to_micros(record["timestamp"]) for record in records], dtype=np.int64)
+            values = {
+                field: self._to_float_array([record[field] for record in records])
+                for field in self._SENSOR_FIELDS
+            }
+            self._append(self._SENSOR_TABLE, None, micros, values, ignore_duplicates)
+        if commit:
+            self.commit()
+
+    def insert_cell_output_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Appends several DSSC output readings, grouped per cell.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Dictionaries with timestamp, cell_id,
+                                               voltage, current, and power.
+            ignore_duplicates (bool): Skip rows whose timestamp is already stored for their cell.
+            commit (bool): Flush the appended data once all rows are written.
+        """
+        by_cell: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_cell.setdefault(str(record["cell_id"]), []).append(record)
+
+        for cell_id, rows in by_cell.items():
+            micros = np.array([iso_to_micros(row["timestamp"]) for row in rows], dtype=np.int64)
+            values = {field: self._to_float_array([row[field] for row in rows]) for field in self._CELL_FIELDS}
+            self._append(self._CELL_OUTPUT_TABLE, cell_id, micros, values, ignore_duplicates)
+        if commit:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Flushes appended data (and fsyncs it if configured) and marks it committed.
+        """
+        self._flush_pending()
+        open_files = {handle.name: handle for _, handles in self._open_chunks.values() for handle in handles.values()}
+        for path in self._touched:
+            if self.fsync_on_commit and path in open_files:
+                os.fsync(open_files[path].fileno())
+            elif self.fsync_on_commit:
+                # A chunk closed on day rollover during this transaction
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._committed_sizes[path] = os.path.getsize(path)
+        self._touched.clear()
+
+    def rollback(self) -> None:
+        """
+        Truncates every column file appended to since the last commit back to its committed size.
+        """
+        self._flush_pending()
+        for path in self._touched:
+            os.truncate(path, self._committed_sizes.get(path, 0))
+        self._touched.clear()
+        self._last_micros.clear()
+
+    def clear_all(self) -> None:
+        """
+        Deletes every stored column file.
+        """
+        self._close_handles()
+        for table in (self._SENSOR_TABLE, self._CELL_OUTPUT_TABLE):
+            shutil.rmtree(os.path.join(self.root_path, table), ignore_errors=True)
+        self._committed_sizes.clear()
+        self._touched.clear()
+        self._last_micros.clear()
+
+    # ----------------------------------------------------------------
+    # READS
+    # ----------------------------------------------------------------
+    def _flush_pending(self) -> None:
+        for _, handles in self._open_chunks.values():
+            for handle in handles.values():
+                handle.flush()
+
+    @staticmethod
+    def _load_column(path: str, dtype) -> Optional[np.ndarray]:
+        """
+        Maps a column file read-only, or returns None if it is missing or empty.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) < np.dtype(dtype).itemsize:
+            return None
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def _read_chunk(
+        self,
+        chunk_dir: str,
+        fields: Tuple[str, ...],
+        start_micros: int,
+        end_micros: int
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the rows of one day chunk within the inclusive range.
+        """
+        timestamps = self._load_column(os.path.join(chunk_dir, self._TIMESTAMP_FILE), "<i8")
+        if timestamps is None:
+            return None
+        columns = {field: self._load_column(os.path.join(chunk_dir, self._value_file(field)), "<f4") for field in fields}
+        length = min([len(timestamps)] + [0 if column is None else len(column) for column in columns.values()])
+        if length == 0:
+            return None
+
+        if os.path.exists(os.path.join(chunk_dir, self._UNSORTED_MARKER)):
+            timestamps = timestamps[:length]
+            selected = np.flatnonzero((timestamps >= start_micros) & (timestamps <= end_micros))
+            selected = selected[np.argsort(timestamps[selected], kind="stable")]
+            return {"timestamp": timestamps[selected], **{field: column[selected] for field, column in columns.items()}}
+
+        lo = int(np.searchsorted(timestamps[:length], start_micros, side="left"))
+        hi = int(np.searchsorted(timestamps[:length], end_micros, side="right"))
+        return {"timestamp": timestamps[lo:hi], **{field: column[lo:hi] for field, column in columns.items()}}
+
+    def read_range(
+        self,
+        table: str,
+        start_micros: int,
+        end_micros: int,
+        cell_id: Any = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Returns the columns of one series within an inclusive microsecond range.
+
+        Ranges inside a single day are zero-copy views of the memory-mapped files;
+        ranges spanning several days are concatenated.
+
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            start_micros (int): Start of the range in microseconds since the epoch.
+            end_micros (int): End of the range in microseconds since the epoch.
+            cell_id (Any): Cell to read; required for the cell output table.
+
+        Returns:
+            Dict[str, np.ndarray]: 'timestamp' (int64 microseconds) plus one float32 array per value column.
+        """
+        series_dir = self._series_dir(table, cell_id)
+        fields = self._fields_for(table)
+        self._flush_pending()
+
+        first_day, last_day = self._day_of(start_micros), self._day_of(end_micros)
+        parts = []
+        for day in self._day_dirs(series_dir):
+            if first_day <= day <= last_day:
+                part = self._read_chunk(os.path.join(series_dir, day), fields, start_micros, end_micros)
+                if part is not None and len(part["timestamp"]):
+                    parts.append(part)
+
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return {"timestamp": np.empty(0, dtype=np.int64), **{field: np.empty(0, dtype=np.float32) for field in fields}}
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+    @staticmethod
+    def _micros_to_iso_list(micros: np.ndarray) -> List[str]:
+        """
+        Formats microsecond timestamps exactly like `datetime.isoformat()`.
+        """
+        formatted = np.datetime_as_string(micros.astype("datetime64[us]"), unit="us")
+        return [value[:-7] if value.endswith(".000000") else value for value in formatted.tolist()]
+
+    @staticmethod
+    def _to_optional_list(column: np.ndarray) -> List[Optional[float]]:
+        return [None if value != value else value for value in column.astype(np.float64).tolist()]
+
+    def _rows_between(self, table: str, start_micros: int, end_micros: int) -> List[Tuple]:
+        """
+        Builds row tuples for a range, merging all cells of the cell output table by time.
+        """
+        fields = self._fields_for(table)
+        if table == self._SENSOR_TABLE:
+            data = self.read_range(table, start_micros, end_micros)
+            return list(zip(self._micros_to_iso_list(data["timestamp"]), *[self._to_optional_list(data[f]) for f in fields]))
+
+        timestamps, cell_ids, columns = [], [], {field: [] for field in fields}
+        for series_dir in self._series_dirs(table):
+            cell_id = os.path.basename(series_dir)
+            data = self.read_range(table, start_micros, end_micros, cell_id=cell_id)
+            timestamps.append(np.asarray(data["timestamp"]))
+            cell_ids.extend([cell_id] * len(data["timestamp"]))
+            for field in fields:
+                columns[field].append(np.asarray(data[field]))
+        if not timestamps:
+            return []
+
+        merged = np.concatenate(timestamps)
+        order = np.argsort(merged, kind="stable")
+        values = [self._to_optional_list(np.concatenate(columns[field])[order]) for field in fields]
+        return list(zip(self._micros_to_iso_list(merged[order]), [cell_ids[i] for i in order.tolist()], *values))
+
+    def fetch_all(self, table: str) -> List[Tuple]:
+        """
+        Returns every row of a table in chronological order.
+
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+        """
+        return self._rows_between(table, np.iinfo(np.int64).min, np.iinfo(np.int64).max)
+
+    def fetch_latest(self, table: str, cell_id: Any = None) -> Optional[Tuple]:
+        """
+        Returns the most recent row of a table, or None if it is empty.
+
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            cell_id (Any): Restrict cell_output to one cell.
+        """
+        self.columns_for(table)
+        self._flush_pending()
+        newest = None
+        series_dirs = [self._series_dir(table, cell_id)] if cell_id is not None else self._series_dirs(table)
+        for series_dir in series_dirs:
+            for day in reversed(self._day_dirs(series_dir)):
+                timestamps = self._load_column(os.path.join(series_dir, day, self._TIMESTAMP_FILE), "<i8")
+                if timestamps is not None and len(timestamps):
+                    candidate = int(timestamps.max())
+                    if newest is None or candidate > newest:
+                        newest = candidate
+                    break
+        if newest is None:
+            return None
+        rows = self._rows_between(table, newest, newest)
+        if cell_id is not None:
+            rows = [row for row in rows if row[1] == str(cell_id)]
+        return rows[-1] if rows else None
+
+    def fetch_between(self, table: str, start: str, end: str) -> List[Tuple]:
+        """
+        Returns rows within the inclusive timestamp range, ordered chronologically.
+
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            start (str): Start timestamp (inclusive) in ISO format.
+            end (str): End timestamp (inclusive) in ISO format.
+        """
+        self.columns_for(table)
+        return self._rows_between(table, iso_to_micros(start), iso_to_micros(end))
+
+    def size_on_disk(self) -> int:
+        """
+        Returns the total size of all column files in bytes.
+        """
+        self._flush_pending()
+        total = 0
+        for directory, _, files in os.walk(self.root_path):
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return total
+
+    def _close_handles(self) -> None:
+        for _, handles in self._open_chunks.values():
+            for handle in handles.values():
+                handle.close()
+        self._open_chunks.clear()
+
+    def close_conn(self) -> None:
+        """
+        Commits pending appends and closes all open column files.
+        """
+        self.commit()
+        self._close_handles()
@@ -1,22 +1,55 @@
-from typing import List, Dict
+import heapq
+import os
+import warnings
+from operator import itemgetter
+from typing import List, Dict, Optional, Any, Callable, Iterator, Sequence, Tuple
+from database.archive import ArchiveStore
+from database.backend import FeatureUnavailableError, StorageBackend
 from database.db import SensorDatabase
+from database.quality import QualityValidator
+from database.query_cache import QueryCache
+from database.timestamps import FIRST_TIMESTAMP, LAST_TIMESTAMP, iso_to_micros, micros_to_iso
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 class SensorDataReader:
     """
     Provides access to sensor and DSSC data stored in the SQLite data.
     """
+    # Rows converted to arrays at a time by load_dataframe
+    _LOAD_CHUNK_ROWS = 65536
     
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        backend: Optional[StorageBackend] = None,
+        cache: Optional[QueryCache] = None,
+        read_only: bool = False,
+        validator: Optional[QualityValidator] = None
+    ) -> None:
         """
         Initializes the data reader with a given database path.
         
         Args:
-            db_path (str): Path to the SQLite database file.
+            db_path (Optional[str]): Path to the SQLite database file.
+            backend (Optional[StorageBackend]): Alternative storage backend to read from.
+                                                Takes precedence over db_path when provided.
+            cache (Optional[QueryCache]): Result cache for range, latest-entry and aggregate
+                                          queries. Subscribe it to the SensorLogger that writes
+                                          the data so new readings invalidate stale windows.
+            read_only (bool): Open the SQLite database read-only.
+            validator (Optional[QualityValidator]): Validation applied by load_dataframe.
+                                                    QualityValidator() with its default rules if None.
         """
-        self.db = SensorDatabase(db_path=db_path)
-        self.cursor = self.db.cursor
-        self.conn = self.db.conn
+        self.db = backend or SensorDatabase(db_path=db_path, read_only=read_only)
+        self.cache = cache
+        self.validator = validator or QualityValidator()
+        # The raw SQLite handles are only available on the default backend.
+        self.cursor = getattr(self.db, "cursor", None)
+        self.conn = getattr(self.db, "conn", None)
+        # Archived (compressed) history is decoded transparently by the read methods
+        self.archive = ArchiveStore(self.db) if self.conn is not None else None
         
     def get_all_data(self) -> List[Dict]:
         """
@@ -25,8 +58,7 @@ class SensorDataReader:
         Returns:
             List[Dict]: A list of all sensor readings as dictionaries.
         """
-        self.cursor.execute(f"SELECT * FROM {SensorDatabase._SENSOR_TABLE};")
-        rows = self.cursor.fetchall()
+        rows = self._fetch_all(SensorDatabase._SENSOR_TABLE)
         return [self._row_to_dict(row, "sensor") for row in rows]
     
     def get_all_dssc_data(self) -> List[Dict]:
@@ -36,16 +68,16 @@ class SensorDataReader:
         Returns:
             List[Dict]: All rows from the cell_output table.
         """
-        self.cursor.execute(f"SELECT * FROM {SensorDatabase._CELL_OUTPUT_TABLE};")
-        rows = self.cursor.fetchall()
+        rows = self._fetch_all(SensorDatabase._CELL_OUTPUT_TABLE)
         return [self._row_to_dict(row, "cell") for row in rows]
     
-    def get_latest_entry(self, table: str) -> Dict:
+    def get_latest_entry(self, table: str, cell_id: Any = None) -> Optional[Dict]:
         """
-        Retrieves the most recent sensor reading.
+        Retrieves the most recent sensor reading, archived or live.
         
         Args:
             table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE
+            cell_id (Any): Restrict cell_output to one cell.
         
         Returns:
             Dict: The most recent row, or None if empty.
@@ -56,14 +88,18 @@ class SensorDataReader:
         if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
             raise ValueError("Invalid table specified.")
         
-        self.cursor.execute(
-            f"""
-            SELECT * FROM {table}
-            ORDER BY timestamp DESC LIMIT 1;
-            """
-        )
-        row = self.cursor.fetchone()
-        return self._row_to_dict(row, "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell")
+        def load() -> Optional[Dict]:
+            row = self.db.fetch_latest(table, cell_id)
+            if self.archive is not None:
+                # Once a series is fully archived (or only late rows remain live) the newest reading is archived
+                archived = self.archive.latest(table, cell_id)
+                if archived is not None and (row is None or archived[0] > row[0]):
+                    row = archived
+            if row is None:
+                return None
+            return self._row_to_dict(row, "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell")
+        
+        return self._cached(QueryCache.make_key("latest", table, cell_id=cell_id), table, None, load)
     
     def get_data_between(self, table: str, start: str, end: str) -> List[Dict]:
         """
@@ -83,18 +119,266 @@ class SensorDataReader:
         if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
             raise ValueError("Invalid table specified.")
         
-        self.cursor.execute(
+        def load() -> List[Dict]:
+            rows = self._rows_between(table, start, end)
+            row_type = "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell"
+            return [self._row_to_dict(row, row_type) for row in rows]
+        
+        return self._cached(QueryCache.make_key("between", table, start, end), table, end, load)
+    
+    def iter_data_between(self, table: str, start: str, end: str) -> Iterator[Dict]:
+        """
+        Streams sensor readings within the timestamp range without materialising them.
+        
+        Archived blocks are decoded one at a time per series, so memory stays bounded
+        however long the range is. Results are not cached.
+        
+        Args:
+            table (str): Table name to query.
+            start (str): Start timestamp (inclusive) in ISO format.
+            end (str): End timestamp (inclusive) in ISO format.
+            
+        Yields:
+            Dict: Matching records ordered chronologically.
+            
+        Raises:
+            ValueError: If an invalid table name is provided.
+        """
+        if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
+            raise ValueError("Invalid table specified.")
+        row_type = "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell"
+        if self.conn is None:
+            rows = iter(self.db.fetch_between(table, start, end))
+        else:
+            rows = self._iter_rows_between(table, start, end)
+        for row in rows:
+            yield self._row_to_dict(row, row_type)
+    
+    def get_aggregates(
+        self,
+        table: str,
+        start: str,
+        end: str,
+        bucket_seconds: int,
+        cell_id: Any = None
+    ) -> List[Dict]:
+        """
+        Retrieves count, mean, minimum and maximum of every value column per time bucket.
+        
+        Args:
+            table (str): Table name to query.
+            start (str): Start timestamp (inclusive) in ISO format.
+            end (str): End timestamp (inclusive) in ISO format.
+            bucket_seconds (int): Width of each time bucket in seconds.
+            cell_id (Any): Restrict cell_output aggregates to a single cell.
+            
+        Returns:
+            List[Dict]: One dictionary per bucket (and cell, for cell_output) ordered by time,
+                        with 'bucket_start', 'count' and '<column>_avg/_min/_max' keys.
+            
+        Raises:
+            ValueError: If an invalid table name or bucket width is provided.
+        """
+        if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
+            raise ValueError("Invalid table specified.")
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive.")
+        
+        key = QueryCache.make_key("aggregates", table, start, end, bucket_seconds, cell_id)
+        return self._cached(key, table, end, lambda: self._load_aggregates(table, start, end, bucket_seconds, cell_id))
+    
+    def _load_aggregates(self, table: str, start: str, end: str, bucket_seconds: int, cell_id: Any) -> List[Dict]:
+        """
+        Computes bucketed aggregates in SQL on SQLite, or with pandas on other backends.
+        """
+        is_cell = table == SensorDatabase._CELL_OUTPUT_TABLE
+        fields = [column for column in self.db.columns_for(table) if column not in ("timestamp", "cell_id")]
+        group_columns = ["bucket"] + (["cell_id"] if is_cell else [])
+        
+        if self.conn is not None and not self.archive.overlaps(table, start, end):
+            aggregates = ", ".join(f"AVG({f}), MIN({f}), MAX({f})" for f in fields)
+            cell_filter = " AND cell_id = ?" if cell_id is not None else ""
+            params = [bucket_seconds, bucket_seconds, start, end] + ([cell_id] if cell_id is not None else [])
+            rows = self.conn.execute(
+                f"""
+                SELECT (CAST(strftime('%s', timestamp) AS INTEGER) / ?) * ? AS bucket,
+                       {"cell_id, " if is_cell else ""}COUNT(*), {aggregates}
+                FROM {table}
+                WHERE timestamp BETWEEN ? AND ?{cell_filter}
+                GROUP BY {", ".join(group_columns)}
+                ORDER BY {", ".join(group_columns)};
+                """,
+                params,
+            ).fetchall()
+        else:
+            df = pd.DataFrame.from_records(self._rows_between(table, start, end), columns=list(self.db.columns_for(table)))
+            if cell_id is not None:
+                df = df[df["cell_id"].astype(str) == str(cell_id)]
+            seconds = (pd.to_datetime(df["timestamp"], format="ISO8601") - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+            df["bucket"] = seconds // bucket_seconds * bucket_seconds
+            grouped = df.groupby(group_columns, sort=True)
+            summary = grouped[fields].agg(["mean", "min", "max"])
+            summary.insert(0, "count", grouped.size())
+            rows = [
+                (*(index if isinstance(index, tuple) else (index,)), *values)
+                for index, values in zip(summary.index, summary.itertuples(index=False))
+            ]
+        
+        results = []
+        for row in rows:
+            offset = len(group_columns)
+            entry = {"bucket_start": micros_to_iso(int(row[0]) * 1_000_000)}
+            if is_cell:
+                entry["cell_id"] = row[1]
+            entry["count"] = row[offset]
+            for idx, field in enumerate(fields):
+                entry[f"{field}_avg"], entry[f"{field}_min"], entry[f"{field}_max"] = row[offset + 1 + 3 * idx:offset + 4 + 3 * idx]
+            results.append(entry)
+        return results
+    
+    def changes_since(self, table: str, seq: int = 0, limit: int = 1000) -> Tuple[List[Dict], int]:
+        """
+        Retrieves rows inserted after a change-feed position, oldest first.
+        
+        Every inserted row carries a per-table sequence number that only ever grows,
+        so repeated calls with the returned cursor read each row once, at a cost
+        proportional to the new rows rather than to the table's history.
+        
+        Args:
+            table (str): Table name to follow.
+            seq (int): Cursor returned by the previous call (0 to start from the beginning).
+            limit (int): Maximum number of rows per batch.
+            
+        Returns:
+            Tuple[List[Dict], int]: Row dictionaries (with an extra 'seq' key) and the
+                                    cursor to pass to the next call.
+            
+        Raises:
+            ValueError: If an invalid table name is provided.
+            FeatureUnavailableError: If the storage backend has no change feed, or its
+                                     migration (SensorDatabase.migrate_change_feed) is unfinished.
+        """
+        if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
+            raise ValueError("Invalid table specified.")
+        if self.conn is None:
+            raise FeatureUnavailableError("The change feed", self.db)
+        
+        row_type = "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell"
+        rows = self.db.fetch_changes(table, seq, limit)
+        changes = [{"seq": row[0], **self._row_to_dict(row[1:], row_type)} for row in rows]
+        return changes, rows[-1][0] if rows else seq
+    
+    def read_changes(self, consumer: str, table: str, limit: int = 1000) -> Tuple[List[Dict], int]:
+        """
+        Retrieves the next batch for a named consumer from its persisted checkpoint.
+        
+        The checkpoint is not advanced; call commit_changes with the returned cursor
+        once the batch has been processed, so a crash replays it instead of losing it.
+        
+        Args:
+            consumer (str): Name of the downstream job, e.g. 'merge' or 'dashboard'.
+            table (str): Table name to follow.
+            limit (int): Maximum number of rows per batch.
+            
+        Returns:
+            Tuple[List[Dict], int]: Same as changes_since.
+            
+        Raises:
+            FeatureUnavailableError: If the storage backend has no change feed, or its
+                                     migration (SensorDatabase.migrate_change_feed) is unfinished.
+        """
+        if self.conn is None:
+            raise FeatureUnavailableError("The change feed", self.db)
+        return self.changes_since(table, self.db.get_feed_checkpoint(consumer, table), limit)
+    
+    def commit_changes(self, consumer: str, table: str, seq: int) -> None:
+        """
+        Persists a named consumer's checkpoint. Requires a writable database.
+        
+        Args:
+            consumer (str): Name of the downstream job.
+            table (str): Table name the cursor belongs to.
+            seq (int): Cursor returned by read_changes or changes_since.
+            
+        Raises:
+            FeatureUnavailableError: If the storage backend has no change feed.
+        """
+        if self.conn is None:
+            raise FeatureUnavailableError("The change feed", self.db)
+        self.db.set_feed_checkpoint(consumer, table, seq)
+    
+    def get_iv_sweeps(
+        self,
+        cell_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Retrieves stored I-V sweeps with their figures of merit.
+        
+        Args:
+            cell_id (Optional[str]): Restrict to one cell.
+            start (Optional[str]): Start timestamp (inclusive) in ISO format.
+            end (Optional[str]): End timestamp (inclusive) in ISO format.
+            
+        Returns:
+            List[Dict]: One dictionary per sweep with 'timestamp', 'cell_id', 'voltage' and
+                        'current' (float32 arrays) and the keys of analyze_iv.
+            
+        Raises:
+            FeatureUnavailableError: If the storage backend does not store I-V sweeps.
+        """
+        if self.conn is None:
+            raise FeatureUnavailableError("I-V sweep storage", self.db)
+        keys = ("timestamp", "cell_id", "voltage", "current", *SensorDatabase.IV_SUMMARY_COLUMNS)
+        return [dict(zip(keys, row)) for row in self.db.fetch_iv_sweeps(cell_id, start, end)]
+    
+    def _iter_rows_between(self, table: str, start: str, end: str) -> Iterator[Tuple]:
+        """
+        Merges archived and live SQLite rows of a range in timestamp order, lazily.
+        """
+        live = self.conn.execute(
             f"""
-            SELECT * FROM {table}
-            WHERE timestamp BETWEEN ? and ?
+            SELECT {", ".join(self.db.columns_for(table))} FROM {table}
+            WHERE timestamp BETWEEN ? AND ?
             ORDER BY timestamp ASC;
             """,
             (start, end),
         )
-        rows = self.cursor.fetchall()
-        row_type = "sensor" if table == SensorDatabase._SENSOR_TABLE else "cell"
-        return [self._row_to_dict(row, row_type) for row in rows]
-     
+        return heapq.merge(self.archive.iter_rows(table, start, end), live, key=lambda row: row[0])
+    
+    def _rows_between(self, table: str, start: str, end: str) -> List[Tuple]:
+        """
+        Returns the rows of a range, including archived ones, ordered chronologically.
+        """
+        if self.archive is None or not self.archive.overlaps(table, start, end):
+            return self.db.fetch_between(table, start, end)
+        return list(self._iter_rows_between(table, start, end))
+    
+    def _fetch_all(self, table: str) -> List[Tuple]:
+        """
+        Returns every row of a table, archived rows first.
+        """
+        rows = self.db.fetch_all(table)
+        if self.archive is None or not self.archive.overlaps(table):
+            return rows
+        return list(self.archive.iter_rows(table)) + rows
+    
+    def _cached(self, key: tuple, table: str, end: Optional[str], load: Callable[[], Any]) -> Any:
+        """
+        Returns a cached result for the key, or loads and caches it.
+        """
+        if self.cache is None:
+            return load()
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        # A write invalidating the table while load() runs makes put() discard the result
+        generation = self.cache.generation(table)
+        value = load()
+        self.cache.put(key, value, table, end, generation)
+        return value
+    
     
     def _row_to_dict(self, row, table_type: str) -> Dict:
         """
@@ -132,11 +416,8 @@ class SensorDataReader:
         Returns:
             Dict[str, pd.DataFrame]: Dictionary with keys 'sensor_data' and 'cell_output'
         """
-        sensor_query = f"SELECT * FROM {SensorDatabase.get_sensor_table_name()};"
-        cell_query = f"SELECT * FROM {SensorDatabase.get_cell_output_table_name()};"
-        
-        sensor_df = pd.read_sql_query(sensor_query, self.conn)
-        cell_df = pd.read_sql_query(cell_query, self.conn)
+        sensor_df = self._table_to_dataframe(SensorDatabase.get_sensor_table_name())
+        cell_df = self._table_to_dataframe(SensorDatabase.get_cell_output_table_name())
         
         if print_dfs:
             print("Sensor Data:")
@@ -150,22 +431,196 @@ class SensorDataReader:
             "cell_output": cell_df
         }
     
+    def _table_to_dataframe(self, table: str) -> pd.DataFrame:
+        """
+        Loads a whole table into a DataFrame, letting pandas read SQLite directly when possible.
+        """
+        columns = self.db.columns_for(table)
+        if self.conn is not None:
+            live = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {table};", self.conn)
+            if not self.archive.overlaps(table):
+                return live
+            archived = pd.DataFrame.from_records(self.archive.iter_rows(table), columns=list(columns))
+            return pd.concat([archived, live], ignore_index=True)
+        return pd.DataFrame.from_records(self.db.fetch_all(table), columns=list(columns))
+    
+    def load_dataframe(
+        self,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        float32: bool = False,
+        layout: str = "long",
+        validate: bool = True
+    ) -> pd.DataFrame:
+        """
+        Loads a table into a typed DataFrame, ordered chronologically.
+        
+        Unlike show_all_dataframes, timestamps are parsed once into datetime64[ns],
+        cell_id becomes categorical and values can be stored as float32. Only the
+        requested columns and time range are read from SQLite (archived blocks are
+        merged in), and rows are converted to arrays in chunks so the intermediate
+        Python objects never exist for the whole table at once.
+        
+        By default the readings then go through the reader's QualityValidator:
+        out-of-order and duplicate rows are repaired, implausible values become NaN
+        and a 'quality' column holds the QualityValidator flags of every row.
+        
+        Args:
+            table (str): Table name to load.
+            start (Optional[str]): Start timestamp (inclusive) in ISO format; unbounded if None.
+            end (Optional[str]): End timestamp (inclusive) in ISO format; unbounded if None.
+            columns (Optional[Sequence[str]]): Value columns to load, e.g. ['power']. All if None.
+                                               timestamp (and cell_id) are always included.
+            float32 (bool): Store values as float32 instead of float64.
+            layout (str): 'long' for one row per reading; 'wide' for a DatetimeIndex, with
+                          cell_output pivoted to (value column, cell_id) MultiIndex columns.
+            validate (bool): Validate and clean the readings; False returns them as stored.
+            
+        Returns:
+            pd.DataFrame: The typed readings.
+            
+        Raises:
+            ValueError: If the table, a column or the layout is invalid.
+        """
+        if table not in {SensorDatabase._SENSOR_TABLE, SensorDatabase._CELL_OUTPUT_TABLE}:
+            raise ValueError("Invalid table specified.")
+        if layout not in ("long", "wide"):
+            raise ValueError("Layout must be 'long' or 'wide'.")
+        all_columns = self.db.columns_for(table)
+        keys = [column for column in all_columns if column in ("timestamp", "cell_id")]
+        value_columns = [column for column in all_columns if column not in keys]
+        if columns is None:
+            columns = value_columns
+        elif any(column not in value_columns for column in columns):
+            raise ValueError(f"Columns must be chosen from {value_columns}.")
+        selected = [*keys, *columns]
+        dtype = np.float32 if float32 else np.float64
+        
+        parts: Dict[str, list] = {column: [] for column in selected}
+        for chunk in self._iter_projected_chunks(table, selected, start, end):
+            transposed = list(zip(*chunk))
+            for column, values in zip(selected, transposed):
+                if column == "timestamp":
+                    parts[column].append(self._parse_timestamps(values))
+                elif column == "cell_id":
+                    parts[column].append(pd.Categorical(values))
+                else:
+                    parts[column].append(np.array(values, dtype=np.float64).astype(dtype, copy=False))
+        
+        data: Dict[str, Any] = {}
+        for column in selected:
+            if column == "cell_id":
+                data[column] = union_categoricals(parts[column]) if parts[column] else pd.Categorical([])
+            elif column == "timestamp":
+                data[column] = np.concatenate(parts[column]) if parts[column] else np.empty(0, dtype="datetime64[ns]")
+            else:
+                data[column] = np.concatenate(parts[column]) if parts[column] else np.empty(0, dtype=dtype)
+        if validate:
+            # Also restores time order
+            data = self.validator.validate(table, data)
+            selected.append("quality")
+        elif not pd.Index(data["timestamp"]).is_monotonic_increasing:
+            # Unordered scans (and clock adjustments) are put in time order here
+            order = np.argsort(data["timestamp"], kind="stable")
+            data = {column: values[order] for column, values in data.items()}
+        df = pd.DataFrame(data, columns=selected)
+        
+        if layout == "long":
+            return df
+        if "cell_id" not in df:
+            return df.set_index("timestamp")
+        return df.pivot(index="timestamp", columns="cell_id", values=selected[len(keys):])
+    
+    def _iter_projected_chunks(
+        self,
+        table: str,
+        selected: List[str],
+        start: Optional[str],
+        end: Optional[str]
+    ) -> Iterator[List[Tuple]]:
+        """
+        Yields chunks of row tuples restricted to the selected columns, mostly in time order.
+        """
+        unbounded = start is None and end is None
+        start, end = start or FIRST_TIMESTAMP, end or LAST_TIMESTAMP
+        if self.conn is None:
+            # Other backends always return full rows
+            project = self._projector(table, selected)
+            rows = self.db.fetch_all(table) if unbounded else self.db.fetch_between(table, start, end)
+            for offset in range(0, len(rows), self._LOAD_CHUNK_ROWS):
+                yield [project(row) for row in rows[offset:offset + self._LOAD_CHUNK_ROWS]]
+            return
+        
+        archived = self.archive.overlaps(table, start, end)
+        if unbounded and not archived:
+            # A plain table scan is much faster than walking the timestamp index, and
+            # rows are stored in insertion order, which is almost always time order.
+            cursor = self.conn.execute(f"SELECT {', '.join(selected)} FROM {table};")
+        else:
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(selected)} FROM {table} WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp ASC;",
+                (start, end),
+            )
+        rows: Iterator[Tuple] = iter(lambda: cursor.fetchmany(self._LOAD_CHUNK_ROWS), [])
+        if archived:
+            project = self._projector(table, selected)
+            archived = (project(row) for row in self.archive.iter_rows(table, start, end))
+            live = (row for chunk in rows for row in chunk)
+            merged = heapq.merge(archived, live, key=lambda row: row[0])
+            rows = iter(lambda: [row for _, row in zip(range(self._LOAD_CHUNK_ROWS), merged)], [])
+        yield from rows
+    
+    def _projector(self, table: str, selected: List[str]) -> Callable[[Tuple], Tuple]:
+        """
+        Returns a function picking the selected columns out of a full row tuple.
+        """
+        positions = [self.db.columns_for(table).index(column) for column in selected]
+        if len(positions) == 1:
+            return lambda row: (row[positions[0]],)
+        return itemgetter(*positions)
+    
+    @staticmethod
+    def _parse_timestamps(values: Sequence[str]) -> np.ndarray:
+        """
+        Parses ISO timestamps into datetime64[ns] in one vectorized step.
+        
+        Timestamps with a UTC offset, which numpy would silently convert to UTC, are
+        parsed one by one into local time instead, matching iso_to_micros.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            try:
+                return np.array(values, dtype="datetime64[us]").astype("datetime64[ns]")
+            except (ValueError, Warning):
+                pass
+        micros = np.array([iso_to_micros(value) for value in values], dtype=np.int64)
+        return micros.astype("datetime64[us]").astype("datetime64[ns]")
+    
     def export_to_csv(self, sensor_file: str = "./data_output/sensor_data.csv",
-                      cell_file: str = "./data_output/cell_output.csv") -> None:
+                      cell_file: str = "./data_output/cell_output.csv",
+                      confirm: bool = True) -> None:
         """
         Exports both tables to CSV files.
         
         Args:
             sensor_file (str): Filename for sensor_data export.
             cell_file (str): Filename for the cell_output export.
+            confirm (bool): Ask for interactive confirmation first. Pass False for
+                            unattended exports.
             
         Raises PermissionError:
             If user declines the confirmation prompt.
         
         """
-        confirm = input("Export current data to CSV before starting? Type 'YES' to confirm: ")
-        if confirm.strip().upper() != "YES":
-            raise PermissionError("Data export aborted by user.")
+        if confirm:
+            answer = input("Export current data to CSV before starting? Type 'YES' to confirm: ")
+            if answer.strip().upper() != "YES":
+                raise PermissionError("Data export aborted by user.")
+        
+        for path in (sensor_file, cell_file):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         
         dataframes = self.show_all_dataframes(print_dfs=False)
         dataframes["sensor_data"].to_csv(sensor_file, index=False)
@@ -173,26 +628,31 @@ class SensorDataReader:
         print(f"[EXPORT] Sensor data saved to: {sensor_file}")
         print(f"[EXPORT] Cell output data saved to: {cell_file}")
     
-    def clear_all_data(self) -> None:
+    def clear_all_data(self, confirm: bool = True) -> None:
         """
         Deletes all records from both sensor_data and cell_output tables.
         Intended for resetting the database before an experiment run.
         Requires user confirmation via interactive prompt to proceed.
         
+        Args:
+            confirm (bool): Ask for interactive confirmation first. Pass False only when
+                            the wipe was requested explicitly (e.g. the --clear flag).
+        
         Raises PermissionError:
             If user declines the confirmation prompt.
         """
         
-        confirm = input(
-            "WARNING: This will permanently delete all dat from 'sensor_data' and 'cell_output'."
-            "Type 'YES' to confirm: "
-        )
-        if confirm.strip().upper() != "YES":
-            raise PermissionError("Data deletion aborted by user.")
+        if confirm:
+            answer = input(
+                "WARNING: This will permanently delete all dat from 'sensor_data' and 'cell_output'."
+                "Type 'YES' to confirm: "
+            )
+            if answer.strip().upper() != "YES":
+                raise PermissionError("Data deletion aborted by user.")
         
-        self.cursor.execute(f"DELETE FROM {SensorDatabase.get_sensor_table_name()};")
-        self.cursor.execute(f"DELETE FROM {SensorDatabase.get_cell_output_table_name()};")
-        self.conn.commit()
+        self.db.clear_all()
+        if self.cache is not None:
+            self.cache.clear()
         print("All data successfully deleted.")
     
     def close(self) -> None:
@@ -1,50 +1,56 @@
 import sqlite3
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, List, Tuple
+import numpy as np
+from database.backend import FeatureUnavailableError, StorageBackend
+from monitoring.metrics import REGISTRY
 
 
-class SensorDatabase:
+class SensorDatabase(StorageBackend):
+    """
+    Default SQLite storage backend.
+    """
     _DEFAULT_DB_PATH = "sensor_data.db"
-    _SENSOR_TABLE = "sensor_data"
-    _CELL_OUTPUT_TABLE = "cell_output"
+    _IV_SWEEP_TABLE = "iv_sweeps"
+    _ARCHIVE_TABLE = "archive_blocks"
+    IV_SUMMARY_COLUMNS: Tuple[str, ...] = ("voc", "isc", "pmax", "vmp", "imp", "fill_factor")
     
-    def __init__(self, db_path: Optional[str] = None) -> None:
+    def __init__(self, db_path: Optional[str] = None, read_only: bool = False) -> None:
         """
         Initializes a connection to the SQLite database.
         
         Args:
             db_path (Optional[str]): Path to the SQLite DB file.
                                      Defaults to 'sensor_data.db' if None.
+            read_only (bool): Open an existing database read-only, e.g. for background
+                              exports that must never contend with the acquisition writer.
         """
         self.db_path: str = db_path or self._DEFAULT_DB_PATH
-        self.conn: sqlite3.Connection = sqlite3.connect(self.db_path)
-        self.cursor: sqlite3.Cursor = self.conn.cursor()
-        self._setup()
+        self.read_only = read_only
         
-    @classmethod
-    def get_sensor_table_name(cls) -> str:
-        """
-        Returns the name of the general sensor data table.
-        """
-        return cls._SENSOR_TABLE
-    
-    @classmethod
-    def get_cell_output_table_name(cls) -> str:
-        """
-        Returns the name of the cell output data table.
-        """
-        return cls._CELL_OUTPUT_TABLE
+        if read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            self.conn: sqlite3.Connection = sqlite3.connect(uri, uri=True)
+            self.cursor: sqlite3.Cursor = self.conn.cursor()
+        else:
+            self.conn = sqlite3.connect(self.db_path)
+            self.cursor = self.conn.cursor()
+            self._setup()
         
     def _setup(self) -> None:
         """
         Ensures required tables exist in the database.
         """
+        # WAL lets read-only connections (exports, maintenance) run alongside the
+        # acquisition writer without either side blocking on the other.
+        self.cursor.execute("PRAGMA journal_mode=WAL;")
         self.cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS {self._SENSOR_TABLE} (
                 timestamp 	TEXT 	NOT NULL,
                 lux 		REAL,
                 temperature REAL,
                 humidity 	REAL,
+                seq 		INTEGER,
                 PRIMARY KEY (timestamp)
             );
         """)
@@ -56,11 +62,158 @@ class SensorDatabase:
                 voltage 	REAL,
                 current 	REAL,
                 power		REAL,
+                seq 		INTEGER,
                 PRIMARY KEY (timestamp, cell_id)
             );
         """)
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self._IV_SWEEP_TABLE} (
+                timestamp 	TEXT 	NOT NULL,
+                cell_id 	TEXT 	NOT NULL,
+                points 		INTEGER NOT NULL,
+                voltage 	BLOB 	NOT NULL,
+                current 	BLOB 	NOT NULL,
+                voc 		REAL,
+                isc 		REAL,
+                pmax 		REAL,
+                vmp 		REAL,
+                imp 		REAL,
+                fill_factor REAL,
+                PRIMARY KEY (timestamp, cell_id)
+            );
+        """)
+        # Compressed blocks written by database.archive.ArchiveStore; cell_id has no
+        # declared type so it keeps whatever type cell_output stored.
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self._ARCHIVE_TABLE} (
+                id 			INTEGER PRIMARY KEY,
+                table_name 	TEXT 	NOT NULL,
+                cell_id,
+                start_ts 	TEXT 	NOT NULL,
+                end_ts 		TEXT 	NOT NULL,
+                row_count 	INTEGER NOT NULL,
+                compression TEXT 	NOT NULL,
+                raw_bytes 	INTEGER NOT NULL,
+                payload 	BLOB 	NOT NULL
+            );
+        """)
+        self.cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{self._ARCHIVE_TABLE}_time
+            ON {self._ARCHIVE_TABLE} (table_name, start_ts, end_ts);
+        """)
+        self._setup_change_feed()
         self.conn.commit()
 
+    def _setup_change_feed(self) -> None:
+        """
+        Ensures the change-feed sequence columns, counters and consumer checkpoints exist.
+        
+        Every inserted row gets the next value of a per-table counter in its `seq`
+        column. Counters never go backwards, not even across clear_all, so a consumer
+        can resume from the last sequence number it processed.
+        
+        Databases created before the change feed only get the (instant) new column
+        here, and their counter starts after the highest existing rowid, so logging
+        can begin at once. Numbering the existing rows in rowid order and indexing
+        them is left to migrate_change_feed, which works in short batches; the feed
+        is unavailable until it has finished.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_sequence (
+                table_name 	TEXT 	PRIMARY KEY,
+                value 		INTEGER NOT NULL
+            );
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_checkpoints (
+                consumer 	TEXT 	NOT NULL,
+                table_name 	TEXT 	NOT NULL,
+                seq 		INTEGER NOT NULL,
+                updated_at 	TEXT 	NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (consumer, table_name)
+            );
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_feed_migration (
+                table_name 	TEXT 	PRIMARY KEY,
+                done_rowid 	INTEGER NOT NULL,
+                last_rowid 	INTEGER NOT NULL
+            );
+        """)
+        for table in (self._SENSOR_TABLE, self._CELL_OUTPUT_TABLE):
+            columns = {row[1] for row in self.cursor.execute(f"PRAGMA table_info({table});")}
+            if "seq" not in columns:
+                # Legacy rows will be numbered seq = rowid, so new rows start above them
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN seq INTEGER;")
+                last_rowid = self.cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table};").fetchone()[0]
+                self.cursor.execute("INSERT OR REPLACE INTO change_sequence VALUES (?, ?);", (table, last_rowid))
+                if last_rowid:
+                    self.cursor.execute("INSERT INTO change_feed_migration VALUES (?, 0, ?);", (table, last_rowid))
+            if not self._feed_migration_pending(table):
+                self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_seq ON {table} (seq);")
+            self.cursor.execute(
+                f"""
+                INSERT OR IGNORE INTO change_sequence (table_name, value)
+                SELECT ?, COALESCE(MAX(seq), 0) FROM {table};
+                """,
+                (table,),
+            )
+
+    def _feed_migration_pending(self, table: Optional[str] = None) -> bool:
+        """
+        Whether rows of a table (or of any table) still wait for migrate_change_feed.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_feed_migration';"
+        ).fetchone()
+        if exists is None:
+            return False
+        query = "SELECT 1 FROM change_feed_migration" + (" WHERE table_name = ?;" if table else ";")
+        return self.conn.execute(query, (table,) if table else ()).fetchone() is not None
+
+    def migrate_change_feed(self, batch_rows: int = 20000) -> bool:
+        """
+        Numbers one batch of pre-change-feed rows per table, in its own short transaction.
+        
+        Call repeatedly (e.g. from BackgroundWorker.submit_feed_migration) until it returns
+        True; the acquisition writer waits for one batch at most. Once a table is fully
+        numbered its seq index is built and its change feed becomes available.
+        
+        Args:
+            batch_rows (int): Rows numbered per call and table.
+            
+        Returns:
+            bool: True once no table has rows left to migrate.
+        """
+        if not self._feed_migration_pending():
+            return True
+        for table, done_rowid, last_rowid in self.conn.execute("SELECT * FROM change_feed_migration;").fetchall():
+            upper = min(done_rowid + batch_rows, last_rowid)
+            self.cursor.execute(
+                f"UPDATE {table} SET seq = rowid WHERE rowid > ? AND rowid <= ? AND seq IS NULL;", (done_rowid, upper)
+            )
+            if upper < last_rowid:
+                self.cursor.execute(
+                    "UPDATE change_feed_migration SET done_rowid = ? WHERE table_name = ?;", (upper, table)
+                )
+            else:
+                self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_seq ON {table} (seq);")
+                self.cursor.execute("DELETE FROM change_feed_migration WHERE table_name = ?;", (table,))
+            self.conn.commit()
+        return not self._feed_migration_pending()
+
+    def _reserve_seq(self, table: str, count: int) -> int:
+        """
+        Advances a table's change counter by `count` and returns the first reserved value.
+        
+        The UPDATE takes SQLite's write lock, so concurrent writers can never reserve
+        the same range; the reservation commits or rolls back with the rows themselves.
+        """
+        self.cursor.execute("UPDATE change_sequence SET value = value + ? WHERE table_name = ?;", (count, table))
+        return self.cursor.execute(
+            "SELECT value FROM change_sequence WHERE table_name = ?;", (table,)
+        ).fetchone()[0] - count + 1
+
         
     def insert_data(self, data: Dict[str, Any]) -> None:
         """
@@ -69,19 +222,21 @@ class SensorDatabase:
         Args:
             data (Dict[str, Any]): Sensor data dictionary.
         """
-        self.cursor.execute(
-            f"""
-            INSERT INTO {self._SENSOR_TABLE} (timestamp, lux, temperature, humidity)
-            VALUES (?, ?, ?, ?);
-            """,
-            (
-                data["timestamp"],
-                data["lux"],
-                data["temperature"],
-                data["humidity"],
+        with REGISTRY.timer("db_insert_seconds", table=self._SENSOR_TABLE):
+            self.cursor.execute(
+                f"""
+                INSERT INTO {self._SENSOR_TABLE} (timestamp, lux, temperature, humidity, seq)
+                VALUES (?, ?, ?, ?, ?);
+                """,
+                (
+                    data["timestamp"],
+                    data["lux"],
+                    data["temperature"],
+                    data["humidity"],
+                    self._reserve_seq(self._SENSOR_TABLE, 1),
+                )
             )
-        )
-        self.conn.commit()
+        self.commit()
         
     def insert_cell_output(self, cell_id: int, reading: Dict[str, float], timestamp: str) -> None:
         """
@@ -92,20 +247,303 @@ class SensorDatabase:
             reading (Dict[str, float]): A dictionary with voltage, current, and power.
             timestamp (str): ISO-format timestamp.
         """
+        with REGISTRY.timer("db_insert_seconds", table=self._CELL_OUTPUT_TABLE):
+            self.cursor.execute(
+                f"""
+                INSERT INTO {self._CELL_OUTPUT_TABLE} (timestamp, cell_id, voltage, current, power, seq)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    timestamp,
+                    cell_id,
+                    reading["voltage"],
+                    reading["current"],
+                    reading["power"],
+                    self._reserve_seq(self._CELL_OUTPUT_TABLE, 1),
+                )
+            )
+        self.commit()
+        
+    def insert_data_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Inserts several sensor readings using a single prepared statement.
+        
+        Args:
+            records (Iterable[Dict[str, Any]]): Sensor data dictionaries.
+            ignore_duplicates (bool): Skip rows whose timestamp already exists
+                                      instead of raising an IntegrityError.
+            commit (bool): Commit the transaction once all rows are written.
+        """
+        verb = "INSERT OR IGNORE" if ignore_duplicates else "INSERT"
+        records = list(records)
+        with REGISTRY.timer("db_insert_seconds", table=self._SENSOR_TABLE):
+            # Ignored duplicates leave gaps in the sequence, which consumers tolerate
+            first_seq = self._reserve_seq(self._SENSOR_TABLE, len(records)) if records else 0
+            self.cursor.executemany(
+                f"""
+                {verb} INTO {self._SENSOR_TABLE} (timestamp, lux, temperature, humidity, seq)
+                VALUES (?, ?, ?, ?, ?);
+                """,
+                (
+                    (data["timestamp"], data["lux"], data["temperature"], data["humidity"], first_seq + idx)
+                    for idx, data in enumerate(records)
+                )
+            )
+        if commit:
+            self.commit()
+        
+    def insert_cell_output_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Inserts several DSSC output readings using a single prepared statement.
+        
+        Args:
+            records (Iterable[Dict[str, Any]]): Dictionaries with timestamp, cell_id,
+                                               voltage, current, and power.
+            ignore_duplicates (bool): Skip rows whose (timestamp, cell_id) already exists
+                                      instead of raising an IntegrityError.
+            commit (bool): Commit the transaction once all rows are written.
+        """
+        verb = "INSERT OR IGNORE" if ignore_duplicates else "INSERT"
+        records = list(records)
+        with REGISTRY.timer("db_insert_seconds", table=self._CELL_OUTPUT_TABLE):
+            first_seq = self._reserve_seq(self._CELL_OUTPUT_TABLE, len(records)) if records else 0
+            self.cursor.executemany(
+                f"""
+                {verb} INTO {self._CELL_OUTPUT_TABLE} (timestamp, cell_id, voltage, current, power, seq)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    (
+                        data["timestamp"],
+                        data["cell_id"],
+                        data["voltage"],
+                        data["current"],
+                        data["power"],
+                        first_seq + idx,
+                    )
+                    for idx, data in enumerate(records)
+                )
+            )
+        if commit:
+            self.commit()
+        
+    def commit(self) -> None:
+        """
+        Commits the current transaction.
+        """
+        with REGISTRY.timer("db_commit_seconds"):
+            self.conn.commit()
+        
+    def rollback(self) -> None:
+        """
+        Rolls back the current transaction.
+        """
+        self.conn.rollback()
+        
+    def clear_all(self) -> None:
+        """
+        Deletes all records from both sensor_data and cell_output tables, including archived blocks.
+        """
+        self.cursor.execute(f"DELETE FROM {self._SENSOR_TABLE};")
+        self.cursor.execute(f"DELETE FROM {self._CELL_OUTPUT_TABLE};")
+        self.cursor.execute(f"DELETE FROM {self._ARCHIVE_TABLE};")
+        self.conn.commit()
+        
+    def fetch_all(self, table: str) -> List[Tuple]:
+        """
+        Returns every row of a table.
+        
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+        """
+        columns = ", ".join(self.columns_for(table))
+        self.cursor.execute(f"SELECT {columns} FROM {table};")
+        return self.cursor.fetchall()
+    
+    def fetch_latest(self, table: str, cell_id: Any = None) -> Optional[Tuple]:
+        """
+        Returns the most recent live row of a table, or None if it is empty.
+        
+        Archived rows are not considered; SensorDataReader.get_latest_entry also
+        checks the archive.
+        
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            cell_id (Any): Restrict cell_output to one cell.
+        """
+        columns = ", ".join(self.columns_for(table))
+        cell_filter = "WHERE cell_id = ?" if cell_id is not None else ""
         self.cursor.execute(
             f"""
-            INSERT INTO {self._CELL_OUTPUT_TABLE} (timestamp, cell_id, voltage, current, power)
-            VALUES (?, ?, ?, ?, ?);
+            SELECT {columns} FROM {table} {cell_filter}
+            ORDER BY timestamp DESC LIMIT 1;
+            """,
+            (cell_id,) if cell_id is not None else (),
+        )
+        return self.cursor.fetchone()
+    
+    def fetch_between(self, table: str, start: str, end: str) -> List[Tuple]:
+        """
+        Returns rows within the inclusive timestamp range, ordered chronologically.
+        
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            start (str): Start timestamp (inclusive) in ISO format.
+            end (str): End timestamp (inclusive) in ISO format.
+        """
+        columns = ", ".join(self.columns_for(table))
+        self.cursor.execute(
+            f"""
+            SELECT {columns} FROM {table}
+            WHERE timestamp BETWEEN ? and ?
+            ORDER BY timestamp ASC;
+            """,
+            (start, end),
+        )
+        return self.cursor.fetchall()
+    
+    def fetch_changes(self, table: str, seq: int, limit: int) -> List[Tuple]:
+        """
+        Returns rows inserted after a change-feed position, in insertion order.
+        
+        Args:
+            table (str): Must be either _SENSOR_TABLE or _CELL_OUTPUT_TABLE.
+            seq (int): Last sequence number already processed (0 for the beginning).
+            limit (int): Maximum number of rows to return.
+            
+        Returns:
+            List[Tuple]: Rows laid out as ('seq', *columns_for(table)).
+            
+        Raises:
+            FeatureUnavailableError: If migrate_change_feed has not finished numbering the table.
+        """
+        if self._feed_migration_pending(table):
+            raise FeatureUnavailableError(
+                "The change feed", self, f"{table} rows from before the change feed are still being numbered."
+            )
+        columns = ", ".join(self.columns_for(table))
+        self.cursor.execute(
+            f"""
+            SELECT seq, {columns} FROM {table}
+            WHERE seq > ?
+            ORDER BY seq ASC LIMIT ?;
+            """,
+            (seq, limit),
+        )
+        return self.cursor.fetchall()
+    
+    def get_feed_checkpoint(self, consumer: str, table: str) -> int:
+        """
+        Returns the last sequence number a named consumer committed for a table, or 0.
+        """
+        row = self.cursor.execute(
+            "SELECT seq FROM feed_checkpoints WHERE consumer = ? AND table_name = ?;", (consumer, table)
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def set_feed_checkpoint(self, consumer: str, table: str, seq: int) -> None:
+        """
+        Persists a named consumer's position in a table's change feed.
+        """
+        self.cursor.execute(
+            """
+            INSERT INTO feed_checkpoints (consumer, table_name, seq) VALUES (?, ?, ?)
+            ON CONFLICT (consumer, table_name)
+            DO UPDATE SET seq = excluded.seq, updated_at = CURRENT_TIMESTAMP;
+            """,
+            (consumer, table, seq),
+        )
+        self.commit()
+        
+    def insert_iv_sweep(
+        self,
+        cell_id: str,
+        timestamp: str,
+        voltage: np.ndarray,
+        current: np.ndarray,
+        summary: Dict[str, float]
+    ) -> None:
+        """
+        Stores one I-V sweep with its figures of merit.
+        
+        The curve is kept as two little-endian float32 arrays, 8 bytes per point,
+        instead of one row per point.
+        
+        Args:
+            cell_id (str): Unique ID for the cell.
+            timestamp (str): ISO-format start time of the sweep.
+            voltage (np.ndarray): Voltages in volts.
+            current (np.ndarray): Currents in milliamps.
+            summary (Dict[str, float]): Output of sensors.iv_sweep.analyze_iv.
+        """
+        self.cursor.execute(
+            f"""
+            INSERT INTO {self._IV_SWEEP_TABLE}
+                (timestamp, cell_id, points, voltage, current, {", ".join(self.IV_SUMMARY_COLUMNS)})
+            VALUES (?, ?, ?, ?, ?, {", ".join("?" for _ in self.IV_SUMMARY_COLUMNS)});
             """,
             (
                 timestamp,
                 cell_id,
-                reading["voltage"],
-                reading["current"],
-                reading["power"],
-            )
+                len(voltage),
+                np.asarray(voltage, dtype="<f4").tobytes(),
+                np.asarray(current, dtype="<f4").tobytes(),
+                *(summary.get(column) for column in self.IV_SUMMARY_COLUMNS),
+            ),
         )
-        self.conn.commit()
+        self.commit()
+    
+    def fetch_iv_sweeps(
+        self,
+        cell_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Tuple]:
+        """
+        Returns stored sweeps, ordered by time then cell.
+        
+        Args:
+            cell_id (Optional[str]): Restrict to one cell.
+            start (Optional[str]): Start timestamp (inclusive) in ISO format.
+            end (Optional[str]): End timestamp (inclusive) in ISO format.
+            
+        Returns:
+            List[Tuple]: Rows laid out as (timestamp, cell_id, voltage, current, *IV_SUMMARY_COLUMNS),
+                         with voltage and current decoded into float32 arrays.
+        """
+        conditions, params = [], []
+        if cell_id is not None:
+            conditions.append("cell_id = ?")
+            params.append(cell_id)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        self.cursor.execute(
+            f"""
+            SELECT timestamp, cell_id, voltage, current, {", ".join(self.IV_SUMMARY_COLUMNS)}
+            FROM {self._IV_SWEEP_TABLE} {where}
+            ORDER BY timestamp, cell_id;
+            """,
+            params,
+        )
+        return [
+            (row[0], row[1], np.frombuffer(row[2], dtype="<f4"), np.frombuffer(row[3], dtype="<f4"), *row[4:])
+            for row in self.cursor.fetchall()
+        ]
         
     def close_conn(self) -> None:
         """
@@ -0,0 +1,185 @@
+import queue
+import threading
+from time import perf_counter
+from typing import Callable, Optional, Tuple
+from database.archive import ArchiveStore
+from database.backend import StorageBackend
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from monitoring.metrics import REGISTRY
+
+
+class BackgroundWorker:
+    """
+    Runs export and maintenance tasks in a daemon thread so acquisition never waits on them.
+
+    Every task opens its own read-only connection inside the worker thread; with the
+    database in WAL mode these reads neither block nor are blocked by the logger.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Args:
+            db_path (str): Path to the SQLite database the tasks read from.
+        """
+        self.db_path = db_path
+        self._tasks: "queue.Queue[Optional[Tuple[str, Callable[[], None]]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """
+        Starts the worker thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="background-maintenance", daemon=True)
+            self._thread.start()
+
+    def submit(self, name: str, task: Callable[[], None]) -> None:
+        """
+        Queues a task; tasks run one at a time in submission order.
+
+        Args:
+            name (str): Label used in log lines and metrics.
+            task (Callable[[], None]): Work to run in the background thread.
+        """
+        self._tasks.put((name, task))
+
+    def submit_export(
+        self,
+        sensor_file: str,
+        cell_file: str,
+        backend_factory: Optional[Callable[[], StorageBackend]] = None
+    ) -> None:
+        """
+        Queues an unattended CSV export of both tables.
+
+        Args:
+            sensor_file (str): Filename for the sensor_data export.
+            cell_file (str): Filename for the cell_output export.
+            backend_factory (Optional[Callable[[], StorageBackend]]): Opens the backend to
+                                    export from, in the worker thread. Defaults to a
+                                    read-only connection to db_path.
+        """
+        def export() -> None:
+            if backend_factory is not None:
+                reader = SensorDataReader(backend=backend_factory())
+            else:
+                reader = SensorDataReader(self.db_path, read_only=True)
+            try:
+                reader.export_to_csv(sensor_file=sensor_file, cell_file=cell_file, confirm=False)
+            finally:
+                reader.close()
+
+        self.submit("export", export)
+
+    def submit_integrity_check(self, db_path: Optional[str] = None) -> None:
+        """
+        Queues a `PRAGMA quick_check` of the database.
+
+        Args:
+            db_path (Optional[str]): Database file to check, e.g. one shard; defaults to db_path.
+        """
+        def integrity_check() -> None:
+            db = SensorDatabase(db_path or self.db_path, read_only=True)
+            try:
+                result = db.conn.execute("PRAGMA quick_check;").fetchone()[0]
+            finally:
+                db.close_conn()
+            if result != "ok":
+                REGISTRY.counter("db_integrity_failures_total").inc()
+                print(f"[MAINT] Integrity check reported problems: {result}")
+            else:
+                print("[MAINT] Integrity check passed.")
+
+        self.submit("integrity_check", integrity_check)
+
+    def submit_archive(self, before: str) -> None:
+        """
+        Queues compression of every reading older than a cutoff into archive blocks.
+
+        Unlike the other tasks this one writes, block by block in short transactions,
+        so the logger only ever waits for a single block.
+
+        Args:
+            before (str): Exclusive ISO-format cutoff.
+        """
+        def archive() -> None:
+            db = SensorDatabase(self.db_path)
+            try:
+                store = ArchiveStore(db)
+                for table in (SensorDatabase.get_sensor_table_name(), SensorDatabase.get_cell_output_table_name()):
+                    totals = store.archive(table, before)
+                    if totals["rows"]:
+                        print(
+                            f"[MAINT] Archived {totals['rows']} {table} rows into {totals['blocks']} blocks "
+                            f"({totals['raw_bytes'] / max(totals['stored_bytes'], 1):.1f}x smaller)."
+                        )
+            finally:
+                db.close_conn()
+
+        self.submit("archive", archive)
+
+    def submit_feed_migration(self, db_path: Optional[str] = None, batch_rows: int = 20000) -> None:
+        """
+        Queues numbering of a pre-change-feed database's rows, batch by batch.
+
+        Each batch is its own short write transaction, so like archiving this never
+        holds the logger up for more than one batch. Nothing is done if the database
+        needs no migration.
+
+        Args:
+            db_path (Optional[str]): Database file to migrate, e.g. one shard; defaults to db_path.
+            batch_rows (int): Rows numbered per transaction and table.
+        """
+        def feed_migration() -> None:
+            db = SensorDatabase(db_path or self.db_path)
+            try:
+                if db.migrate_change_feed(batch_rows):
+                    return
+                while not db.migrate_change_feed(batch_rows):
+                    pass
+                print(f"[MAINT] Change feed migration of {db.db_path} finished.")
+            finally:
+                db.close_conn()
+
+        self.submit("feed_migration", feed_migration)
+
+    def _run(self) -> None:
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                self._tasks.task_done()
+                return
+            name, task = item
+            started = perf_counter()
+            try:
+                task()
+                self.completed += 1
+            except Exception as err:
+                self.failed += 1
+                REGISTRY.counter("background_task_failures_total", task=name).inc()
+                print(f"[MAINT] Background task '{name}' failed: {err}")
+            finally:
+                REGISTRY.histogram("background_task_seconds", task=name).observe(perf_counter() - started)
+                self._tasks.task_done()
+
+    def join(self) -> None:
+        """
+        Blocks until every queued task has finished.
+        """
+        self._tasks.join()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Lets queued tasks finish, then stops the worker thread.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for the thread.
+        """
+        if self._thread is None:
+            return
+        self._tasks.put(None)
+        self._thread.join(timeout)
+        self._thread = None
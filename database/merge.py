@@ -0,0 +1,360 @@
+"""
+Incremental merge of several devices' databases and spools into one central SQLite store.
+
+    python -m database.merge central.db pi-roof=/mnt/roof/sensor_data.db pi-lab=/mnt/lab/sensor_data.spool
+"""
+
+import argparse
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+from database.archive import ArchiveStore
+from database.backend import StorageBackend
+from database.db import SensorDatabase
+from database.spool import SpoolWriter
+from monitoring.metrics import REGISTRY
+
+# merge_state.source for a device's archive blocks; its tables use the table name.
+_ARCHIVE_SOURCE = "archive"
+
+
+class DeviceMerger:
+    """
+    Copies new rows from device databases and spool files into a central database.
+
+    The central tables mirror sensor_data and cell_output with an extra device_id
+    column in front of the primary key. For every device database the merger keeps
+    high-water marks in merge_state: per table the largest change-feed sequence number
+    already copied (its rowid, for databases that predate the change feed), and the
+    largest archive block ID already copied, so rows archived before a run are still
+    merged. Each run therefore only reads rows added since the previous run. A source
+    whose position went backwards (e.g. a legacy database that was wiped) is copied
+    again from the start; duplicates are dropped by the primary key.
+
+    Spools carry no mark: the logger truncates them on every flush, so a byte offset
+    would not identify what was already merged. Each run decodes the whole spool and
+    the primary key drops the rows merged before.
+
+    Opening and decoding the sources runs in a thread pool, while every write to
+    the central database happens on the calling thread, one transaction per device.
+    """
+
+    def __init__(self, central_path: str = "central.db", max_workers: int = 4) -> None:
+        """
+        Args:
+            central_path (str): Path of the central SQLite database (created if missing).
+            max_workers (int): Threads used to inspect and decode sources in parallel.
+        """
+        self.central_path = central_path
+        self.max_workers = max_workers
+        # ATTACH of read-only URIs needs a URI-enabled connection; transactions are explicit.
+        self.conn = sqlite3.connect(Path(central_path).resolve().as_uri(), uri=True, isolation_level=None)
+        self._setup()
+
+    def _setup(self) -> None:
+        """
+        Ensures the central tables exist.
+        """
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {StorageBackend.get_sensor_table_name()} (
+                device_id 	TEXT 	NOT NULL,
+                timestamp 	TEXT 	NOT NULL,
+                lux 		REAL,
+                temperature REAL,
+                humidity 	REAL,
+                PRIMARY KEY (device_id, timestamp)
+            );
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {StorageBackend.get_cell_output_table_name()} (
+                device_id 	TEXT 	NOT NULL,
+                timestamp 	TEXT 	NOT NULL,
+                cell_id 	INTEGER NOT NULL,
+                voltage 	REAL,
+                current 	REAL,
+                power		REAL,
+                PRIMARY KEY (device_id, timestamp, cell_id)
+            );
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS merge_state (
+                device_id 	TEXT 	NOT NULL,
+                source 		TEXT 	NOT NULL,
+                high_water 	INTEGER NOT NULL,
+                PRIMARY KEY (device_id, source)
+            );
+        """)
+
+    def high_water_marks(self) -> Dict[Tuple[str, str], int]:
+        """
+        Returns the stored high-water mark of every (device_id, source) pair.
+        """
+        return {
+            (device_id, source): high_water
+            for device_id, source, high_water in self.conn.execute(
+                "SELECT device_id, source, high_water FROM merge_state;"
+            )
+        }
+
+    def merge(self, sources: Iterable[Tuple[str, str]]) -> Dict[str, Dict[str, int]]:
+        """
+        Copies every source's new rows into the central database.
+
+        Args:
+            sources (Iterable[Tuple[str, str]]): (device_id, path) pairs. Paths ending in
+                                                 '.spool' are read as spool files, anything
+                                                 else as a device SQLite database.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Rows inserted per device and table. Rows already
+                                       present in the central database are not counted.
+        """
+        marks = self.high_water_marks()
+        results: Dict[str, Dict[str, int]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for device_id, path in sources:
+                if path.endswith(".spool"):
+                    futures[pool.submit(self._decode_spool, path)] = (device_id, path)
+                else:
+                    futures[pool.submit(self._inspect_database, path)] = (device_id, path)
+
+            # Writes are applied as soon as a source is ready, but strictly one at a time.
+            for future in as_completed(futures):
+                device_id, path = futures[future]
+                try:
+                    prepared = future.result()
+                    if path.endswith(".spool"):
+                        counts = self._apply_spool(device_id, *prepared)
+                    else:
+                        counts = self._apply_database(device_id, path, prepared, marks)
+                except (sqlite3.Error, OSError) as err:
+                    REGISTRY.counter("merge_failures_total", device=device_id).inc()
+                    print(f"[MERGE] Skipping {device_id} ({path}): {err}")
+                    continue
+                device_counts = results.setdefault(device_id, {})
+                for table, count in counts.items():
+                    device_counts[table] = device_counts.get(table, 0) + count
+                    REGISTRY.counter("merge_rows_total", device=device_id, table=table).inc(count)
+
+        return results
+
+    @staticmethod
+    def _inspect_database(path: str) -> Dict[str, Tuple[str, int]]:
+        """
+        Reads the current end of both tables and of the archive through a read-only connection.
+
+        Returns:
+            Dict[str, Tuple[str, int]]: Per table, the position column (the change-feed
+                                        'seq', or 'rowid' for databases that predate it)
+                                        and its current maximum; under _ARCHIVE_SOURCE
+                                        the largest block ID, if the device has an archive.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No device database at {path}")
+        conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            positions = {}
+            for table in (StorageBackend.get_sensor_table_name(), StorageBackend.get_cell_output_table_name()):
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table});")}
+                column = "seq" if "seq" in columns else "rowid"
+                positions[table] = (column, conn.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table};").fetchone()[0])
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (SensorDatabase._ARCHIVE_TABLE,)
+            ).fetchone():
+                positions[_ARCHIVE_SOURCE] = (
+                    "id", conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {SensorDatabase._ARCHIVE_TABLE};").fetchone()[0]
+                )
+            return positions
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _decode_spool(path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Decodes every complete record of a spool, skipping corrupt ones.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: Sensor rows and cell rows.
+        """
+        with open(path, "rb") as handle:
+            data = handle.read()
+
+        complete = len(data) - len(data) % SpoolWriter.RECORD_SIZE
+        sensor_rows: List[Dict[str, Any]] = []
+        cell_rows: List[Dict[str, Any]] = []
+        for start in range(0, complete, SpoolWriter.RECORD_SIZE):
+            row = SpoolWriter.unpack(data[start:start + SpoolWriter.RECORD_SIZE])
+            if row is None:
+                REGISTRY.counter("spool_corrupt_records_total").inc()
+            elif row["kind"] == SpoolWriter.KIND_SENSOR:
+                sensor_rows.append(row)
+            else:
+                cell_rows.append(row)
+        return sensor_rows, cell_rows
+
+    def _apply_database(
+        self,
+        device_id: str,
+        path: str,
+        positions: Dict[str, Tuple[str, int]],
+        marks: Dict[Tuple[str, str], int]
+    ) -> Dict[str, int]:
+        """
+        Copies a device database's rows above the high-water marks.
+
+        Live rows are copied with ATTACH and INSERT ... SELECT, archived blocks are
+        decoded through a read-only ArchiveStore on the device database.
+        """
+        counts = {}
+        tables = [table for table in positions if table != _ARCHIVE_SOURCE]
+        self.conn.execute("ATTACH DATABASE ? AS device;", (f"{Path(path).resolve().as_uri()}?mode=ro",))
+        try:
+            self.conn.execute("BEGIN IMMEDIATE;")
+            try:
+                for table in tables:
+                    column, position = positions[table]
+                    high_water = marks.get((device_id, table), 0)
+                    if position < high_water:
+                        print(f"[MERGE] {device_id}.{table} was reset; copying it from the start.")
+                        high_water = 0
+                    columns = ", ".join(StorageBackend.columns_for(table))
+                    # Rows appended after the inspection are left for the next run so the
+                    # high-water mark never skips past rows that were not copied.
+                    cursor = self.conn.execute(
+                        f"""
+                        INSERT OR IGNORE INTO main.{table} (device_id, {columns})
+                        SELECT ?, {columns} FROM device.{table}
+                        WHERE {column} > ? AND {column} <= ?
+                        ORDER BY {column};
+                        """,
+                        (device_id, high_water, position),
+                    )
+                    counts[table] = cursor.rowcount
+                    self._set_high_water(device_id, table, position)
+                if _ARCHIVE_SOURCE in positions:
+                    self._apply_archive(device_id, path, tables, positions[_ARCHIVE_SOURCE][1], marks, counts)
+                self.conn.execute("COMMIT;")
+            except Exception:
+                self.conn.execute("ROLLBACK;")
+                raise
+        finally:
+            self.conn.execute("DETACH DATABASE device;")
+        return counts
+
+    def _apply_archive(
+        self,
+        device_id: str,
+        path: str,
+        tables: List[str],
+        position: int,
+        marks: Dict[Tuple[str, str], int],
+        counts: Dict[str, int]
+    ) -> None:
+        """
+        Copies the rows of archive blocks above the archive high-water mark, inside the caller's transaction.
+
+        Rows archived after an earlier run copied them from the live table are dropped
+        by the primary key; rows archived before any run reach the central database here.
+        """
+        high_water = marks.get((device_id, _ARCHIVE_SOURCE), 0)
+        if position < high_water:
+            print(f"[MERGE] {device_id} archive was reset; copying it from the start.")
+            high_water = 0
+        device = SensorDatabase(path, read_only=True)
+        try:
+            store = ArchiveStore(device)
+            for table in tables:
+                columns = StorageBackend.columns_for(table)
+                before = self.conn.total_changes
+                # Blocks are decoded one at a time while the rows are inserted
+                self.conn.executemany(
+                    f"INSERT OR IGNORE INTO main.{table} (device_id, {', '.join(columns)}) "
+                    f"VALUES (?, {', '.join('?' for _ in columns)});",
+                    ((device_id, *row) for row in store.iter_blocks(table, high_water, position)),
+                )
+                counts[table] += self.conn.total_changes - before
+        finally:
+            device.close_conn()
+        self._set_high_water(device_id, _ARCHIVE_SOURCE, position)
+
+    def _apply_spool(
+        self,
+        device_id: str,
+        sensor_rows: List[Dict[str, Any]],
+        cell_rows: List[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Inserts decoded spool rows in one transaction.
+        """
+        counts = {}
+        self.conn.execute("BEGIN IMMEDIATE;")
+        try:
+            for table, rows in (
+                (StorageBackend.get_sensor_table_name(), sensor_rows),
+                (StorageBackend.get_cell_output_table_name(), cell_rows),
+            ):
+                columns = StorageBackend.columns_for(table)
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} (device_id, {', '.join(columns)}) "
+                    f"VALUES (?, {', '.join('?' for _ in columns)});",
+                    [(device_id, *(row[column] for column in columns)) for row in rows],
+                )
+                counts[table] = self.conn.total_changes - before
+            self.conn.execute("COMMIT;")
+        except Exception:
+            self.conn.execute("ROLLBACK;")
+            raise
+        return counts
+
+    def _set_high_water(self, device_id: str, source: str, high_water: int) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO merge_state (device_id, source, high_water) VALUES (?, ?, ?)
+            ON CONFLICT (device_id, source) DO UPDATE SET high_water = excluded.high_water;
+            """,
+            (device_id, source, high_water),
+        )
+
+    def close(self) -> None:
+        """
+        Closes the central database connection.
+        """
+        self.conn.close()
+
+
+def _parse_source(spec: str) -> Tuple[str, str]:
+    """
+    Splits 'device_id=path'; without a device ID the file's parent directory name is used.
+    """
+    device_id, separator, path = spec.partition("=")
+    if not separator:
+        path = spec
+        device_id = Path(spec).resolve().parent.name
+    return device_id, path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("central", help="Central SQLite database to merge into.")
+    parser.add_argument("sources", nargs="+", help="Device sources as device_id=path (.db or .spool).")
+    parser.add_argument("--workers", type=int, default=4, help="Threads used to read sources.")
+    args = parser.parse_args()
+
+    merger = DeviceMerger(args.central, max_workers=args.workers)
+    try:
+        results = merger.merge(_parse_source(spec) for spec in args.sources)
+    finally:
+        merger.close()
+    for device_id, counts in sorted(results.items()):
+        summary = ", ".join(f"{table}={count}" for table, count in counts.items())
+        print(f"[MERGE] {device_id}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
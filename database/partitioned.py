@@ -0,0 +1,378 @@
+import os
+import shutil
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+import pandas as pd
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.timestamps import FIRST_TIMESTAMP, LAST_TIMESTAMP
+
+# Read-only reader of the current worker process, opened once by _init_worker
+_WORKER_READER: Optional[SensorDataReader] = None
+
+
+class Partition(NamedTuple):
+    """
+    One unit of parallel work: a table's rows of a single day, optionally of a single cell.
+    """
+    table: str
+    day: str
+    cell_id: Any
+    start: str
+    end: str
+
+    @classmethod
+    def for_day(cls, table: str, day: str, cell_id: Any = None,
+                start: Optional[str] = None, end: Optional[str] = None) -> "Partition":
+        """
+        Builds the partition of a day, clipped to an optional [start, end] range.
+        """
+        return cls(table, day, cell_id, max(f"{day}T00:00:00", start or FIRST_TIMESTAMP),
+                   min(f"{day}T23:59:59.999999", end or LAST_TIMESTAMP))
+
+
+def _init_worker(db_path: str) -> None:
+    global _WORKER_READER
+    _WORKER_READER = SensorDataReader(db_path, read_only=True)
+
+
+def _close_worker() -> None:
+    global _WORKER_READER
+    if _WORKER_READER is not None:
+        _WORKER_READER.close()
+        _WORKER_READER = None
+
+
+def _read_partition(partition: Partition, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Loads one partition in timestamp order through the worker's read-only connection.
+
+    Archived blocks overlapping the partition are decoded and merged with the live rows.
+    """
+    columns = list(columns or SensorDatabase.columns_for(partition.table))
+    cell_filter = " AND cell_id = ?" if partition.cell_id is not None else ""
+    params = [partition.start, partition.end] + ([partition.cell_id] if partition.cell_id is not None else [])
+    order = ["timestamp", "cell_id"] if partition.table == SensorDatabase.get_cell_output_table_name() else ["timestamp"]
+    live = pd.read_sql_query(
+        f"""
+        SELECT {", ".join(columns)} FROM {partition.table}
+        WHERE timestamp BETWEEN ? AND ?{cell_filter}
+        ORDER BY {", ".join(order)};
+        """,
+        _WORKER_READER.conn,
+        params=params,
+    )
+    archive = _WORKER_READER.archive
+    if archive is None or not archive.overlaps(partition.table, partition.start, partition.end):
+        return live
+    archived = pd.DataFrame.from_records(
+        archive.iter_rows(partition.table, partition.start, partition.end, cell_id=partition.cell_id),
+        columns=list(SensorDatabase.columns_for(partition.table)),
+    )[columns]
+    if archived.empty:
+        return live
+    if live.empty:
+        return archived
+    return pd.concat([archived, live], ignore_index=True).sort_values(order, kind="stable", ignore_index=True)
+
+
+def _aggregate_partition(partition: Partition, bucket_seconds: int) -> List[Dict]:
+    return _WORKER_READER.get_aggregates(
+        partition.table, partition.start, partition.end, bucket_seconds, cell_id=partition.cell_id
+    )
+
+
+def _export_csv_partition(partition: Partition, part_path: str) -> int:
+    df = _read_partition(partition)
+    df.to_csv(part_path, index=False, header=False)
+    return len(df)
+
+
+def _export_columnar_partition(partition: Partition, file_path: str) -> int:
+    df = _read_partition(partition)
+    if df.empty:
+        return 0
+    arrays = {
+        "timestamp": ((pd.to_datetime(df["timestamp"], format="ISO8601") - pd.Timestamp(0))
+                      // pd.Timedelta(microseconds=1)).to_numpy(np.int64)
+    }
+    for column in df.columns.drop("timestamp"):
+        arrays[column] = df[column].to_numpy(dtype=str) if column == "cell_id" else df[column].to_numpy(np.float64)
+    np.savez(file_path, **arrays)
+    return len(df)
+
+
+def _efficiency_partition(
+    partition: Partition,
+    area_m2: float,
+    lux_per_w_m2: float,
+    min_irradiance: float,
+    tolerance_seconds: float
+) -> List[Dict]:
+    cells = _read_partition(partition, ("timestamp", "cell_id", "power"))
+    light = _read_partition(
+        partition._replace(table=SensorDatabase.get_sensor_table_name(), cell_id=None), ("timestamp", "lux")
+    )
+    if cells.empty or light.empty:
+        return []
+
+    cells["timestamp"] = pd.to_datetime(cells["timestamp"], format="ISO8601")
+    light["timestamp"] = pd.to_datetime(light["timestamp"], format="ISO8601")
+    joined = pd.merge_asof(
+        cells, light.dropna(), on="timestamp", direction="nearest",
+        tolerance=pd.Timedelta(seconds=tolerance_seconds),
+    )
+
+    irradiance = joined["lux"] / lux_per_w_m2
+    power_w = joined["power"] / 1000.0
+    efficiency = (power_w / (irradiance * area_m2)).where(irradiance >= min_irradiance)
+    hours = (joined["timestamp"] - joined["timestamp"].iloc[0]) / pd.Timedelta(hours=1)
+
+    results = []
+    for cell_id, rows in joined.groupby("cell_id", sort=True):
+        cell_efficiency = efficiency.loc[rows.index]
+        cell_hours = hours.loc[rows.index].to_numpy()
+        lit = irradiance.loc[rows.index].fillna(0.0).to_numpy()
+        results.append({
+            "day": partition.day,
+            "cell_id": cell_id,
+            "samples": len(rows),
+            "illuminated_samples": int(cell_efficiency.notna().sum()),
+            "mean_efficiency": float(cell_efficiency.mean()) if cell_efficiency.notna().any() else None,
+            "max_efficiency": float(cell_efficiency.max()) if cell_efficiency.notna().any() else None,
+            "energy_wh": float(np.trapezoid(power_w.loc[rows.index].fillna(0.0).to_numpy(), cell_hours)),
+            "insolation_wh_m2": float(np.trapezoid(lit, cell_hours)),
+        })
+    return results
+
+
+class PartitionedExecutor:
+    """
+    Runs aggregation, export and efficiency analytics in parallel over day/cell partitions.
+
+    Every worker process opens its own read-only connection once, so partitions are
+    read concurrently without contending with the acquisition writer (WAL mode).
+    Archived blocks are read alongside the live rows, so results match the reader's.
+    Partition results are always combined in partition order, so the output does
+    not depend on the number of workers or on which worker finished first.
+    """
+
+    def __init__(self, db_path: str, max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            db_path (str): Path to the SQLite database.
+            max_workers (Optional[int]): Worker processes; defaults to the CPU count.
+                                         1 runs every partition in the calling process.
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def partitions(
+        self,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        by_cell: bool = True
+    ) -> List[Partition]:
+        """
+        Lists the day (and, for cell_output, cell) partitions covering a time range.
+
+        Args:
+            table (str): Table name to partition.
+            start (Optional[str]): First timestamp to include; defaults to the oldest row.
+            end (Optional[str]): Last timestamp to include; defaults to the newest row.
+            by_cell (bool): Split cell_output partitions further by cell_id.
+
+        Returns:
+            List[Partition]: Partitions ordered by day, then cell_id.
+
+        Raises:
+            ValueError: If an invalid table name is provided.
+        """
+        SensorDatabase.columns_for(table)
+        lower, upper = start or FIRST_TIMESTAMP, end or LAST_TIMESTAMP
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            bounds = [conn.execute(
+                f"SELECT MIN(timestamp), MAX(timestamp) FROM {table} WHERE timestamp BETWEEN ? AND ?;",
+                (lower, upper),
+            ).fetchone()]
+            archived = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (SensorDatabase._ARCHIVE_TABLE,)
+            ).fetchone() is not None
+            if archived:
+                # Archived history belongs to the range too; blocks are clipped to it
+                bounds.append(conn.execute(
+                    f"""
+                    SELECT MAX(MIN(start_ts), ?), MIN(MAX(end_ts), ?) FROM {SensorDatabase._ARCHIVE_TABLE}
+                    WHERE table_name = ? AND start_ts <= ? AND end_ts >= ?;
+                    """,
+                    (lower, upper, table, upper, lower),
+                ).fetchone())
+            cell_ids: List[Any] = [None]
+            if by_cell and table == SensorDatabase.get_cell_output_table_name():
+                query = f"SELECT DISTINCT cell_id FROM {table}"
+                if archived:
+                    query += f" UNION SELECT cell_id FROM {SensorDatabase._ARCHIVE_TABLE} WHERE table_name = ?"
+                cell_ids = [row[0] for row in conn.execute(f"{query} ORDER BY cell_id;", (table,) if archived else ())]
+        finally:
+            conn.close()
+        bounds = [bound for bound in bounds if bound[0] is not None]
+        if not bounds:
+            return []
+        first = min(bound[0] for bound in bounds)
+        last = max(bound[1] for bound in bounds)
+
+        day, last_day = date.fromisoformat(first[:10]), date.fromisoformat(last[:10])
+        partitions = []
+        while day <= last_day:
+            partitions.extend(Partition.for_day(table, day.isoformat(), cell_id, start, end) for cell_id in cell_ids)
+            day += timedelta(days=1)
+        return partitions
+
+    def _run(self, func: Callable[..., Any], partitions: List[Partition], *args_per_partition: List[Any]) -> List[Any]:
+        """
+        Applies a worker function to every partition and returns the results in partition order.
+        """
+        argument_lists = [partitions, *args_per_partition]
+        if self.max_workers == 1 or len(partitions) <= 1:
+            _init_worker(self.db_path)
+            try:
+                return [func(*args) for args in zip(*argument_lists)]
+            finally:
+                _close_worker()
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(self.db_path,)
+        ) as pool:
+            # map preserves input order regardless of completion order
+            chunksize = max(1, len(partitions) // (self.max_workers * 4))
+            return list(pool.map(func, *argument_lists, chunksize=chunksize))
+
+    def aggregate(
+        self,
+        table: str,
+        bucket_seconds: int = 86400,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Computes bucketed statistics like SensorDataReader.get_aggregates, one partition per worker task.
+
+        Args:
+            table (str): Table name to aggregate.
+            bucket_seconds (int): Bucket width; must divide a day so no bucket spans two partitions.
+            start (Optional[str]): First timestamp to include.
+            end (Optional[str]): Last timestamp to include.
+
+        Returns:
+            List[Dict]: Buckets ordered by bucket_start, then cell_id.
+
+        Raises:
+            ValueError: If the bucket width does not divide a day.
+        """
+        if bucket_seconds <= 0 or 86400 % bucket_seconds:
+            raise ValueError("bucket_seconds must divide 86400 for partitioned aggregation.")
+        partitions = self.partitions(table, start, end)
+        results = self._run(_aggregate_partition, partitions, [bucket_seconds] * len(partitions))
+        rows = [row for partition_rows in results for row in partition_rows]
+        return sorted(rows, key=lambda row: (row["bucket_start"], str(row.get("cell_id", ""))))
+
+    def export_csv(self, table: str, csv_path: str, start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """
+        Exports a table to a single time-ordered CSV file, one day per worker task.
+
+        Args:
+            table (str): Table name to export.
+            csv_path (str): Destination CSV file.
+            start (Optional[str]): First timestamp to include.
+            end (Optional[str]): Last timestamp to include.
+
+        Returns:
+            int: Number of rows written.
+        """
+        partitions = self.partitions(table, start, end, by_cell=False)
+        os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+        parts_dir = f"{csv_path}.parts"
+        os.makedirs(parts_dir, exist_ok=True)
+        try:
+            part_paths = [os.path.join(parts_dir, f"{idx:06d}.csv") for idx in range(len(partitions))]
+            counts = self._run(_export_csv_partition, partitions, part_paths)
+            with open(csv_path, "w", newline="") as output:
+                output.write(",".join(SensorDatabase.columns_for(table)) + "\n")
+                for part_path in part_paths:
+                    with open(part_path, "r", newline="") as part:
+                        shutil.copyfileobj(part, output)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        print(f"[EXPORT] {table} saved to: {csv_path}")
+        return sum(counts)
+
+    def export_columnar(
+        self,
+        table: str,
+        directory: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Exports a table as one NumPy .npz archive per partition.
+
+        Files are named '<table>_<day>.npz' ('<table>_<day>_<cell_id>.npz' for cell_output)
+        and hold one array per column, with timestamps as int64 microseconds since the epoch.
+
+        Args:
+            table (str): Table name to export.
+            directory (str): Destination directory.
+            start (Optional[str]): First timestamp to include.
+            end (Optional[str]): Last timestamp to include.
+
+        Returns:
+            Dict[str, int]: Rows written per file; empty partitions produce no file.
+        """
+        partitions = self.partitions(table, start, end)
+        os.makedirs(directory, exist_ok=True)
+        paths = [
+            os.path.join(directory, "_".join(str(part) for part in (table, p.day, p.cell_id) if part is not None) + ".npz")
+            for p in partitions
+        ]
+        counts = self._run(_export_columnar_partition, partitions, paths)
+        return {path: count for path, count in zip(paths, counts) if count}
+
+    def efficiency(
+        self,
+        area_cm2: float = 1.0,
+        lux_per_w_m2: float = 116.0,
+        min_irradiance: float = 1.0,
+        tolerance_seconds: float = 120.0,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Computes each cell's daily conversion efficiency from its power and the measured light.
+
+        Each cell reading is matched to the nearest light reading, the illuminance is
+        converted into irradiance, and efficiency is output power over incident power.
+
+        Args:
+            area_cm2 (float): Active area of each cell in cm².
+            lux_per_w_m2 (float): Illuminance per W/m² of irradiance (about 116 lx for sunlight).
+            min_irradiance (float): Readings below this irradiance (W/m²) are excluded from efficiency.
+            tolerance_seconds (float): Maximum distance between a cell reading and its light reading.
+            start (Optional[str]): First timestamp to include.
+            end (Optional[str]): Last timestamp to include.
+
+        Returns:
+            List[Dict]: One row per day and cell, ordered by day then cell_id, with sample
+                        counts, mean/max efficiency (fraction), energy (Wh) and insolation (Wh/m²).
+        """
+        partitions = self.partitions(SensorDatabase.get_cell_output_table_name(), start, end)
+        count = len(partitions)
+        results = self._run(
+            _efficiency_partition, partitions, [area_cm2 / 1e4] * count, [lux_per_w_m2] * count,
+            [min_irradiance] * count, [tolerance_seconds] * count,
+        )
+        return [row for partition_rows in results for row in partition_rows]
@@ -0,0 +1,230 @@
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import numpy as np
+from monitoring.metrics import REGISTRY
+
+
+class ColumnRule(NamedTuple):
+    """
+    Validation settings of one value column.
+    """
+    # Plausible range; readings outside it are sensor or bus errors
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    # Flag readings further than this many scaled MADs from the rolling median (None disables)
+    spike_mads: Optional[float] = None
+    # ...but never closer than this to the median, for coarse sensors whose MAD is often 0
+    spike_min_delta: float = 0.0
+    # A 0.0 following a reading above this level is an overflow rather than darkness (None disables)
+    saturation_after: Optional[float] = None
+
+
+class QualityValidator:
+    """
+    Vectorized validation and cleaning of bulk readings held in NumPy arrays.
+
+    validate() takes the columns of one table as arrays and, without any Python-level
+    loop over rows:
+
+        - restores time order within every series (cell) after clock adjustments,
+        - drops repeated (timestamp, series) readings, keeping the first,
+        - range-checks every value column,
+        - flags TSL2591 overflow zeros, which read_lux reports as 0.0,
+        - flags spikes against a rolling median / median absolute deviation.
+
+    Out-of-range, saturated and spike values are replaced by NaN in the returned
+    arrays, and a 'quality' uint8 column records what was found per row as the OR
+    of the bit flags below (0 means the row passed every check).
+    """
+    MISSING = 1
+    OUT_OF_RANGE = 2
+    SPIKE = 4
+    SATURATED = 8
+    # The row had duplicates, which were dropped
+    DUPLICATE = 16
+
+    FLAG_NAMES = {
+        MISSING: "missing",
+        OUT_OF_RANGE: "out_of_range",
+        SPIKE: "spike",
+        SATURATED: "saturated",
+        DUPLICATE: "duplicate",
+    }
+
+    # Sensor limits: DHT11 glitches are caught by the spike filter (its 1 degree / 1 %
+    # resolution makes the MAD of a steady signal 0, hence the minimum deltas), the
+    # TSL2591 tops out at 88,000 lux and the INA219 at 26 V and +-3.2 A.
+    DEFAULT_RULES: Dict[str, Dict[str, ColumnRule]] = {
+        "sensor_data": {
+            "lux": ColumnRule(0.0, 88000.0, saturation_after=10000.0),
+            "temperature": ColumnRule(0.0, 60.0, spike_mads=6.0, spike_min_delta=3.0),
+            "humidity": ColumnRule(0.0, 100.0, spike_mads=6.0, spike_min_delta=10.0),
+        },
+        "cell_output": {
+            "voltage": ColumnRule(0.0, 26.0),
+            "current": ColumnRule(-3200.0, 3200.0),
+            "power": ColumnRule(0.0, 83200.0),
+        },
+    }
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, ColumnRule]]] = None, window: int = 5) -> None:
+        """
+        Args:
+            rules (Optional[Dict[str, Dict[str, ColumnRule]]]): Rules per table and column;
+                                    DEFAULT_RULES if None. Columns without a rule are only
+                                    checked for missing values.
+            window (int): Odd number of readings in the rolling median window.
+
+        Raises:
+            ValueError: If the window is not an odd number of at least 3.
+        """
+        if window < 3 or window % 2 == 0:
+            raise ValueError("The median window must be an odd number of at least 3.")
+        self.rules = rules if rules is not None else self.DEFAULT_RULES
+        self.window = window
+
+    @staticmethod
+    def _series_codes(cell_ids: Any, count: int) -> np.ndarray:
+        """
+        Returns an integer series code per row: categorical codes, or 0 for single-series tables.
+        """
+        if cell_ids is None:
+            return np.zeros(count, dtype=np.int64)
+        if hasattr(cell_ids, "codes"):
+            return np.asarray(cell_ids.codes, dtype=np.int64)
+        return np.unique(np.asarray(cell_ids).astype(str), return_inverse=True)[1].astype(np.int64)
+
+    def _rolling_median_mad(self, values: np.ndarray, lower: Any, upper: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Centred rolling median and median absolute deviation, with windows clamped to each series.
+        """
+        half = self.window // 2
+        positions = np.arange(len(values))[:, None] + np.arange(-half, half + 1)
+        windows = values[np.clip(positions, lower, upper)]
+        windows.sort(axis=1)
+        median = windows[:, half]
+        deviations = np.abs(windows - median[:, None])
+        deviations.sort(axis=1)
+        return median, deviations[:, half]
+
+    def validate(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates and cleans the columns of one table.
+
+        Args:
+            table (str): Table the readings come from; selects the rules.
+            data (Dict[str, Any]): Equal-length arrays: 'timestamp' (datetime64 or integer),
+                                   'cell_id' for multi-series tables (a pandas Categorical
+                                   or any array) and value columns. Not modified.
+
+        Returns:
+            Dict[str, Any]: The same columns, in time order without duplicates and with
+                            rejected values set to NaN, plus the 'quality' uint8 mask.
+        """
+        times = np.asarray(data["timestamp"])
+        times = times.view(np.int64) if times.dtype.kind == "M" else times.astype(np.int64)
+        count = len(times)
+        series = self._series_codes(data.get("cell_id"), count)
+        quality = np.zeros(count, dtype=np.uint8)
+        order: Optional[np.ndarray] = None
+
+        # -- Monotonic-time repair: sort by (timestamp, series) unless already sorted. --
+        # Rows are not flagged for it: arrival order depends on how they were queried.
+        if count > 1:
+            time_steps, series_steps = np.diff(times), np.diff(series)
+            if not ((time_steps > 0) | ((time_steps == 0) & (series_steps >= 0))).all():
+                order = np.lexsort((series, times))
+                times, series, quality = times[order], series[order], quality[order]
+
+            # -- Dedupe: after sorting, repeats of a (timestamp, series) pair are adjacent --
+            repeated = (times[1:] == times[:-1]) & (series[1:] == series[:-1])
+            if repeated.any():
+                quality[:-1][repeated] |= self.DUPLICATE
+                keep = np.flatnonzero(~np.r_[False, repeated])
+                REGISTRY.counter("quality_duplicates_dropped_total", table=table).inc(int(count - len(keep)))
+                order = keep if order is None else order[keep]
+                times, series, quality = times[keep], series[keep], quality[keep]
+                count = len(keep)
+
+        # -- Per-series layout for window operations --
+        by_series = None if count == 0 or series.min() == series.max() else np.argsort(series, kind="stable")
+        if by_series is None:
+            series_start = np.zeros(count, dtype=bool)
+            series_start[:1] = True
+            lower, upper = 0, count - 1
+        else:
+            grouped = series[by_series]
+            series_start = np.r_[True, grouped[1:] != grouped[:-1]]
+            series_end = np.r_[grouped[1:] != grouped[:-1], True]
+            positions = np.arange(count)
+            lower = np.maximum.accumulate(np.where(series_start, positions, 0))[:, None]
+            upper = np.minimum.accumulate(np.where(series_end, positions, count - 1)[::-1])[::-1][:, None]
+            # Maps per-series positions back to rows
+            to_rows = np.empty(count, dtype=np.int64)
+            to_rows[by_series] = positions
+
+        def forward_fill(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+            # Last valid value per position (NaN before the first one of a series)
+            source = np.where(valid | series_start, np.arange(count), 0)
+            np.maximum.accumulate(source, out=source)
+            return np.where(valid, values, np.nan)[source]
+
+        result: Dict[str, Any] = {}
+        for column, values in data.items():
+            if column in ("timestamp", "cell_id"):
+                result[column] = values[order] if order is not None else values
+                continue
+            values = np.asarray(values)
+            values = values.astype(values.dtype if values.dtype.kind == "f" else np.float64)
+            values = values[order] if order is not None else values
+            rule = self.rules.get(table, {}).get(column, ColumnRule())
+
+            missing = np.isnan(values)
+            quality[missing] |= self.MISSING
+            rejected = np.zeros(count, dtype=bool)
+            if rule.minimum is not None:
+                rejected |= values < rule.minimum
+            if rule.maximum is not None:
+                rejected |= values > rule.maximum
+            quality[rejected] |= self.OUT_OF_RANGE
+
+            if (rule.saturation_after is not None or rule.spike_mads is not None) and count:
+                local = values if by_series is None else values[by_series]
+                valid = ~(missing | rejected)
+                valid = valid if by_series is None else valid[by_series]
+
+                if rule.saturation_after is not None:
+                    zero = local == 0.0
+                    previous = np.r_[np.nan, forward_fill(local, valid & ~zero)[:-1]]
+                    previous[series_start] = np.nan
+                    saturated = zero & (previous > rule.saturation_after)
+                    valid &= ~saturated
+                    saturated = saturated if by_series is None else saturated[to_rows]
+                    quality[saturated] |= self.SATURATED
+                    rejected |= saturated
+
+                if rule.spike_mads is not None:
+                    filled = forward_fill(local, valid)
+                    median, mad = self._rolling_median_mad(filled, lower, upper)
+                    limit = np.maximum(rule.spike_mads * 1.4826 * mad, rule.spike_min_delta)
+                    spikes = valid & (np.abs(local - median) > limit)
+                    spikes = spikes if by_series is None else spikes[to_rows]
+                    quality[spikes] |= self.SPIKE
+                    rejected |= spikes
+
+            values[rejected] = np.nan
+            result[column] = values
+
+        for flag, name in self.FLAG_NAMES.items():
+            flagged_rows = int(np.count_nonzero(quality & flag))
+            if flagged_rows:
+                REGISTRY.counter("quality_flags_total", table=table, flag=name).inc(flagged_rows)
+        result["quality"] = quality
+        return result
+
+    @classmethod
+    def describe(cls, quality: np.ndarray) -> Dict[str, int]:
+        """
+        Counts the rows carrying each flag of a quality mask.
+        """
+        quality = np.asarray(quality)
+        return {name: int(np.count_nonzero(quality & flag)) for flag, name in cls.FLAG_NAMES.items()}
@@ -0,0 +1,183 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """
+    LRU cache for SensorDataReader results with write-aware invalidation.
+
+    Every entry remembers the table it was read from and the end of its time window.
+    Sensor data is append-mostly, so a write at time T can only change windows that
+    end at or after T: older, closed windows stay valid forever, and only the windows
+    overlapping the newest data (plus open-ended queries such as the latest entry)
+    are dropped when SensorLogger reports a write.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 2**20) -> None:
+        """
+        Args:
+            max_entries (int): Maximum number of cached results.
+            max_bytes (int): Approximate upper bound of the cached results' memory.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, table, window end or None for open-ended, size in bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, str, Optional[str], int]]" = OrderedDict()
+        self._bytes = 0
+        # table -> number of invalidations so far, to reject results loaded across one
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        bucket: Optional[int] = None,
+        cell_id: Any = None
+    ) -> Tuple:
+        """
+        Builds the cache key of a query.
+        """
+        return kind, table, start, end, bucket, cell_id
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """
+        Approximates the memory held by a cached result without walking every row.
+        """
+        if hasattr(value, "memory_usage"):
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, list):
+            if not value:
+                return sys.getsizeof(value)
+            first = value[0]
+            per_row = sys.getsizeof(first)
+            if isinstance(first, dict):
+                per_row += sum(sys.getsizeof(item) for item in first.values())
+            return sys.getsizeof(value) + per_row * len(value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value.values())
+        return sys.getsizeof(value)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Looks a key up and marks it as recently used.
+
+        Returns:
+            Tuple[bool, Any]: (True, value) on a hit, (False, None) on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def generation(self, table: str) -> int:
+        """
+        Returns the invalidation generation of a table; capture it before loading a result.
+        """
+        with self._lock:
+            return self._generations.setdefault(table, 0)
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        table: str,
+        end: Optional[str],
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Stores a result, evicting least recently used entries beyond the limits.
+
+        Args:
+            key (Hashable): Key built with make_key.
+            value (Any): Result to cache.
+            table (str): Table the result was read from.
+            end (Optional[str]): Inclusive end of the result's time window, or None if
+                                 the query is open-ended (latest entry, whole table).
+            generation (Optional[int]): generation(table) taken before the result was
+                                        loaded. If the table has been invalidated since,
+                                        the result may predate a write and is not stored.
+        """
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and self._generations.get(table, 0) != generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._entries[key] = (value, table, end, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def invalidate(self, table: str, timestamp: Optional[str] = None) -> int:
+        """
+        Drops the entries of a table that a write at `timestamp` may have changed.
+
+        Args:
+            table (str): Table that was written to.
+            timestamp (Optional[str]): Earliest timestamp written. None drops every entry of the table.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [
+                key for key, (_, entry_table, end, _) in self._entries.items()
+                if entry_table == table and (timestamp is None or end is None or end >= timestamp)
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[3]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def on_write(self, table: str, timestamp: Optional[str]) -> None:
+        """
+        Write listener for SensorLogger.subscribe.
+        """
+        self.invalidate(table, timestamp)
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for table in self._generations:
+                self._generations[table] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss statistics and the current occupancy.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
@@ -0,0 +1,263 @@
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Any, Iterable, List, Set, Tuple
+from database.backend import StorageBackend
+from database.db import SensorDatabase
+from monitoring.metrics import REGISTRY
+
+
+class ShardedDatabase(StorageBackend):
+    """
+    SQLite storage split into one database file per calendar month.
+
+    Readings are routed by the month of their timestamp, so 'sensor_data.db' becomes
+
+        sensor_data_2025-05.db, sensor_data_2025-06.db, ...
+
+    each a complete SensorDatabase. Once readings for a new month arrive, the shards
+    of earlier months are closed and, barring late spool replays, never written again:
+    they can be copied off the device, compressed or deleted as ordinary files.
+
+    Reads attach only the shards whose month overlaps the requested range, read-only
+    and at most _MAX_ATTACHED at a time, to a private in-memory connection, and
+    return the rows in time order. Queries on recent data therefore only open the
+    newest, small file. Like the columnar store, the backend exposes no single
+    `conn`, so SensorDataReader uses its backend-neutral code paths.
+    """
+    # SQLite's default SQLITE_MAX_ATTACHED
+    _MAX_ATTACHED = 10
+    _MONTH_PATTERN = re.compile(r"\d{4}-\d{2}")
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        """
+        Args:
+            db_path (Optional[str]): Path the unsharded database would have; shards are
+                                     created next to it with the month appended to the name.
+                                     Defaults to 'sensor_data.db' if None.
+        """
+        base = Path(db_path or SensorDatabase._DEFAULT_DB_PATH)
+        self.directory = str(base.parent)
+        self.stem = base.stem
+        self.suffix = base.suffix or ".db"
+        self._shard_re = re.compile(rf"^{re.escape(self.stem)}_(\d{{4}}-\d{{2}}){re.escape(self.suffix)}$")
+
+        # month -> open writable shard
+        self._writers: Dict[str, SensorDatabase] = {}
+        self._dirty: Set[str] = set()
+        self._newest_month: Optional[str] = None
+        self._reader: Optional[sqlite3.Connection] = None
+
+    # ----------------------------------------------------------------
+    # SHARD LAYOUT
+    # ----------------------------------------------------------------
+    def shard_path(self, month: str) -> str:
+        """
+        Returns the file path of a month's shard, e.g. 'sensor_data_2025-06.db'.
+        """
+        return os.path.join(self.directory, f"{self.stem}_{month}{self.suffix}")
+
+    def shard_months(self) -> List[str]:
+        """
+        Lists the months that have a shard on disk, oldest first.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        months = (self._shard_re.match(name) for name in os.listdir(self.directory))
+        return sorted(match.group(1) for match in months if match)
+
+    def shard_paths(self) -> List[str]:
+        """
+        Lists the shard files on disk, oldest first.
+        """
+        return [self.shard_path(month) for month in self.shard_months()]
+
+    def _month_of(self, timestamp: str) -> str:
+        month = timestamp[:7]
+        if not self._MONTH_PATTERN.fullmatch(month):
+            raise ValueError(f"Cannot determine the shard of timestamp {timestamp!r}.")
+        return month
+
+    # ----------------------------------------------------------------
+    # WRITES
+    # ----------------------------------------------------------------
+    def _writer(self, month: str) -> SensorDatabase:
+        """
+        Returns the writable shard of a month, opening (and creating) it if needed.
+        """
+        if month not in self._writers:
+            self._writers[month] = SensorDatabase(self.shard_path(month))
+            if self._newest_month is None or month > self._newest_month:
+                if self._newest_month is not None:
+                    REGISTRY.counter("shard_rollovers_total").inc()
+                    print(f"[SHARD] Rolled over to {self.shard_path(month)}")
+                self._newest_month = month
+        return self._writers[month]
+
+    def _retire_old_shards(self) -> None:
+        """
+        Closes every committed shard older than the newest month.
+        """
+        for month in [month for month in self._writers if month < self._newest_month and month not in self._dirty]:
+            self._writers.pop(month).close_conn()
+
+    def _group_by_month(self, records: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(self._month_of(record["timestamp"]), []).append(record)
+        return groups
+
+    def insert_data(self, data: Dict[str, Any]) -> None:
+        """
+        Inserts a sensor reading into the shard of its month.
+        """
+        self._writer(self._month_of(data["timestamp"])).insert_data(data)
+        self._retire_old_shards()
+
+    def insert_cell_output(self, cell_id: Any, reading: Dict[str, float], timestamp: str) -> None:
+        """
+        Inserts a DSSC output reading into the shard of its month.
+        """
+        self._writer(self._month_of(timestamp)).insert_cell_output(cell_id, reading, timestamp)
+        self._retire_old_shards()
+
+    def insert_data_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Inserts several sensor readings, one prepared statement per shard touched.
+        """
+        for month, group in sorted(self._group_by_month(records).items()):
+            self._writer(month).insert_data_many(group, ignore_duplicates=ignore_duplicates, commit=False)
+            self._dirty.add(month)
+        if commit:
+            self.commit()
+
+    def insert_cell_output_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        commit: bool = True
+    ) -> None:
+        """
+        Inserts several DSSC output readings, one prepared statement per shard touched.
+        """
+        for month, group in sorted(self._group_by_month(records).items()):
+            self._writer(month).insert_cell_output_many(group, ignore_duplicates=ignore_duplicates, commit=False)
+            self._dirty.add(month)
+        if commit:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Commits every shard written since the last commit, oldest first.
+
+        A batch spanning a month boundary commits per shard, so a crash between the
+        two commits can keep only the older half; replaying the spool is idempotent
+        and restores the rest.
+        """
+        for month in sorted(self._dirty):
+            self._writers[month].commit()
+        self._dirty.clear()
+        if self._newest_month is not None:
+            self._retire_old_shards()
+
+    def rollback(self) -> None:
+        """
+        Rolls back every shard written since the last commit.
+        """
+        for month in self._dirty:
+            self._writers[month].rollback()
+        self._dirty.clear()
+
+    def clear_all(self) -> None:
+        """
+        Deletes all readings from every shard. The (empty) shard files are kept.
+        """
+        for month in self.shard_months():
+            if month in self._writers:
+                self._writers[month].clear_all()
+            else:
+                shard = SensorDatabase(self.shard_path(month))
+                shard.clear_all()
+                shard.close_conn()
+
+    # ----------------------------------------------------------------
+    # READS
+    # ----------------------------------------------------------------
+    def _overlapping_months(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        return [
+            month for month in self.shard_months()
+            if (start is None or month >= start[:7]) and (end is None or month <= end[:7])
+        ]
+
+    def _query(self, months: List[str], table: str, where: str, params: Tuple, suffix: str) -> List[Tuple]:
+        """
+        Runs one SELECT over several shards, attaching at most _MAX_ATTACHED at a time.
+
+        Shards are visited in month order and months never overlap, so concatenating
+        the per-batch results (each ordered by `suffix`) keeps global time order.
+        """
+        if self._reader is None:
+            self._reader = sqlite3.connect("file::memory:", uri=True)
+        columns = ", ".join(self.columns_for(table))
+        rows: List[Tuple] = []
+        for offset in range(0, len(months), self._MAX_ATTACHED):
+            batch = months[offset:offset + self._MAX_ATTACHED]
+            attached = []
+            try:
+                for idx, month in enumerate(batch):
+                    uri = f"{Path(self.shard_path(month)).resolve().as_uri()}?mode=ro"
+                    self._reader.execute(f"ATTACH DATABASE ? AS shard_{idx};", (uri,))
+                    attached.append(f"shard_{idx}")
+                union = " UNION ALL ".join(
+                    f"SELECT {columns} FROM {schema}.{table} {where}" for schema in attached
+                )
+                with REGISTRY.timer("shard_query_seconds", table=table):
+                    rows.extend(self._reader.execute(f"{union} {suffix};", params * len(attached)).fetchall())
+            finally:
+                for schema in attached:
+                    self._reader.execute(f"DETACH DATABASE {schema};")
+        return rows
+
+    def fetch_all(self, table: str) -> List[Tuple]:
+        """
+        Returns every row of a table across all shards, oldest shard first.
+        """
+        return self._query(self._overlapping_months(None, None), table, "", (), "")
+
+    def fetch_latest(self, table: str, cell_id: Any = None) -> Optional[Tuple]:
+        """
+        Returns the most recent row (of one cell if given), searching shards from the newest month backwards.
+        """
+        where, params = ("WHERE cell_id = ?", (cell_id,)) if cell_id is not None else ("", ())
+        for month in reversed(self.shard_months()):
+            rows = self._query([month], table, where, params, "ORDER BY timestamp DESC LIMIT 1")
+            if rows:
+                return rows[0]
+        return None
+
+    def fetch_between(self, table: str, start: str, end: str) -> List[Tuple]:
+        """
+        Returns rows within the inclusive range from the overlapping shards only, ordered chronologically.
+        """
+        return self._query(
+            self._overlapping_months(start, end), table, "WHERE timestamp BETWEEN ? AND ?", (start, end),
+            "ORDER BY timestamp ASC",
+        )
+
+    def close_conn(self) -> None:
+        """
+        Closes every open shard and the read connection.
+        """
+        for shard in self._writers.values():
+            shard.close_conn()
+        self._writers.clear()
+        self._dirty.clear()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
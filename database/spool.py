@@ -0,0 +1,396 @@
+import os
+import math
+import struct
+import zlib
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, Any, Callable
+from database.backend import StorageBackend
+from database.timestamps import iso_to_micros, micros_to_iso
+from monitoring.metrics import REGISTRY
+
+
+class SpoolWriter:
+    """
+    Append-only binary spool placed in front of the SQLite database.
+
+    Every reading is packed into a fixed-size record and appended in full before
+    the next one, so a crash can at worst leave one torn record at the tail of
+    the file. Each record carries a CRC32 so torn or zero-filled records are
+    detected on replay instead of being ingested.
+    """
+
+    # magic, kind, null-mask, timestamp (us), cell_id, three values, crc32
+    RECORD_FORMAT = "<HBBq16s3dI"
+    RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+    MAGIC = 0x5350
+
+    KIND_SENSOR = 1
+    KIND_CELL = 2
+
+    FSYNC_ALWAYS = "always"
+    FSYNC_BATCH = "batch"
+    FSYNC_NEVER = "never"
+
+    def __init__(
+        self,
+        spool_path: str,
+        fsync_policy: str = FSYNC_BATCH,
+        fsync_every: int = 32,
+        fsync_interval: float = 5.0
+    ) -> None:
+        """
+        Opens (or creates) the spool file for appending.
+
+        Args:
+            spool_path (str): Path to the spool file.
+            fsync_policy (str): FSYNC_ALWAYS fsyncs every record, FSYNC_BATCH fsyncs after
+                                `fsync_every` records or `fsync_interval` seconds, and
+                                FSYNC_NEVER leaves flushing to the operating system.
+            fsync_every (int): Record count that triggers an fsync in batch mode.
+            fsync_interval (float): Seconds after which pending records are fsynced in batch mode.
+
+        Raises:
+            ValueError: If an unknown fsync policy is provided.
+        """
+        if fsync_policy not in {self.FSYNC_ALWAYS, self.FSYNC_BATCH, self.FSYNC_NEVER}:
+            raise ValueError("Invalid fsync policy specified.")
+
+        self.spool_path = spool_path
+        self.fsync_policy = fsync_policy
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._pending = 0
+        self._last_sync = monotonic()
+
+        self._discard_torn_tail()
+        self.fd = os.open(spool_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _discard_torn_tail(self) -> None:
+        """
+        Truncates a partially written record left behind by a crash mid-write.
+        """
+        if not os.path.exists(self.spool_path):
+            return
+        size = os.path.getsize(self.spool_path)
+        aligned = size - size % self.RECORD_SIZE
+        if aligned != size:
+            print(f"[SPOOL] Discarding {size - aligned} bytes of torn record at end of {self.spool_path}")
+            os.truncate(self.spool_path, aligned)
+
+    @classmethod
+    def pack(
+        cls,
+        kind: int,
+        timestamp: str,
+        values: Tuple[Optional[float], Optional[float], Optional[float]],
+        cell_id: Any = ""
+    ) -> bytes:
+        """
+        Packs a single reading into a fixed-size spool record.
+
+        Args:
+            kind (int): KIND_SENSOR or KIND_CELL.
+            timestamp (str): ISO-format timestamp.
+            values (Tuple): (lux, temperature, humidity) or (voltage, current, power).
+            cell_id (Any): Cell identifier, stored as up to 16 bytes of UTF-8 text.
+
+        Returns:
+            bytes: The packed record including its CRC32.
+
+        Raises:
+            ValueError: If the cell identifier does not fit in the record.
+        """
+        encoded_cell = str(cell_id).encode("utf-8")
+        if len(encoded_cell) > 16:
+            raise ValueError("cell_id must encode to at most 16 bytes.")
+
+        null_mask = 0
+        packed_values = []
+        for idx, value in enumerate(values):
+            if value is None:
+                null_mask |= 1 << idx
+                packed_values.append(math.nan)
+            else:
+                packed_values.append(float(value))
+
+        body = struct.pack(
+            cls.RECORD_FORMAT[:-1],
+            cls.MAGIC,
+            kind,
+            null_mask,
+            iso_to_micros(timestamp),
+            encoded_cell,
+            *packed_values
+        )
+        return body + struct.pack("<I", zlib.crc32(body))
+
+    @classmethod
+    def unpack(cls, record: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Decodes a spool record back into a row dictionary.
+
+        Args:
+            record (bytes): Exactly RECORD_SIZE bytes.
+
+        Returns:
+            Optional[Dict[str, Any]]: Row dictionary with a 'kind' key, or None if the
+                                      record is corrupt (bad magic or checksum).
+        """
+        magic, kind, null_mask, micros, cell, v1, v2, v3, crc = struct.unpack(cls.RECORD_FORMAT, record)
+        if magic != cls.MAGIC or zlib.crc32(record[:-4]) != crc:
+            return None
+
+        values = [None if null_mask & (1 << idx) else value for idx, value in enumerate((v1, v2, v3))]
+        timestamp = micros_to_iso(micros)
+
+        if kind == cls.KIND_SENSOR:
+            return {
+                "kind": kind,
+                "timestamp": timestamp,
+                "lux": values[0],
+                "temperature": values[1],
+                "humidity": values[2],
+            }
+        elif kind == cls.KIND_CELL:
+            return {
+                "kind": kind,
+                "timestamp": timestamp,
+                "cell_id": cell.rstrip(b"\x00").decode("utf-8"),
+                "voltage": values[0],
+                "current": values[1],
+                "power": values[2],
+            }
+        return None
+
+    def append_data(self, data: Dict[str, Any]) -> None:
+        """
+        Appends a sensor reading (lux, temp, humidity) to the spool.
+
+        Args:
+            data (Dict[str, Any]): Sensor data dictionary including a timestamp.
+        """
+        self._write(self.pack(
+            self.KIND_SENSOR,
+            data["timestamp"],
+            (data["lux"], data["temperature"], data["humidity"])
+        ))
+
+    def append_cell_output(self, cell_id: Any, reading: Dict[str, float], timestamp: str) -> None:
+        """
+        Appends a DSSC output reading to the spool.
+
+        Args:
+            cell_id (Any): The identifier for the DSSC.
+            reading (Dict[str, float]): A dictionary with voltage, current, and power.
+            timestamp (str): ISO-format timestamp.
+        """
+        self._write(self.pack(
+            self.KIND_CELL,
+            timestamp,
+            (reading["voltage"], reading["current"], reading["power"]),
+            cell_id=cell_id
+        ))
+
+    def _write(self, record: bytes) -> None:
+        """
+        Writes one record and applies the fsync policy.
+        """
+        with REGISTRY.timer("spool_append_seconds"):
+            # write() may accept only part of the buffer (e.g. on a nearly full disk or
+            # after a signal); finish the record so later ones stay aligned
+            view = memoryview(record)
+            while view:
+                written = os.write(self.fd, view)
+                if written <= 0:
+                    raise OSError(f"Could not append to the spool file {self.spool_path}.")
+                view = view[written:]
+        self._pending += 1
+
+        if self.fsync_policy == self.FSYNC_ALWAYS:
+            self.sync()
+        elif self.fsync_policy == self.FSYNC_BATCH and (
+            self._pending >= self.fsync_every
+            or monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """
+        Forces all appended records to stable storage.
+        """
+        with REGISTRY.timer("spool_fsync_seconds"):
+            os.fsync(self.fd)
+        self._pending = 0
+        self._last_sync = monotonic()
+
+    def size(self) -> int:
+        """
+        Returns the current size of the spool file in bytes.
+        """
+        return os.fstat(self.fd).st_size
+
+    def truncate(self) -> None:
+        """
+        Empties the spool file. Only call once every record has been replayed.
+        """
+        os.ftruncate(self.fd, 0)
+        os.fsync(self.fd)
+
+    def close(self) -> None:
+        """
+        Syncs and closes the spool file.
+        """
+        if self.fd is None:
+            return
+        if self.fsync_policy != self.FSYNC_NEVER:
+            self.sync()
+        os.close(self.fd)
+        self.fd = None
+
+
+class SpoolReplayer:
+    """
+    Ingests spooled records into SQLite in batches, resuming from a persisted checkpoint.
+
+    The checkpoint is only advanced after the batch transaction commits, and rows
+    are inserted with INSERT OR IGNORE, so a crash between the commit and the
+    checkpoint update replays the batch without creating duplicates.
+    """
+
+    def __init__(
+        self,
+        spool_path: str,
+        db: StorageBackend,
+        batch_size: int = 500,
+        checkpoint_path: Optional[str] = None,
+        on_ingest: Optional[Callable[[str, str], None]] = None
+    ) -> None:
+        """
+        Initializes the replayer for a spool file and target database.
+
+        Args:
+            spool_path (str): Path to the spool file written by SpoolWriter.
+            db (StorageBackend): Backend that receives the replayed rows.
+            batch_size (int): Number of records committed per transaction.
+            checkpoint_path (Optional[str]): Path of the checkpoint file.
+                                             Defaults to '<spool_path>.ckpt'.
+            on_ingest (Optional[Callable[[str, str], None]]): Called after each committed batch
+                                                              with (table, earliest timestamp).
+        """
+        self.spool_path = spool_path
+        self.db = db
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path or f"{spool_path}.ckpt"
+        self.on_ingest = on_ingest
+        self.corrupt_records = 0
+
+    def load_checkpoint(self) -> int:
+        """
+        Returns the byte offset of the first record that has not been ingested yet.
+        """
+        try:
+            with open(self.checkpoint_path, "r") as handle:
+                offset = int(handle.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+        size = os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+        if offset > size:
+            # The spool was truncated or replaced; replaying from the start is safe
+            # because ingestion ignores rows that already exist.
+            return 0
+        return offset - offset % SpoolWriter.RECORD_SIZE
+
+    def save_checkpoint(self, offset: int) -> None:
+        """
+        Atomically persists the replay offset.
+
+        Args:
+            offset (int): Byte offset of the next record to ingest.
+        """
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as handle:
+            handle.write(str(offset))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def pending_bytes(self) -> int:
+        """
+        Returns the number of complete-record bytes not yet ingested.
+        """
+        if not os.path.exists(self.spool_path):
+            return 0
+        size = os.path.getsize(self.spool_path)
+        return size - size % SpoolWriter.RECORD_SIZE - self.load_checkpoint()
+
+    def replay(self) -> int:
+        """
+        Ingests all complete records after the checkpoint into the database.
+
+        Returns:
+            int: Number of records ingested (including duplicates that were ignored).
+
+        Raises:
+            sqlite3.Error: If the database rejects a batch. The checkpoint is left
+                           untouched so the batch is retried on the next call.
+        """
+        if not os.path.exists(self.spool_path):
+            return 0
+
+        offset = self.load_checkpoint()
+        ingested = 0
+        chunk_size = self.batch_size * SpoolWriter.RECORD_SIZE
+
+        with open(self.spool_path, "rb") as handle:
+            handle.seek(offset)
+            while True:
+                chunk = handle.read(chunk_size)
+                complete = len(chunk) - len(chunk) % SpoolWriter.RECORD_SIZE
+                if complete == 0:
+                    break
+
+                sensor_rows, cell_rows = self._decode(chunk[:complete])
+                try:
+                    self.db.insert_data_many(sensor_rows, ignore_duplicates=True, commit=False)
+                    self.db.insert_cell_output_many(cell_rows, ignore_duplicates=True, commit=False)
+                    self.db.commit()
+                except Exception:
+                    self.db.rollback()
+                    raise
+
+                offset += complete
+                self.save_checkpoint(offset)
+                ingested += complete // SpoolWriter.RECORD_SIZE
+                REGISTRY.counter("spool_replayed_records_total").inc(complete // SpoolWriter.RECORD_SIZE)
+                
+                if self.on_ingest:
+                    if sensor_rows:
+                        self.on_ingest(self.db.get_sensor_table_name(), min(row["timestamp"] for row in sensor_rows))
+                    if cell_rows:
+                        self.on_ingest(self.db.get_cell_output_table_name(), min(row["timestamp"] for row in cell_rows))
+
+                if complete < len(chunk) or len(chunk) < chunk_size:
+                    break
+
+        return ingested
+
+    def _decode(self, chunk: bytes) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Splits a chunk of records into sensor and cell rows, skipping corrupt records.
+        """
+        sensor_rows: List[Dict[str, Any]] = []
+        cell_rows: List[Dict[str, Any]] = []
+
+        for start in range(0, len(chunk), SpoolWriter.RECORD_SIZE):
+            row = SpoolWriter.unpack(chunk[start:start + SpoolWriter.RECORD_SIZE])
+            if row is None:
+                self.corrupt_records += 1
+                REGISTRY.counter("spool_corrupt_records_total").inc()
+                print(f"[SPOOL] Skipping corrupt record in {self.spool_path}")
+            elif row["kind"] == SpoolWriter.KIND_SENSOR:
+                sensor_rows.append(row)
+            else:
+                cell_rows.append(row)
+
+        return sensor_rows, cell_rows
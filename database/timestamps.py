@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Inclusive bounds of open-ended range queries; both sort around every stored timestamp
+# and, unlike a year-0 sentinel, parse with datetime.fromisoformat on every backend.
+FIRST_TIMESTAMP = "0001-01-01T00:00:00"
+LAST_TIMESTAMP = "9999-12-31T23:59:59.999999"
+
+
+def iso_to_micros(timestamp: str) -> int:
+    """
+    Converts a naive ISO-format timestamp into integer microseconds since the epoch.
+    
+    Timezone-aware timestamps are converted to local time first so that they
+    line up with the naive values produced by `datetime.now().isoformat()`.
+    
+    Args:
+        timestamp (str): ISO-format timestamp.
+        
+    Returns:
+        int: Microseconds since 1970-01-01T00:00:00.
+    """
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def micros_to_iso(micros: int) -> str:
+    """
+    Converts integer microseconds since the epoch back into an ISO-format timestamp.
+    
+    Args:
+        micros (int): Microseconds since 1970-01-01T00:00:00.
+        
+    Returns:
+        str: Naive ISO-format timestamp, identical to `datetime.isoformat()` output.
+    """
+    return (_EPOCH + timedelta(microseconds=int(micros))).isoformat()
@@ -0,0 +1,210 @@
+import csv
+import heapq
+from datetime import datetime
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.timestamps import FIRST_TIMESTAMP, LAST_TIMESTAMP, iso_to_micros
+from logger.sensor_logger import SensorLogger
+from monitoring.metrics import REGISTRY
+
+# A replay event: (table name, row dictionary as returned by SensorDataReader)
+Event = Tuple[str, Dict[str, Any]]
+
+
+class VirtualClock:
+    """
+    Settable clock for SensorLogger(clock=...), so replayed readings are stamped
+    with their historical time instead of the wall-clock time of the replay.
+    """
+
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        """
+        Args:
+            start (Optional[datetime]): Initial time. Defaults to datetime.now().
+        """
+        self._now = start or datetime.now()
+
+    def __call__(self) -> datetime:
+        return self._now
+
+    def set(self, moment: datetime) -> None:
+        """
+        Moves the clock to the given time.
+        """
+        self._now = moment
+
+
+def reader_events(reader: SensorDataReader, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Event]:
+    """
+    Streams both tables of a database, merged in timestamp order.
+
+    Rows are read lazily (archived blocks included), so arbitrarily long
+    histories replay in bounded memory.
+
+    Args:
+        reader (SensorDataReader): Reader of the source database.
+        start (Optional[str]): First timestamp (inclusive); the beginning of the data if None.
+        end (Optional[str]): Last timestamp (inclusive); the end of the data if None.
+    """
+    start, end = start or FIRST_TIMESTAMP, end or LAST_TIMESTAMP
+
+    def stream(table: str) -> Iterator[Event]:
+        for row in reader.iter_data_between(table, start, end):
+            yield table, row
+
+    return heapq.merge(
+        stream(SensorDatabase.get_sensor_table_name()),
+        stream(SensorDatabase.get_cell_output_table_name()),
+        key=lambda event: event[1]["timestamp"],
+    )
+
+
+def _csv_rows(path: str, table: str) -> Iterator[Event]:
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield table, {
+                key: value if key in ("timestamp", "cell_id") else (float(value) if value != "" else None)
+                for key, value in row.items()
+            }
+
+
+def csv_events(sensor_file: Optional[str] = None, cell_file: Optional[str] = None) -> Iterator[Event]:
+    """
+    Streams CSV files written by SensorDataReader.export_to_csv, merged in timestamp order.
+
+    Each file is expected to be chronological, as exports are; out-of-order rows are
+    replayed where they appear, without pacing delay.
+
+    Args:
+        sensor_file (Optional[str]): Export of the sensor_data table.
+        cell_file (Optional[str]): Export of the cell_output table.
+    """
+    streams = []
+    if sensor_file:
+        streams.append(_csv_rows(sensor_file, SensorDatabase.get_sensor_table_name()))
+    if cell_file:
+        streams.append(_csv_rows(cell_file, SensorDatabase.get_cell_output_table_name()))
+    return heapq.merge(*streams, key=lambda event: event[1]["timestamp"])
+
+
+class ReplayEngine:
+    """
+    Feeds historical readings through SensorLogger's normal ingest path.
+
+    Every row is logged with log_data/log_cell_output exactly like a live cycle,
+    without an explicit timestamp: the logger stamps it from the VirtualClock,
+    which the engine moves to the row's original time first. Reading listeners,
+    the spool and the storage backend therefore all see the history as if it were
+    being acquired now, which makes a replay into a scratch database both a
+    backtest for processing settings and a throughput benchmark of the write path.
+
+        speed=None   as fast as possible
+        speed=1.0    real time
+        speed=1000   1000 virtual seconds per wall-clock second
+    """
+
+    def __init__(
+        self,
+        logger: SensorLogger,
+        clock: VirtualClock,
+        speed: Optional[float] = None,
+        flush_every: int = 1000,
+        max_gap: Optional[float] = None,
+        sleep_fn: Callable[[float], None] = sleep,
+        timer: Callable[[], float] = perf_counter
+    ) -> None:
+        """
+        Args:
+            logger (SensorLogger): Logger writing to the scratch database, created with `clock`.
+            clock (VirtualClock): The logger's clock.
+            speed (Optional[float]): Virtual seconds per wall-clock second; None disables pacing.
+            flush_every (int): Readings logged between spool flushes, standing in for the
+                               per-cycle flush of live acquisition.
+            max_gap (Optional[float]): Longest pause between two rows in virtual seconds, so
+                                       outages in the history are not waited out. Unlimited if None.
+            sleep_fn (Callable[[float], None]): Sleep function; injectable for tests.
+            timer (Callable[[], float]): Monotonic wall-clock in seconds; injectable for tests.
+
+        Raises:
+            ValueError: If the speed, flush interval or gap limit is not positive, or the
+                        logger does not use `clock`.
+        """
+        if (speed is not None and speed <= 0) or flush_every < 1 or (max_gap is not None and max_gap < 0):
+            raise ValueError("Invalid replay settings.")
+        if logger.clock is not clock:
+            raise ValueError("The logger must be created with the replay's VirtualClock.")
+        self.logger = logger
+        self.clock = clock
+        self.speed = speed
+        self.flush_every = flush_every
+        self.max_gap = max_gap
+        self._sleep = sleep_fn
+        self._timer = timer
+
+    def _log(self, table: str, row: Dict[str, Any]) -> None:
+        if table == SensorDatabase.get_sensor_table_name():
+            self.logger.log_data(lux=row["lux"], temperature=row["temperature"], humidity=row["humidity"])
+        else:
+            self.logger.log_cell_output(
+                cell_id=row["cell_id"],
+                data={"voltage": row["voltage"], "current": row["current"], "power": row["power"]},
+            )
+
+    def run(self, events: Iterable[Event]) -> Dict[str, Any]:
+        """
+        Replays the events in order, pacing them according to `speed`.
+
+        Args:
+            events (Iterable[Event]): (table, row) pairs, e.g. from reader_events or csv_events.
+
+        Returns:
+            Dict[str, Any]: Rows per table, wall-clock and virtual seconds, rows per second
+                            and the achieved speed-up over real time.
+        """
+        counts = {SensorDatabase.get_sensor_table_name(): 0, SensorDatabase.get_cell_output_table_name(): 0}
+        first_micros = previous_micros = None
+        # Wall-clock seconds after `started` at which the current row is due
+        due = 0.0
+        started = self._timer()
+        pending = 0
+
+        for table, row in events:
+            micros = iso_to_micros(row["timestamp"])
+            if first_micros is None:
+                first_micros = micros
+            elif self.speed is not None:
+                gap = max(0, micros - previous_micros) / 1e6
+                if self.max_gap is not None:
+                    gap = min(gap, self.max_gap)
+                due += gap / self.speed
+                delay = due - (self._timer() - started)
+                if delay > 0:
+                    self._sleep(delay)
+            previous_micros = micros
+
+            self.clock.set(datetime.fromisoformat(row["timestamp"]))
+            self._log(table, row)
+            counts[table] += 1
+            pending += 1
+            if pending >= self.flush_every:
+                self.logger.flush()
+                pending = 0
+        self.logger.flush()
+
+        elapsed = self._timer() - started
+        rows = sum(counts.values())
+        virtual_seconds = (previous_micros - first_micros) / 1e6 if rows else 0.0
+        for name, count in counts.items():
+            REGISTRY.counter("replay_rows_total", table=name).inc(count)
+        stats = {
+            "rows": counts,
+            "wall_seconds": round(elapsed, 3),
+            "virtual_seconds": virtual_seconds,
+            "rows_per_second": round(rows / elapsed) if elapsed > 0 else None,
+            "speedup": round(virtual_seconds / elapsed, 1) if elapsed > 0 else None,
+        }
+        print(f"[REPLAY] {rows} readings ({virtual_seconds:.0f}s of history) in {elapsed:.2f}s: "
+              f"{stats['rows_per_second']} rows/s, {stats['speedup']}x real time")
+        return stats
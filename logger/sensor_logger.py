@@ -1,20 +1,76 @@
+import sqlite3
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Callable, List, Any
+from database.backend import StorageBackend
 from database.db import SensorDatabase
+from database.spool import SpoolWriter, SpoolReplayer
 
 class SensorLogger:
     """
     SensorLogger handles timestamped data logging into appropriate database tables
     """
     
-    def __init__(self, db_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        spool_path: Optional[str] = None,
+        fsync_policy: str = SpoolWriter.FSYNC_BATCH,
+        backend: Optional[StorageBackend] = None,
+        clock: Optional[Callable[[], datetime]] = None
+    ) -> None:
         """
         Initializes the SensorLogger with a SensorDatabase instance.
         
         Args:
             db_path (Optional[str]): Optional path to the SQLite database file.
+            spool_path (Optional[str]): Optional path to an append-only spool file. When set,
+                                        readings are written to the spool first and only
+                                        reach SQLite when flush() replays them.
+            fsync_policy (str): Spool fsync policy (see SpoolWriter).
+            backend (Optional[StorageBackend]): Alternative storage backend to write to.
+                                                Takes precedence over db_path when provided.
+            clock (Optional[Callable[[], datetime]]): Source of the timestamps given to readings
+                                                      logged without one. Defaults to datetime.now;
+                                                      replays pass a VirtualClock.
+        """
+        self.db = backend or SensorDatabase(db_path=db_path)
+        self.clock = clock or datetime.now
+        self.spool: Optional[SpoolWriter] = None
+        self.replayer: Optional[SpoolReplayer] = None
+        self._listeners: List[Callable[[str, str], None]] = []
+        self._reading_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        
+        if spool_path:
+            self.spool = SpoolWriter(spool_path, fsync_policy=fsync_policy)
+            self.replayer = SpoolReplayer(spool_path, self.db, on_ingest=self._notify)
+        
+    def subscribe(self, listener: Callable[[str, str], None]) -> None:
         """
-        self.db = SensorDatabase(db_path=db_path)
+        Registers a callback invoked once readings become visible in the database.
+        
+        Args:
+            listener (Callable[[str, str], None]): Called with (table, earliest timestamp written),
+                                                   e.g. QueryCache.on_write.
+        """
+        self._listeners.append(listener)
+        
+    def subscribe_readings(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        """
+        Registers a callback invoked with every reading as soon as it is logged,
+        before it reaches the database. Listeners run on the acquisition thread
+        and must return quickly.
+        
+        Args:
+            listener (Callable[[str, Dict[str, Any]], None]): Called with (table, row dictionary).
+        """
+        self._reading_listeners.append(listener)
+        
+    def _notify(self, table: str, timestamp: str) -> None:
+        """
+        Forwards a write to every subscribed listener.
+        """
+        for listener in self._listeners:
+            listener(table, timestamp)
         
     def log_data(
         self,
@@ -32,14 +88,20 @@ class SensorLogger:
             humidity (float): Relative humidity percentage from DHT11.
             timestamp (Optional[str]): Optional ISO-8 timestamp. Auto-generated if not provided.
         """      
-        resolved_timestamp: str = timestamp or datetime.now().isoformat()
+        resolved_timestamp: str = timestamp or self.clock().isoformat()
         record: Dict[str, float | str] = {
             "timestamp": resolved_timestamp,
             "lux": lux,
             "temperature": temperature,
             "humidity": humidity
         }
-        self.db.insert_data(record)
+        for listener in self._reading_listeners:
+            listener(self.db.get_sensor_table_name(), record)
+        if self.spool:
+            self.spool.append_data(record)
+        else:
+            self.db.insert_data(record)
+            self._notify(self.db.get_sensor_table_name(), resolved_timestamp)
         
     def log_cell_output(
         self,
@@ -55,12 +117,46 @@ class SensorLogger:
             data (Dict[str, float]): Sensor reading from INA219.
             timestamp (Optional[str]): Optional ISO-8 timestamp.
         """
-        resolved_timestamp: str = timestamp or datetime.now().isoformat()
-        self.db.insert_cell_output(cell_id=cell_id, reading=data, timestamp=resolved_timestamp)
+        resolved_timestamp: str = timestamp or self.clock().isoformat()
+        if self._reading_listeners:
+            row = {"timestamp": resolved_timestamp, "cell_id": cell_id, **data}
+            for listener in self._reading_listeners:
+                listener(self.db.get_cell_output_table_name(), row)
+        if self.spool:
+            self.spool.append_cell_output(cell_id=cell_id, reading=data, timestamp=resolved_timestamp)
+        else:
+            self.db.insert_cell_output(cell_id=cell_id, reading=data, timestamp=resolved_timestamp)
+            self._notify(self.db.get_cell_output_table_name(), resolved_timestamp)
+        
+    def flush(self) -> int:
+        """
+        Replays spooled readings into SQLite and compacts the spool once it is fully ingested.
+        Database errors are reported and the readings stay spooled for the next attempt.
+        
+        Returns:
+            int: Number of spooled records ingested.
+        """
+        if not self.replayer:
+            return 0
+        
+        try:
+            ingested = self.replayer.replay()
+        except sqlite3.Error as err:
+            print(f"[SPOOL] Replay deferred, readings kept in spool: {err}")
+            return 0
         
+        if self.replayer.load_checkpoint() == self.spool.size():
+            # Reset the checkpoint before truncating: a crash in between only causes
+            # an idempotent re-replay rather than skipped records.
+            self.replayer.save_checkpoint(0)
+            self.spool.truncate()
+        return ingested
 
     def close(self) -> None:
         """
-        Closes the associated database connection.
+        Flushes any spooled readings and closes the associated database connection.
         """
+        if self.spool:
+            self.flush()
+            self.spool.close()
         self.db.close_conn()
\ No newline at end of file
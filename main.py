@@ -1,40 +1,246 @@
-from sensors.tsl2591 import TSL2591Sensor
-from sensors.dht11 import DHT11Sensor
-from sensors.ina219 import INA219Sensor
 from logger.sensor_logger import SensorLogger
 from database.db import SensorDatabase
 from database.data_access import SensorDataReader
-from time import sleep
-import board
-import busio
+from database.maintenance import BackgroundWorker
+from database.sharded import ShardedDatabase
+from monitoring.metrics import REGISTRY, SummaryReporter
+from monitoring.profiling import ProfilingHooks
+from monitoring.server import MetricsServer
+from service.data_service import DataService
+from sensors.bus import BusTopology, DEFAULT_BUS
+from sensors.circuit_breaker import BreakerRegistry, CircuitBreaker, CircuitOpenError
+from datetime import date, datetime, timedelta
+from time import sleep, monotonic
+from typing import Any, Callable, Dict, Optional, List, Tuple
+import argparse
+import os
 
+_PROCESS_START = monotonic()
 
-def setup_sensors():
+# Seconds between the start of two acquisition cycles
+CYCLE_INTERVAL = 60
+
+# Seconds to wait for a running export or maintenance task on shutdown
+BACKGROUND_SHUTDOWN_TIMEOUT = 30
+
+# I2C buses besides DEFAULT_BUS: name -> (SCL, SDA) board pin names, e.g. {"i2c-3": ("D5", "D6")}
+EXTRA_BUSES: Dict[str, Tuple[str, str]] = {}
+
+# INA219 wiring: (cell_id, bus, address, (TCA9548A address, channel) or None).
+# Multiplexers only need entries here; extra buses also need their pins in EXTRA_BUSES, e.g.
+#   ("cell_4", "i2c-1", 0x40, (0x70, 0)),  ("cell_9", "i2c-3", 0x40, None)
+# Direct devices may share an address with muxed ones: direct reads disable the mux channels first.
+CELL_CHANNELS: List[Tuple[str, str, int, Optional[Tuple[int, int]]]] = [
+    ("cell_1", DEFAULT_BUS, 0x40, None),
+    ("cell_2", DEFAULT_BUS, 0x41, None),
+    ("cell_3", DEFAULT_BUS, 0x44, None),
+]
+
+def setup_sensors(topology: Optional[BusTopology] = None):
     """
     Initializes all sensors: DHT11, TSL2591, and INA219 array.
+    
+    Args:
+        topology (Optional[BusTopology]): Bus registry shared by every I2C device.
+                                          A default single-bus topology if None.
     """
-    dht_sensor = DHT11Sensor()
-    tsl_sensor = TSL2591Sensor()
+    # Hardware libraries are imported here so run_cycle can also be driven by
+    # simulated sensors (benchmarks, tests) on machines without Blinka.
+    from sensors.tsl2591 import TSL2591Sensor
+    from sensors.dht11 import DHT11Sensor
+    from sensors.ina219 import INA219Sensor
     
-    i2c = busio.I2C(board.SCL, board.SDA)
-    addresses = [0x40, 0x41, 0x44]
-    cell_ids = ["cell_1", "cell_2", "cell_3"]
+    topology = topology or BusTopology()
+    if EXTRA_BUSES:
+        import board
+        for name, (scl, sda) in EXTRA_BUSES.items():
+            topology.add_bus(name, getattr(board, scl), getattr(board, sda))
+    dht_sensor = DHT11Sensor()
+    tsl_sensor = TSL2591Sensor(topology.i2c(DEFAULT_BUS))
     
-    ina_sensors = [INA219Sensor(i2c, addr, cid) for addr, cid in zip(addresses, cell_ids)]
+    ina_sensors = [
+        INA219Sensor(topology.i2c(bus, mux), address, cell_id, bus=bus)
+        for cell_id, bus, address, mux in CELL_CHANNELS
+    ]
     
     return dht_sensor, tsl_sensor, ina_sensors
 
 
 
-def main():
+def _guarded(breakers: Optional[BreakerRegistry], name: str, read: Callable[[], Any]) -> Any:
     """
-    Executes main logging loop for all sensors
+    Runs a timed sensor read, through the device's circuit breaker when breakers are enabled.
+    
+    Raises:
+        CircuitOpenError: If the device's breaker is open; nothing is read or timed.
+    """
+    def timed() -> Any:
+        with REGISTRY.timer("sensor_read_seconds", sensor=name):
+            return read()
+    
+    return breakers.call(name, timed) if breakers is not None else timed()
+
+
+def _read_cell(sensor, idx: int, breakers: Optional[BreakerRegistry] = None) -> Tuple[float, float, float]:
+    return _guarded(
+        breakers,
+        f"ina219_cell_{idx}",
+        lambda: (sensor.read_voltage(), sensor.read_current(), sensor.read_power())
+    )
+
+
+def run_cycle(
+    dht_sensor,
+    tsl_sensor,
+    ina_sensors,
+    logger: SensorLogger,
+    topology: Optional[BusTopology] = None,
+    breakers: Optional[BreakerRegistry] = None
+) -> None:
+    """
+    Reads every sensor once, logs the readings and ingests the spool.
+    
+    With a topology, INA219s on different buses are read in parallel; the
+    readings are still logged from this thread, in sensor order. With breakers,
+    devices that keep failing are skipped until a backed-off probe succeeds.
     """
-    logger = SensorLogger()
+    data = {}
+    
+    #reader.show_all_dataframes(True) # Comment out while the program is gathering data.
+    
+    # -- Light sensor (TSL2591) --
+    # Try/except loop designed to avoid oversaturating the sensor
+    lux = None
+    
+    try:
+        lux = _guarded(breakers, "tsl2591", tsl_sensor.read_lux)
+    except CircuitOpenError:
+        pass
+    except Exception as err:
+        REGISTRY.counter("sensor_errors_total", sensor="tsl2591").inc()
+        print(f"[ERROR] Failed to read TSL2591: {err}")
     
-    # -- User prompts for data export and wiping the SQL DB --
+    if lux is not None:
+        print(f"[LOG] Light intensity: {lux:.2f}")
+        data["lux"] = lux    
+    
+    # -- Humidity & Temperature sensor (DHT11) --
     try:
-        reader = SensorDataReader("sensor_data.db")
+        # A probe of a failing DHT11 makes one attempt instead of burning every retry
+        probing = breakers is not None and breakers.get("dht11", none_is_failure=True).state == CircuitBreaker.HALF_OPEN
+        result = _guarded(breakers, "dht11", (lambda: dht_sensor.read(retries=1)) if probing else dht_sensor.read)
+        if result:
+            temperature, humidity = result
+            print(f"[LOG] Temperature: {temperature:.1f}°C | Humidity: {humidity:.1f}%")
+            data["temperature"] = temperature
+            data["humidity"] = humidity
+        else:
+            print("[ERROR] DHT11 reading failed after retries.")
+    except CircuitOpenError:
+        pass
+    except Exception as err:
+        REGISTRY.counter("sensor_errors_total", sensor="dht11").inc()
+        print(f"[ERROR] Failed to read DHT11: {err}")
+        
+    # -- Only log if all fields are available --
+    if all(k in data for k in ("lux", "temperature", "humidity")):
+        logger.log_data(
+            lux=data["lux"],
+            temperature=data["temperature"],
+            humidity=data["humidity"]
+        )
+        
+    # -- Voltage/current sensors (INA219) --
+    if topology is not None:
+        readings = topology.read_all([
+            (idx, getattr(sensor, "bus", DEFAULT_BUS), lambda sensor=sensor, idx=idx: _read_cell(sensor, idx, breakers))
+            for idx, sensor in enumerate(ina_sensors, start=1)
+        ])
+    else:
+        readings = {}
+        for idx, sensor in enumerate(ina_sensors, start=1):
+            try:
+                readings[idx] = _read_cell(sensor, idx, breakers)
+            except Exception as err:
+                readings[idx] = err
+                
+    for idx in range(1, len(ina_sensors) + 1):
+        reading = readings[idx]
+        if isinstance(reading, CircuitOpenError):
+            continue
+        if isinstance(reading, Exception):
+            REGISTRY.counter("sensor_errors_total", sensor=f"ina219_cell_{idx}").inc()
+            print(f"[ERROR] Failed to read INA219 sensor {idx}: {reading}")
+            continue
+        voltage, current, power = reading
+        print(f"[LOG] Cell{idx}: Voltage={voltage:.3f}V, Current={current:.3f}mA, P={power:.2f}mW")
+        logger.log_cell_output(
+            cell_id=f"cell_{idx}",
+            data={
+                "voltage": voltage,
+                "current": current,
+                "power": power
+            }
+        )
+            
+    # -- Ingest spooled readings into SQLite --
+    with REGISTRY.timer("spool_flush_seconds"):
+        logger.flush()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line. Without flags the logger starts unattended: no prompts,
+    acquisition first, and any export or maintenance in the background.
+    """
+    parser = argparse.ArgumentParser(description="DSSC and environment sensor logger.")
+    parser.add_argument("--db", default="sensor_data.db", help="SQLite database path.")
+    parser.add_argument("--spool", default="sensor_data.spool", help="Spool file path.")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Prompt for export and data wipe before logging (legacy behaviour).")
+    parser.add_argument("--export", action="store_true",
+                        help="Export both tables to CSV in the background after logging starts.")
+    parser.add_argument("--export-dir", default="./data_output", help="Directory for CSV exports.")
+    parser.add_argument("--maintenance", action="store_true",
+                        help="Run a database integrity check in the background.")
+    parser.add_argument("--shard-monthly", action="store_true",
+                        help="Store readings in one database file per month next to --db.")
+    parser.add_argument("--archive-after-days", type=int,
+                        help="Compress readings older than this many days into archive blocks in the background.")
+    parser.add_argument("--clear", action="store_true",
+                        help="Delete all stored data before logging starts, without prompting.")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port.")
+    parser.add_argument("--http-port", type=int,
+                        help="Serve latest values, ranges, aggregates and a live stream on this local port.")
+    parser.add_argument("--summary-interval", type=float, default=600.0,
+                        help="Seconds between structured metric summaries on stdout.")
+    parser.add_argument("--profile-dir", default="./profiles",
+                        help="Directory for profiles triggered with SIGUSR1 (CPU) or SIGUSR2 (memory).")
+    parser.add_argument("--profile-seconds", type=float, default=60.0,
+                        help="Duration of a signal-triggered profiling session.")
+    parser.add_argument("--breaker-threshold", type=int, default=3,
+                        help="Consecutive failures after which a sensor is skipped until a backed-off probe.")
+    parser.add_argument("--breaker-backoff", type=float, default=CYCLE_INTERVAL,
+                        help="Seconds before the first probe of a skipped sensor; doubles after each failed probe.")
+    parser.add_argument("--breaker-max-backoff", type=float, default=3600.0,
+                        help="Upper bound of the probe backoff in seconds.")
+    parser.add_argument("--cycles", type=int, default=0,
+                        help="Stop after this many acquisition cycles (0 runs forever).")
+    args = parser.parse_args(argv)
+    if args.shard_monthly and args.archive_after_days is not None:
+        # Sharded reads go through plain SQL and would not see archive blocks;
+        # closed monthly shards are compressed or moved off the device as whole files instead.
+        parser.error("--archive-after-days cannot be combined with --shard-monthly.")
+    return args
+
+
+def run_interactive_setup(db_path: str, backend_factory: Optional[Callable[[], ShardedDatabase]] = None) -> None:
+    """
+    Legacy start-up: prompts for an export and a data wipe before any sensor is read.
+    """
+    reader = None
+    try:
+        reader = SensorDataReader(db_path, backend=backend_factory() if backend_factory else None)
         
         # Prompt for optional export user prompt
         # The user prompt is handled internally
@@ -46,77 +252,112 @@ def main():
     except PermissionError as err:
         print(f"[DB INIT] {err}")
     finally:
-        reader.close()
+        if reader is not None:
+            reader.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Executes main logging loop for all sensors
     
-    # -- Initializes all sensors --
-    dht_sensor, tsl_sensor, ina_sensors = setup_sensors()
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    backend_factory = (lambda: ShardedDatabase(args.db)) if args.shard_monthly else None
+    
+    # -- Optional interactive prompts / explicit wipe, before anything is logged --
+    if args.interactive:
+        run_interactive_setup(args.db, backend_factory)
+    elif args.clear:
+        reader = SensorDataReader(args.db, backend=backend_factory() if backend_factory else None)
+        try:
+            reader.clear_all_data(confirm=False)
+        finally:
+            reader.close()
+    
+    # Readings are spooled to disk first so a locked or damaged DB never loses a sample.
+    # Anything left over from a crash or power loss is replayed by the first cycle.
+    logger = SensorLogger(db_path=args.db, spool_path=args.spool, backend=backend_factory() if backend_factory else None)
+    
+    # -- Export and maintenance never delay acquisition --
+    worker = BackgroundWorker(args.db)
+    if args.export:
+        worker.submit_export(
+            sensor_file=os.path.join(args.export_dir, "sensor_data.csv"),
+            cell_file=os.path.join(args.export_dir, "cell_output.csv"),
+            backend_factory=backend_factory,
+        )
+    # Integrity checks work file by file, i.e. per shard when sharded
+    db_files = ShardedDatabase(args.db).shard_paths() if args.shard_monthly else [args.db]
+    # Databases from before the change feed are numbered in the background, after logging starts
+    for db_file in db_files:
+        worker.submit_feed_migration(db_file)
+    if args.maintenance:
+        for db_file in db_files:
+            worker.submit_integrity_check(db_file)
+    if args.archive_after_days is not None:
+        cutoff = datetime.combine(date.today() - timedelta(days=args.archive_after_days), datetime.min.time())
+        worker.submit_archive(cutoff.isoformat())
+    worker.start()
+    
+    # -- Initializes all sensors, sharing one bus object per physical bus --
+    topology = BusTopology()
+    dht_sensor, tsl_sensor, ina_sensors = setup_sensors(topology)
+    # A faulty device is skipped instead of stalling every cycle on timeouts
+    breakers = BreakerRegistry(
+        failure_threshold=args.breaker_threshold,
+        base_backoff=args.breaker_backoff,
+        max_backoff=max(args.breaker_max_backoff, args.breaker_backoff),
+    )
 
+    metrics_server = MetricsServer(REGISTRY, port=args.metrics_port) if args.metrics_port is not None else None
+    if metrics_server:
+        metrics_server.start()
+    data_service = DataService(args.db, logger, port=args.http_port, backend_factory=backend_factory) if args.http_port is not None else None
+    if data_service:
+        data_service.start()
+    reporter = SummaryReporter(REGISTRY, interval=args.summary_interval)
+    # Idle until a signal arrives, so always installed
+    profiling = ProfilingHooks(args.profile_dir, duration=args.profile_seconds)
+    profiling.install()
+
+    cycles = 0
     try:
         while True:
-            data = {}
+            started = monotonic()
             
-            #reader.show_all_dataframes(True) # Comment out while the program is gathering data.
+            with REGISTRY.timer("acquisition_cycle_seconds"):
+                run_cycle(dht_sensor, tsl_sensor, ina_sensors, logger, topology, breakers)
+            reporter.maybe_report()
             
-            # -- Light sensor (TSL2591) --
-            # Try/except loop designed to avoid oversaturating the sensor
-            lux = None
+            cycles += 1
+            if cycles == 1:
+                time_to_first_sample = monotonic() - _PROCESS_START
+                REGISTRY.gauge("time_to_first_sample_seconds").set(time_to_first_sample)
+                print(f"[LOG] First sample logged {time_to_first_sample:.2f}s after start-up.")
+            if args.cycles and cycles >= args.cycles:
+                break
             
-            try:
-                lux = tsl_sensor.read_lux()
-            except Exception as err:
-                print(f"[ERROR] Failed to read TSL2591: {err}")
-            
-            if lux is not None:
-                print(f"[LOG] Light intensity: {lux:.2f}")
-                data["lux"] = lux    
-            
-            # -- Humidity & Temperature sensor (DHT11) --
-            try:
-                result = dht_sensor.read()
-                if result:
-                    temperature, humidity = dht_sensor.read()
-                    print(f"[LOG] Temperature: {temperature:.1f}°C | Humidity: {humidity:.1f}%")
-                    data["temperature"] = temperature
-                    data["humidity"] = humidity
-                else:
-                    print("[ERROR] DHT11 reading failed after retries.")
-            except Exception as err:
-                print(f"[ERROR] Failed to read DHT11: {err}")
-                
-            # -- Only log if all fields are available --
-            if all(k in data for k in ("lux", "temperature", "humidity")):
-                logger.log_data(
-                    lux=data["lux"],
-                    temperature=data["temperature"],
-                    humidity=data["humidity"]
-                )
-                
-            # -- Voltage/current sensors (INA219) --
-            for idx, sensor in enumerate(ina_sensors, start=1):
-                try:
-                    voltage = sensor.read_voltage()
-                    current = sensor.read_current()
-                    power = sensor.read_power()
-                    print(f"[LOG] Cell{idx}: Voltage={voltage:.3f}V, Current={current:.3f}mA, P={power:.2f}mW")
-                    logger.log_cell_output(
-                        cell_id=f"cell_{idx}",
-                        data={
-                            "voltage": voltage,
-                            "current": current,
-                            "power": power
-                        }
-                    )
-
-                except Exception as err:
-                    print(f"[ERROR] Failed to read INA219 sensor {idx}: {err}")
-                    
-            sleep(60)
+            # -- Fixed-rate scheduling: sleep only for what is left of the interval --
+            elapsed = monotonic() - started
+            if elapsed > CYCLE_INTERVAL:
+                REGISTRY.counter("acquisition_overruns_total").inc()
+                print(f"[WARN] Acquisition cycle overran: {elapsed:.1f}s > {CYCLE_INTERVAL}s")
+            sleep(max(0.0, CYCLE_INTERVAL - elapsed))
             
     except KeyboardInterrupt:
         print("[ERROR] Logging interrupted by user.\nTerminating...")
     finally:
+        profiling.uninstall()
         dht_sensor.cleanup()
+        topology.close()
         logger.close()
+        worker.stop(timeout=BACKGROUND_SHUTDOWN_TIMEOUT)
+        if metrics_server:
+            metrics_server.stop()
+        if data_service:
+            data_service.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
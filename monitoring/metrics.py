@@ -0,0 +1,298 @@
+import json
+import threading
+from bisect import bisect_left
+from time import perf_counter_ns, monotonic
+from typing import Dict, Optional, Tuple, List, Any
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """
+    Monotonically increasing count, e.g. retries or overruns.
+    """
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Increments the counter.
+        """
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """
+    Single value that can go up and down, e.g. the time to first sample.
+    """
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """
+        Replaces the current value.
+        """
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Raises the value, e.g. when a client connects.
+        """
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """
+        Lowers the value.
+        """
+        self.inc(-amount)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram in seconds, compatible with the Prometheus text format.
+    """
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max", "_lock")
+
+    DEFAULT_BUCKETS: Tuple[float, ...] = (
+        0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+    )
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+        """
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile from the bucket counts (upper bucket bound).
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for idx, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[idx] if idx < len(self.buckets) else self.max
+        return self.max
+
+
+class _Timer:
+    """
+    Context manager that records its elapsed wall time into a histogram.
+    """
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.started = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe((perf_counter_ns() - self.started) * 1e-9)
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of counters, gauges and histograms.
+
+    Metrics are created on first use and identified by name plus optional labels:
+
+        with REGISTRY.timer("sensor_read_seconds", sensor="tsl2591"):
+            lux = tsl_sensor.read_lux()
+        REGISTRY.counter("dht11_retries_total").inc()
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[Tuple[str, _LabelKey], Counter] = {}
+        self._gauges: Dict[Tuple[str, _LabelKey], Gauge] = {}
+        self._histograms: Dict[Tuple[str, _LabelKey], Histogram] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, _LabelKey]:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        """
+        Returns the counter with the given name and labels, creating it if needed.
+        """
+        key = self._key(name, labels)
+        metric = self._counters.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._counters.setdefault(key, Counter())
+        return metric
+
+    def gauge(self, name: str, **labels: Any) -> Gauge:
+        """
+        Returns the gauge with the given name and labels, creating it if needed.
+        """
+        key = self._key(name, labels)
+        metric = self._gauges.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._gauges.setdefault(key, Gauge())
+        return metric
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        """
+        Returns the histogram with the given name and labels, creating it if needed.
+        """
+        key = self._key(name, labels)
+        metric = self._histograms.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._histograms.setdefault(key, Histogram())
+        return metric
+
+    def timer(self, name: str, **labels: Any) -> _Timer:
+        """
+        Returns a context manager that times its block into the named histogram.
+        """
+        return _Timer(self.histogram(name, **labels))
+
+    def reset(self) -> None:
+        """
+        Drops every metric. Mainly useful in tests.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _series_name(name: str, labels: _LabelKey) -> str:
+        if not labels:
+            return name
+        rendered = ",".join(f'{label}="{value}"' for label, value in labels)
+        return f"{name}{{{rendered}}}"
+
+    def _items(self) -> Tuple[List, List, List]:
+        """
+        Copies the counter, gauge and histogram entries under the lock, so that metrics
+        created concurrently by other threads cannot change the dicts during iteration.
+        """
+        with self._lock:
+            return list(self._counters.items()), list(self._gauges.items()), list(self._histograms.items())
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns a structured snapshot of every metric.
+
+        Returns:
+            Dict[str, Any]: 'counters' and 'gauges' map series names to values; 'histograms'
+                            map series names to count, mean, p50, p95, min and max seconds.
+        """
+        counters, gauges, histogram_items = self._items()
+        histograms = {}
+        for (name, labels), histogram in histogram_items:
+            histograms[self._series_name(name, labels)] = {
+                "count": histogram.count,
+                "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "min": histogram.min if histogram.count else 0.0,
+                "max": histogram.max,
+            }
+        return {
+            "counters": {self._series_name(n, l): c.value for (n, l), c in counters},
+            "gauges": {self._series_name(n, l): g.value for (n, l), g in gauges},
+            "histograms": histograms,
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        counters, gauges, histograms = self._items()
+        lines: List[str] = []
+        seen_types = set()
+
+        def type_line(name: str, kind: str) -> None:
+            if name not in seen_types:
+                seen_types.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), counter in sorted(counters, key=lambda item: item[0]):
+            type_line(name, "counter")
+            lines.append(f"{self._series_name(name, labels)} {counter.value}")
+
+        for (name, labels), gauge in sorted(gauges, key=lambda item: item[0]):
+            type_line(name, "gauge")
+            lines.append(f"{self._series_name(name, labels)} {gauge.value}")
+
+        for (name, labels), histogram in sorted(histograms, key=lambda item: item[0]):
+            type_line(name, "histogram")
+            with histogram._lock:
+                counts, total, count = list(histogram.counts), histogram.sum, histogram.count
+            running = 0
+            for bound, bucket_count in zip(histogram.buckets + (float("inf"),), counts):
+                running += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self._series_name(name + '_bucket', labels + (('le', le),))} {running}")
+            lines.append(f"{self._series_name(name + '_sum', labels)} {total}")
+            lines.append(f"{self._series_name(name + '_count', labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class SummaryReporter:
+    """
+    Prints the registry summary as one JSON line at a fixed interval.
+    """
+
+    def __init__(self, registry: "MetricsRegistry", interval: float = 600.0) -> None:
+        """
+        Args:
+            registry (MetricsRegistry): Registry to summarise.
+            interval (float): Seconds between two summaries.
+        """
+        self.registry = registry
+        self.interval = interval
+        self._last_report = monotonic()
+
+    def maybe_report(self) -> Optional[Dict[str, Any]]:
+        """
+        Prints and returns a summary if the interval has elapsed since the last one.
+        """
+        now = monotonic()
+        if now - self._last_report < self.interval:
+            return None
+        self._last_report = now
+        summary = self.registry.summary()
+        print(f"[METRICS] {json.dumps(summary, sort_keys=True)}")
+        return summary
+
+
+# Default registry shared by the sensors, the database layer and main.py
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,226 @@
+import cProfile
+import io
+import os
+import pstats
+import signal
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from monitoring.metrics import REGISTRY
+
+
+class ProfilingHooks:
+    """
+    Signal-triggered CPU and memory profiling for the long-running logger process.
+
+        kill -USR1 <pid>   profile the acquisition thread with cProfile for `duration` seconds
+        kill -USR2 <pid>   trace allocations with tracemalloc for `duration` seconds and diff
+
+    Sending the same signal again ends a session early. Each session writes
+    timestamped files to `output_dir`: cpu-<time>.prof (pstats format, for snakeviz
+    or `python -m pstats`) with a cpu-<time>.txt summary, or mem-<time>.txt with the
+    largest allocation changes between the start and end snapshots.
+
+    Nothing is sampled or traced until a signal arrives, so the hooks cost nothing
+    while idle. cProfile only sees the thread it is enabled in, so CPU sessions
+    start and stop inside the signal handler on the main (acquisition) thread; the
+    expiry timer re-sends the signal to that thread rather than stopping it directly.
+    tracemalloc covers every thread.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        duration: float = 60.0,
+        top: int = 40,
+        frames: int = 10
+    ) -> None:
+        """
+        Args:
+            output_dir (str): Directory the result files are written to.
+            duration (float): Seconds a session runs unless ended early by a second signal.
+            top (int): Entries listed in the text summaries.
+            frames (int): Stack frames tracemalloc records per allocation.
+        """
+        self.output_dir = output_dir
+        self.duration = duration
+        self.top = top
+        self.frames = frames
+        # Re-entrant: a signal handler may run while the main thread holds it
+        self._lock = threading.RLock()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._cpu_timer: Optional[threading.Timer] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._memory_timer: Optional[threading.Timer] = None
+        self._previous_handlers: Dict[int, Any] = {}
+        self._main_thread = threading.main_thread().ident
+
+    @staticmethod
+    def supported() -> bool:
+        """
+        Whether the platform has SIGUSR1/SIGUSR2 (not Windows).
+        """
+        return hasattr(signal, "SIGUSR1") and hasattr(signal, "SIGUSR2") and hasattr(signal, "pthread_kill")
+
+    def install(self) -> bool:
+        """
+        Registers the signal handlers. Must be called from the main thread.
+
+        Returns:
+            bool: False if the platform has no user signals.
+        """
+        if not self.supported():
+            print("[PROFILE] User signals are not available on this platform; profiling hooks disabled.")
+            return False
+        self._previous_handlers[signal.SIGUSR1] = signal.signal(signal.SIGUSR1, self._on_cpu_signal)
+        self._previous_handlers[signal.SIGUSR2] = signal.signal(signal.SIGUSR2, self._on_memory_signal)
+        print(f"[PROFILE] Send SIGUSR1 (CPU) or SIGUSR2 (memory) to PID {os.getpid()} "
+              f"for a {self.duration:g}s profile in {self.output_dir}/")
+        return True
+
+    def uninstall(self) -> None:
+        """
+        Ends any running session (writing its results) and restores the previous handlers.
+        """
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers.clear()
+        if self._profiler is not None and threading.get_ident() == self._main_thread:
+            self.stop_cpu()
+        self.stop_memory()
+
+    @property
+    def cpu_active(self) -> bool:
+        return self._profiler is not None
+
+    @property
+    def memory_active(self) -> bool:
+        return self._baseline is not None
+
+    def _path(self, kind: str, extension: str, stamp: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, f"{kind}-{stamp}.{extension}")
+
+    @staticmethod
+    def _stamp() -> str:
+        return datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+
+    # ----------------------------------------------------------------
+    # CPU (cProfile)
+    # ----------------------------------------------------------------
+    def _on_cpu_signal(self, signum: int, frame: Any) -> None:
+        if self.cpu_active:
+            self.stop_cpu()
+        else:
+            self.start_cpu()
+
+    def _expire_cpu(self) -> None:
+        # Runs on the timer thread; the handler does the actual stop on the main thread
+        signal.pthread_kill(self._main_thread, signal.SIGUSR1)
+
+    def start_cpu(self) -> None:
+        """
+        Starts a cProfile session on the calling thread, ending after `duration` seconds.
+        """
+        if self.cpu_active:
+            return
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        REGISTRY.counter("profiling_sessions_total", kind="cpu").inc()
+        print(f"[PROFILE] CPU profiling started for {self.duration:g}s")
+        if self.supported():
+            self._cpu_timer = threading.Timer(self.duration, self._expire_cpu)
+            self._cpu_timer.daemon = True
+            self._cpu_timer.start()
+
+    def stop_cpu(self) -> Optional[str]:
+        """
+        Stops the running cProfile session and writes its results.
+
+        Returns:
+            Optional[str]: Path of the .prof file, or None if no session was running.
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        profiler.disable()
+        if self._cpu_timer is not None:
+            self._cpu_timer.cancel()
+            self._cpu_timer = None
+
+        stamp = self._stamp()
+        path = self._path("cpu", "prof", stamp)
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        with open(self._path("cpu", "txt", stamp), "w") as handle:
+            handle.write(summary.getvalue())
+        print(f"[PROFILE] CPU profile written to {path}")
+        return path
+
+    # ----------------------------------------------------------------
+    # MEMORY (tracemalloc)
+    # ----------------------------------------------------------------
+    def _on_memory_signal(self, signum: int, frame: Any) -> None:
+        if self.memory_active:
+            # Writing the diff takes a while; keep the acquisition thread free
+            threading.Thread(target=self.stop_memory, name="profiling-memory", daemon=True).start()
+        else:
+            self.start_memory()
+
+    def start_memory(self) -> None:
+        """
+        Starts tracing allocations and takes the baseline snapshot.
+        """
+        with self._lock:
+            if self.memory_active:
+                return
+            tracemalloc.start(self.frames)
+            self._baseline = tracemalloc.take_snapshot()
+            self._memory_timer = threading.Timer(self.duration, self.stop_memory)
+            self._memory_timer.daemon = True
+            self._memory_timer.start()
+        REGISTRY.counter("profiling_sessions_total", kind="memory").inc()
+        print(f"[PROFILE] Memory tracing started for {self.duration:g}s")
+
+    def stop_memory(self) -> Optional[str]:
+        """
+        Takes the final snapshot, writes the difference to the baseline and stops tracing.
+
+        Returns:
+            Optional[str]: Path of the report, or None if no session was running.
+        """
+        with self._lock:
+            baseline, self._baseline = self._baseline, None
+            if baseline is None:
+                return None
+            if self._memory_timer is not None:
+                self._memory_timer.cancel()
+                self._memory_timer = None
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+        snapshot, baseline = snapshot.filter_traces(filters), baseline.filter_traces(filters)
+        by_line = snapshot.compare_to(baseline, "lineno")
+        by_trace = snapshot.compare_to(baseline, "traceback")
+        lines: List[str] = [
+            f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+            f"Net change: {sum(stat.size_diff for stat in by_line) / 1024:+.1f} KiB",
+            "",
+            f"Top {self.top} changes by line:",
+            *(str(stat) for stat in by_line[:self.top]),
+            "",
+            "Largest growth with traceback:",
+        ]
+        for stat in by_trace[:min(self.top, 5)]:
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+
+        path = self._path("mem", "txt", self._stamp())
+        with open(path, "w") as handle:
+            handle.write("\n".join(lines) + "\n")
+        print(f"[PROFILE] Memory diff written to {path}")
+        return path
@@ -0,0 +1,67 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from monitoring.metrics import MetricsRegistry, REGISTRY
+
+
+class MetricsServer:
+    """
+    Serves a registry in the Prometheus text format from a background thread.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9108) -> None:
+        """
+        Args:
+            registry (MetricsRegistry): Registry exposed on /metrics.
+            host (str): Interface to bind; local-only by default.
+            port (int): TCP port to listen on (0 picks a free port).
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        """
+        Starts serving in a daemon thread.
+
+        Returns:
+            int: The port actually bound.
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                # Scrapes every few seconds would otherwise flood the console
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        print(f"[METRICS] Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        """
+        Shuts the server down and waits for its thread.
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
@@ -0,0 +1,310 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from monitoring.metrics import REGISTRY
+
+# Name of the Raspberry Pi's default I2C bus (board.SCL / board.SDA)
+DEFAULT_BUS = "i2c-1"
+
+
+class I2CBus:
+    """
+    One physical I2C bus, shared by every device and multiplexer attached to it.
+
+    The bus object is created on first use and reused afterwards, and `lock`
+    serialises multi-transaction operations (a mux select followed by a read)
+    between threads.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Args:
+            name (str): Bus name used in the topology and in metrics.
+            factory (Callable[[], Any]): Creates the busio.I2C-compatible bus object.
+        """
+        self.name = name
+        self.lock = threading.RLock()
+        self._factory = factory
+        self._i2c: Any = None
+        # mux address -> currently enabled channel (None when all are disabled)
+        self.selected: Dict[int, Optional[int]] = {}
+
+    @property
+    def i2c(self) -> Any:
+        with self.lock:
+            if self._i2c is None:
+                self._i2c = self._factory()
+            return self._i2c
+
+    def deinit(self) -> None:
+        """
+        Releases the bus object if it was created.
+        """
+        with self.lock:
+            if self._i2c is not None and hasattr(self._i2c, "deinit"):
+                self._i2c.deinit()
+            self._i2c = None
+            self.selected.clear()
+
+
+class _BusProxy:
+    """
+    Passes transactions through to a shared I2CBus; subclasses decide what taking the lock selects.
+    """
+
+    def __init__(self, bus: I2CBus) -> None:
+        self.bus = bus
+
+    def _deselect(self, i2c: Any, keep: Optional[int] = None) -> None:
+        """
+        Disables every multiplexer on the bus with an enabled channel, except `keep`.
+
+        Must be called with the bus object locked.
+        """
+        for address, selected in self.bus.selected.items():
+            if address != keep and selected is not None:
+                i2c.writeto(address, bytes([0]))
+                self.bus.selected[address] = None
+
+    def unlock(self) -> None:
+        self.bus.i2c.unlock()
+
+    def readfrom_into(self, address: int, buffer, **kwargs) -> None:
+        self.bus.i2c.readfrom_into(address, buffer, **kwargs)
+
+    def writeto(self, address: int, buffer, **kwargs) -> None:
+        self.bus.i2c.writeto(address, buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address: int, buffer_out, buffer_in, **kwargs) -> None:
+        self.bus.i2c.writeto_then_readfrom(address, buffer_out, buffer_in, **kwargs)
+
+
+class DirectBus(_BusProxy):
+    """
+    The bus as seen by a device wired to it directly, usable wherever a busio.I2C is expected.
+
+    Taking the lock disables every multiplexer channel on the bus first, so a direct
+    device never collides with a device at the same address behind a multiplexer.
+    Buses without multiplexers pay nothing extra.
+    """
+
+    def try_lock(self) -> bool:
+        i2c = self.bus.i2c
+        if not i2c.try_lock():
+            return False
+        try:
+            self._deselect(i2c)
+        except Exception:
+            i2c.unlock()
+            raise
+        return True
+
+    def scan(self) -> List[int]:
+        """
+        Lists the device addresses visible with every multiplexer channel disabled.
+        """
+        while not self.try_lock():
+            pass
+        try:
+            return self.bus.i2c.scan()
+        finally:
+            self.unlock()
+
+
+class MuxChannel(_BusProxy):
+    """
+    One downstream channel of a TCA9548A multiplexer, usable wherever a busio.I2C is expected.
+
+    Like adafruit_tca9548a's channel objects, taking the bus lock also switches the
+    multiplexer to this channel, so device drivers need no changes. The switch is
+    skipped when the channel is already selected, and other multiplexers on the
+    same bus are disabled first so identical device addresses never collide.
+    """
+
+    def __init__(self, bus: I2CBus, mux_address: int, channel: int) -> None:
+        """
+        Args:
+            bus (I2CBus): Physical bus the multiplexer sits on.
+            mux_address (int): I2C address of the multiplexer (0x70-0x77).
+            channel (int): Channel number 0-7.
+
+        Raises:
+            ValueError: If the channel number is out of range.
+        """
+        if not 0 <= channel <= 7:
+            raise ValueError("TCA9548A channels are numbered 0 to 7.")
+        super().__init__(bus)
+        self.mux_address = mux_address
+        self.channel = channel
+
+    def try_lock(self) -> bool:
+        i2c = self.bus.i2c
+        if not i2c.try_lock():
+            return False
+        try:
+            self._deselect(i2c, keep=self.mux_address)
+            if self.bus.selected.get(self.mux_address) != self.channel:
+                i2c.writeto(self.mux_address, bytes([1 << self.channel]))
+                self.bus.selected[self.mux_address] = self.channel
+                REGISTRY.counter("i2c_mux_switches_total", bus=self.bus.name).inc()
+        except Exception:
+            i2c.unlock()
+            raise
+        return True
+
+    def scan(self) -> List[int]:
+        """
+        Lists the device addresses visible on this channel, excluding the multiplexer itself.
+        """
+        while not self.try_lock():
+            pass
+        try:
+            return [address for address in self.bus.i2c.scan() if address != self.mux_address]
+        finally:
+            self.unlock()
+
+
+class BusTopology:
+    """
+    Registry of the I2C buses and multiplexer channels in the rig.
+
+    Every physical bus is opened once and shared; devices behind a multiplexer get a
+    MuxChannel and devices wired directly a DirectBus, both routing through the
+    shared bus. Buses other than DEFAULT_BUS must be declared with their pins
+    (or a custom bus_factory) before use. read_all reads devices on
+    independent buses in parallel, one worker thread per bus, while reads on the
+    same bus (including all of its multiplexer channels) stay sequential.
+    """
+
+    def __init__(self, bus_factory: Optional[Callable[[str, Any, Any], Any]] = None) -> None:
+        """
+        Args:
+            bus_factory (Optional[Callable[[str, Any, Any], Any]]): Creates a bus object from
+                                    (name, scl, sda). Defaults to busio.I2C, imported on first use.
+        """
+        self._bus_factory = bus_factory or self._default_bus_factory
+        self._buses: Dict[str, I2CBus] = {}
+        self._channels: Dict[Tuple[str, int, int], MuxChannel] = {}
+        self._direct: Dict[str, DirectBus] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_bus_factory(name: str, scl: Any, sda: Any) -> Any:
+        # Imported here so topologies can be built and tested without Blinka
+        import board
+        import busio
+        return busio.I2C(scl or board.SCL, sda or board.SDA)
+
+    def add_bus(self, name: str, scl: Any = None, sda: Any = None) -> I2CBus:
+        """
+        Declares a physical bus; the bus object itself is created on first use.
+
+        Args:
+            name (str): Bus name, e.g. 'i2c-1'.
+            scl (Any): SCL pin; None uses board.SCL (DEFAULT_BUS only).
+            sda (Any): SDA pin; None uses board.SDA (DEFAULT_BUS only).
+
+        Returns:
+            I2CBus: The (possibly already declared) bus.
+
+        Raises:
+            ValueError: If a bus other than DEFAULT_BUS has no pins and no custom bus_factory,
+                        which would open a second bus object on the default pins.
+        """
+        with self._lock:
+            if name not in self._buses:
+                if (
+                    name != DEFAULT_BUS
+                    and (scl is None or sda is None)
+                    and self._bus_factory == self._default_bus_factory
+                ):
+                    raise ValueError(f"Bus {name!r} needs explicit SCL and SDA pins; only {DEFAULT_BUS} defaults to board.SCL/SDA.")
+                self._buses[name] = I2CBus(name, lambda: self._bus_factory(name, scl, sda))
+            return self._buses[name]
+
+    def bus(self, name: str = DEFAULT_BUS) -> I2CBus:
+        """
+        Returns a declared bus, declaring DEFAULT_BUS with the default pins on first use.
+
+        Raises:
+            ValueError: If the bus was never declared and cannot default its pins.
+        """
+        return self._buses.get(name) or self.add_bus(name)
+
+    def i2c(self, bus: str = DEFAULT_BUS, mux: Optional[Tuple[int, int]] = None) -> Any:
+        """
+        Returns the object a device driver should be constructed with.
+
+        Args:
+            bus (str): Physical bus name.
+            mux (Optional[Tuple[int, int]]): (multiplexer address, channel) if the device
+                                             sits behind a TCA9548A.
+
+        Returns:
+            Any: A shared DirectBus, or a shared MuxChannel.
+        """
+        physical = self.bus(bus)
+        with self._lock:
+            if mux is None:
+                if bus not in self._direct:
+                    # Opened here, as drivers given the bus object used to, so wiring errors surface during setup
+                    physical.i2c
+                    self._direct[bus] = DirectBus(physical)
+                return self._direct[bus]
+            key = (bus, *mux)
+            if key not in self._channels:
+                physical.selected.setdefault(mux[0], None)
+                self._channels[key] = MuxChannel(physical, *mux)
+            return self._channels[key]
+
+    def _executor(self, bus: str) -> ThreadPoolExecutor:
+        with self._lock:
+            if bus not in self._executors:
+                self._executors[bus] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"bus-{bus}")
+            return self._executors[bus]
+
+    def read_all(self, reads: List[Tuple[Any, str, Callable[[], Any]]]) -> Dict[Any, Any]:
+        """
+        Runs read callables grouped by bus: buses in parallel, each bus in list order.
+
+        Args:
+            reads (List[Tuple[Any, str, Callable[[], Any]]]): (key, bus name, read) triples.
+
+        Returns:
+            Dict[Any, Any]: Result per key; a read that raised maps to its exception.
+        """
+        grouped: Dict[str, List[Tuple[Any, Callable[[], Any]]]] = {}
+        for key, bus, read in reads:
+            grouped.setdefault(bus, []).append((key, read))
+
+        def run_bus(bus: str, items: List[Tuple[Any, Callable[[], Any]]]) -> Dict[Any, Any]:
+            results = {}
+            with self.bus(bus).lock, REGISTRY.timer("i2c_bus_read_seconds", bus=bus):
+                for key, read in items:
+                    try:
+                        results[key] = read()
+                    except Exception as err:
+                        results[key] = err
+            return results
+
+        if len(grouped) == 1:
+            # A single bus gains nothing from a thread hop
+            ((bus, items),) = grouped.items()
+            return run_bus(bus, items)
+
+        futures: List[Future] = [self._executor(bus).submit(run_bus, bus, items) for bus, items in grouped.items()]
+        results: Dict[Any, Any] = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def close(self) -> None:
+        """
+        Stops the worker threads and releases every bus.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        self._executors.clear()
+        for bus in self._buses.values():
+            bus.deinit()
@@ -0,0 +1,216 @@
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict, Optional
+from monitoring.metrics import REGISTRY
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of reading a device whose circuit breaker is open.
+    """
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"{name} is unavailable; next probe in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stops reading a failing device until an exponentially backed-off probe succeeds.
+
+    closed     Every read goes through. `failure_threshold` consecutive failures open it.
+    open       Reads are skipped without touching the device until the backoff expires.
+    half_open  The next read is a probe: success closes the breaker, failure reopens
+               it with the backoff multiplied by `multiplier`, up to `max_backoff`.
+
+    A skipped read costs nothing, so a cycle spends at most one probe per faulty
+    device per backoff period, however many devices are failing.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Gauge values of sensor_circuit_state
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_backoff: float = 60.0,
+        max_backoff: float = 3600.0,
+        multiplier: float = 2.0,
+        none_is_failure: bool = False,
+        clock: Callable[[], float] = monotonic
+    ) -> None:
+        """
+        Args:
+            name (str): Device name used in log lines and metric labels, e.g. 'ina219_cell_2'.
+            failure_threshold (int): Consecutive failures that open the breaker.
+            base_backoff (float): Seconds before the first probe after opening.
+            max_backoff (float): Upper bound of the backoff in seconds.
+            multiplier (float): Backoff growth factor after every failed probe.
+            none_is_failure (bool): Count a None result as a failure, for drivers such as
+                                    DHT11Sensor.read that report failure by returning None.
+            clock (Callable[[], float]): Monotonic time source in seconds; injectable for tests.
+
+        Raises:
+            ValueError: If the threshold or backoff settings are not positive.
+        """
+        if failure_threshold < 1 or base_backoff <= 0 or max_backoff < base_backoff or multiplier < 1:
+            raise ValueError("Invalid circuit breaker settings.")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.none_is_failure = none_is_failure
+        self.clock = clock
+
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.skipped = 0
+        self.backoff = 0.0
+        self._opened_state = False
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        """
+        Current state; an open breaker becomes half-open once its backoff has expired.
+        """
+        if not self._opened_state:
+            return self.CLOSED
+        return self.HALF_OPEN if self.clock() >= self._next_probe else self.OPEN
+
+    def retry_in(self) -> float:
+        """
+        Seconds until the next probe is allowed (0 unless open).
+        """
+        return max(0.0, self._next_probe - self.clock()) if self._opened_state else 0.0
+
+    def _publish(self, state: Optional[str] = None) -> None:
+        REGISTRY.gauge("sensor_circuit_state", sensor=self.name).set(self._STATE_VALUES[state or self.state])
+
+    def call(self, read: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a read through the breaker.
+
+        Args:
+            read (Callable[..., Any]): Device read, called with *args and **kwargs.
+
+        Returns:
+            Any: The read's result.
+
+        Raises:
+            CircuitOpenError: If the breaker is open; the device is not touched.
+            Exception: Whatever the read raised, after recording the failure.
+        """
+        with self._lock:
+            state = self.state
+            if state == self.OPEN:
+                self.skipped += 1
+                REGISTRY.counter("sensor_circuit_skips_total", sensor=self.name).inc()
+                raise CircuitOpenError(self.name, self.retry_in())
+            if state == self.HALF_OPEN:
+                # The backoff expired without a state change; report the probe until it resolves
+                self._publish(state)
+        try:
+            result = read(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if result is None and self.none_is_failure:
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def record_success(self) -> None:
+        """
+        Closes the breaker and resets the backoff.
+        """
+        with self._lock:
+            if self._opened_state:
+                print(f"[BREAKER] {self.name} recovered; resuming reads.")
+            self.consecutive_failures = 0
+            self.backoff = 0.0
+            self._opened_state = False
+            self._publish()
+
+    def record_failure(self) -> None:
+        """
+        Counts a failure, opening the breaker or extending its backoff as needed.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._opened_state:
+                # A failed probe
+                self.backoff = min(self.max_backoff, self.backoff * self.multiplier)
+            elif self.consecutive_failures >= self.failure_threshold:
+                self.backoff = self.base_backoff
+                self._opened_state = True
+                self.trips += 1
+                REGISTRY.counter("sensor_circuit_trips_total", sensor=self.name).inc()
+            else:
+                return
+            self._next_probe = self.clock() + self.backoff
+            print(f"[BREAKER] {self.name} unavailable after {self.consecutive_failures} consecutive failures; "
+                  f"next probe in {self.backoff:.0f}s.")
+            self._publish()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the breaker's state for monitoring.
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff_seconds": self.backoff,
+            "retry_in_seconds": round(self.retry_in(), 3),
+            "trips": self.trips,
+            "skipped": self.skipped,
+        }
+
+
+class BreakerRegistry:
+    """
+    One CircuitBreaker per device name, created on first use with shared settings.
+    """
+
+    def __init__(self, **settings: Any) -> None:
+        """
+        Args:
+            **settings: Keyword arguments passed to every new CircuitBreaker.
+        """
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **overrides: Any) -> CircuitBreaker:
+        """
+        Returns the breaker of a device, creating it with the shared settings and any overrides.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name, **{**self.settings, **overrides})
+        return breaker
+
+    def call(self, name: str, read: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Shortcut for get(name).call(read, *args, **kwargs).
+        """
+        return self.get(name).call(read, *args, **kwargs)
+
+    def snapshot(self, name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the state of every breaker (or just one), keyed by device name.
+        """
+        names = [name] if name is not None else sorted(self._breakers)
+        return {key: self._breakers[key].snapshot() for key in names if key in self._breakers}
@@ -2,6 +2,7 @@ import board
 import adafruit_dht
 from typing import Optional, Tuple
 from time import sleep
+from monitoring.metrics import REGISTRY
 
 class DHT11Sensor:
     """
@@ -38,8 +39,10 @@ class DHT11Sensor:
                     return temperature, humidity
             except (RuntimeError, ValueError) as err:
                 print(f"[DHT11Sensor] Read error on attempt {attempt + 1}: {err}")
+                REGISTRY.counter("dht11_retries_total").inc()
                 sleep(delay)
         
+        REGISTRY.counter("dht11_failures_total").inc()
         print(f"[DHT11Sensor] All read attempts failed.")
         return None
         
@@ -1,7 +1,8 @@
 from adafruit_ina219 import INA219
 import board
 import busio
-from typing import List
+from typing import List, Optional, Tuple
+from sensors.bus import DEFAULT_BUS
 
 
 class INA219Sensor:
@@ -9,11 +10,18 @@ class INA219Sensor:
     Represents a single INA219 sensor instance.
     """
     
-    def __init__(self, i2c, address: int, cell_id: str):
+    def __init__(self, i2c, address: int, cell_id: str, bus: str = DEFAULT_BUS):
         """
         Initialize INA219 sensor at a specifc I2C address.
+        
+        Args:
+            i2c: Shared bus object, or a DirectBus or MuxChannel from sensors.bus.BusTopology.
+            address (int): I2C address of the INA219.
+            cell_id (str): Unique ID for the cell.
+            bus (str): Name of the physical bus, used to group parallel reads.
         """
         self.cell_id = cell_id
+        self.bus = bus
         self.device = INA219(i2c, address)
         
     def read_voltage(self) -> float:
@@ -45,15 +53,22 @@ class INA219Manager:
     Manages multiple INA219 sensors with distinct addresses.
     """
     
-    def __init__(self):
+    DEFAULT_CHANNELS: List[Tuple[int, str]] = [(0x40, "cell_1"), (0x41, "cell_2"), (0x44, "cell_3")]
+    
+    def __init__(self, i2c=None, channels: Optional[List[Tuple[int, str]]] = None, bus: str = DEFAULT_BUS):
         """
         Initialize I2C bus and each sensor on its address.
+        
+        Args:
+            i2c: Shared bus object; a new busio.I2C on the default pins if None.
+            channels (Optional[List[Tuple[int, str]]]): (address, cell_id) pairs.
+                                                        Defaults to the three-cell rig.
+            bus (str): Name of the physical bus.
         """
-        self.i2c = busio.I2C(board.SCL, board.SDA)
+        self.i2c = i2c or busio.I2C(board.SCL, board.SDA)
         self.sensors: List[INA219Sensor] = [
-            INA219Sensor(self.i2c, address=0x40, cell_id="cell_1"),
-            INA219Sensor(self.i2c, address=0x41, cell_id="cell_2"),
-            INA219Sensor(self.i2c, address=0x44, cell_id="cell_3")
+            INA219Sensor(self.i2c, address=address, cell_id=cell_id, bus=bus)
+            for address, cell_id in (channels or self.DEFAULT_CHANNELS)
         ]
     
     def read_all(self) -> List[dict]:
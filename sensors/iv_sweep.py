@@ -0,0 +1,292 @@
+import math
+import random
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from time import sleep
+from typing import Any, Dict, List, NamedTuple
+import numpy as np
+from monitoring.metrics import REGISTRY
+
+# Thermal voltage kT/q at 25 °C, in volts
+_THERMAL_VOLTAGE = 0.025693
+
+
+class LoadController(ABC):
+    """
+    Programmable electronic load in series with a cell.
+
+    The load is driven by a normalised level: 0.0 leaves the cell open circuit,
+    1.0 shorts it, and the levels in between move the operating point along the
+    I-V curve. Implementations wrap the actual hardware (a DAC-driven MOSFET, a
+    digital potentiometer, ...) or a simulation.
+    """
+
+    @abstractmethod
+    def set_level(self, level: float) -> None:
+        """
+        Moves the load to a level between 0.0 (open circuit) and 1.0 (short circuit).
+        """
+
+    @abstractmethod
+    def release(self) -> None:
+        """
+        Returns the load to its idle state after a sweep.
+        """
+
+
+class SimulatedCell:
+    """
+    Single-diode model of a DSSC, used to test sweeps without hardware.
+    """
+
+    def __init__(self, isc_ma: float = 5.0, voc: float = 0.7, ideality: float = 2.0, shunt_ohms: float = 2000.0) -> None:
+        """
+        Args:
+            isc_ma (float): Short-circuit current in milliamps.
+            voc (float): Open-circuit voltage in volts.
+            ideality (float): Diode ideality factor.
+            shunt_ohms (float): Shunt resistance in ohms.
+        """
+        self.isc_ma = isc_ma
+        self.voc = voc
+        self.shunt_ohms = shunt_ohms
+        self._n_vt = ideality * _THERMAL_VOLTAGE
+        # Saturation current chosen so that the current is exactly zero at voc
+        self._saturation_ma = (isc_ma - voc / shunt_ohms * 1000) / math.expm1(voc / self._n_vt)
+
+    def current_at(self, voltage: float) -> float:
+        """
+        Returns the cell current in milliamps at a terminal voltage.
+        """
+        return self.isc_ma - self._saturation_ma * math.expm1(voltage / self._n_vt) - voltage / self.shunt_ohms * 1000
+
+
+class SimulatedLoad(LoadController):
+    """
+    Load model that sets the cell's terminal voltage linearly from voc (level 0) to 0 V (level 1).
+    """
+
+    def __init__(self, cell: SimulatedCell) -> None:
+        self.cell = cell
+        self.level = 0.0
+
+    def set_level(self, level: float) -> None:
+        self.level = min(1.0, max(0.0, level))
+
+    def release(self) -> None:
+        self.level = 0.0
+
+    @property
+    def voltage(self) -> float:
+        return self.cell.voc * (1.0 - self.level)
+
+
+class SimulatedINA219:
+    """
+    INA219 stand-in that measures a SimulatedLoad, with optional Gaussian noise.
+    """
+
+    def __init__(self, load: SimulatedLoad, cell_id: str, noise_ma: float = 0.0, seed: int = 0) -> None:
+        """
+        Args:
+            load (SimulatedLoad): Load whose operating point is measured.
+            cell_id (str): Unique ID for the cell.
+            noise_ma (float): Standard deviation of the current noise in milliamps.
+            seed (int): Seed of the noise generator.
+        """
+        self.load = load
+        self.cell_id = cell_id
+        self.noise_ma = noise_ma
+        self._rng = random.Random(seed)
+
+    def read_voltage(self) -> float:
+        return round(self.load.voltage, 3)
+
+    def read_current(self) -> float:
+        current = self.load.cell.current_at(self.load.voltage)
+        if self.noise_ma:
+            current += self._rng.gauss(0.0, self.noise_ma)
+        return round(current, 3)
+
+    def read_power(self) -> float:
+        return round(self.read_voltage() * self.read_current(), 3)
+
+
+class IVChannel(NamedTuple):
+    """
+    A cell's current sensor, its load and the I2C bus the sensor sits on.
+    """
+    cell_id: str
+    sensor: Any
+    load: LoadController
+    bus: str = "i2c-1"
+
+
+class IVSweep(NamedTuple):
+    """
+    One captured I-V curve: voltages (V) and currents (mA) ordered from open to short circuit.
+    """
+    cell_id: str
+    timestamp: str
+    voltage: np.ndarray
+    current: np.ndarray
+
+
+def analyze_iv(voltage: np.ndarray, current: np.ndarray, edge_fraction: float = 0.1) -> Dict[str, float]:
+    """
+    Extracts the figures of merit of an I-V curve with vectorised NumPy fits.
+
+    Isc and Voc come from straight-line fits through the points nearest each axis,
+    so they are interpolated even if the sweep never reached exactly 0 V or 0 mA.
+    The maximum power point is refined with a parabola through the points around
+    the largest measured power.
+
+    Args:
+        voltage (np.ndarray): Terminal voltages in volts.
+        current (np.ndarray): Currents in milliamps, positive when the cell delivers power.
+        edge_fraction (float): Fraction of the points (at least 3) used for the Isc fit.
+
+    Returns:
+        Dict[str, float]: 'voc' (V), 'isc' (mA), 'pmax' (mW), 'vmp' (V), 'imp' (mA) and
+                          'fill_factor'.
+
+    Raises:
+        ValueError: If fewer than five points are given.
+    """
+    order = np.argsort(voltage)
+    v = np.asarray(voltage, dtype=np.float64)[order]
+    i = np.asarray(current, dtype=np.float64)[order]
+    if len(v) < 5:
+        raise ValueError("An I-V curve needs at least five points.")
+    edge = max(3, int(len(v) * edge_fraction))
+
+    # Current at V = 0 from the points with the lowest voltage
+    slope, intercept = np.polyfit(v[:edge], i[:edge], 1)
+    isc = float(intercept)
+
+    # Voltage at I = 0 from the three points with the smallest current magnitude;
+    # the curve bends sharply near Voc, so a wider fit would be biased
+    near_zero = np.argsort(np.abs(i))[:3]
+    slope, intercept = np.polyfit(i[near_zero], v[near_zero], 1)
+    voc = float(intercept)
+
+    power = v * i
+    peak = int(np.argmax(power))
+    window = slice(max(0, peak - 2), min(len(v), peak + 3))
+    vmp, pmax = float(v[peak]), float(power[peak])
+    if window.stop - window.start >= 3:
+        a, b, c = np.polyfit(v[window], power[window], 2)
+        vertex = -b / (2 * a) if a < 0 else vmp
+        if v[window][0] <= vertex <= v[window][-1]:
+            vmp, pmax = float(vertex), float(np.polyval((a, b, c), vertex))
+
+    imp = pmax / vmp if vmp else 0.0
+    return {
+        "voc": voc,
+        "isc": isc,
+        "pmax": pmax,
+        "vmp": vmp,
+        "imp": imp,
+        "fill_factor": pmax / (voc * isc) if voc > 0 and isc > 0 else 0.0,
+    }
+
+
+class IVSweeper:
+    """
+    Captures I-V curves of several cells by stepping their loads.
+
+    Cells are grouped by I2C bus. Within a bus every load is stepped at once and,
+    after one settling delay, each INA219 is read in turn, since transactions on a
+    bus are serialised anyway. Each bus is swept by its own thread, so the duration
+    of a full characterisation is roughly points x (settle + reads on the busiest bus)
+    instead of growing with the total number of cells.
+    """
+
+    def __init__(
+        self,
+        channels: List[IVChannel],
+        points: int = 100,
+        settle_seconds: float = 0.002,
+        samples_per_point: int = 1
+    ) -> None:
+        """
+        Args:
+            channels (List[IVChannel]): Cells to sweep.
+            points (int): Load levels per sweep, from open to short circuit.
+            settle_seconds (float): Delay after stepping the loads before reading.
+            samples_per_point (int): Voltage/current pairs averaged per level.
+        """
+        self.channels = channels
+        self.points = points
+        self.settle_seconds = settle_seconds
+        self.samples_per_point = samples_per_point
+
+    def _sweep_bus(self, channels: List[IVChannel], results: Dict[str, IVSweep]) -> None:
+        voltages = np.zeros((len(channels), self.points), dtype=np.float32)
+        currents = np.zeros((len(channels), self.points), dtype=np.float32)
+        timestamp = datetime.now().isoformat()
+        try:
+            for step, level in enumerate(np.linspace(0.0, 1.0, self.points)):
+                for channel in channels:
+                    channel.load.set_level(float(level))
+                if self.settle_seconds:
+                    sleep(self.settle_seconds)
+                for idx, channel in enumerate(channels):
+                    v_sum = i_sum = 0.0
+                    for _ in range(self.samples_per_point):
+                        v_sum += channel.sensor.read_voltage()
+                        i_sum += channel.sensor.read_current()
+                    voltages[idx, step] = v_sum / self.samples_per_point
+                    currents[idx, step] = i_sum / self.samples_per_point
+        finally:
+            for channel in channels:
+                channel.load.release()
+        for idx, channel in enumerate(channels):
+            results[channel.cell_id] = IVSweep(channel.cell_id, timestamp, voltages[idx], currents[idx])
+
+    def sweep_all(self) -> List[IVSweep]:
+        """
+        Sweeps every cell, one thread per bus.
+
+        Returns:
+            List[IVSweep]: Sweeps in channel order. Cells on a bus that failed are missing.
+        """
+        buses: Dict[str, List[IVChannel]] = defaultdict(list)
+        for channel in self.channels:
+            buses[channel.bus].append(channel)
+
+        results: Dict[str, IVSweep] = {}
+
+        def run(bus: str, channels: List[IVChannel]) -> None:
+            try:
+                with REGISTRY.timer("iv_sweep_seconds", bus=bus):
+                    self._sweep_bus(channels, results)
+            except Exception as err:
+                REGISTRY.counter("iv_sweep_failures_total", bus=bus).inc()
+                print(f"[IVSweeper] Sweep on {bus} failed: {err}")
+
+        threads = [threading.Thread(target=run, args=item, name=f"iv-sweep-{item[0]}") for item in buses.items()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [results[channel.cell_id] for channel in self.channels if channel.cell_id in results]
+
+    def sweep_and_store(self, db) -> List[Dict[str, Any]]:
+        """
+        Sweeps every cell, analyses the curves and stores them.
+
+        Args:
+            db (SensorDatabase): Database with an iv_sweeps table.
+
+        Returns:
+            List[Dict[str, Any]]: Figures of merit per cell, with 'cell_id' and 'timestamp'.
+        """
+        summaries = []
+        for sweep in self.sweep_all():
+            summary = analyze_iv(sweep.voltage, sweep.current)
+            db.insert_iv_sweep(sweep.cell_id, sweep.timestamp, sweep.voltage, sweep.current, summary)
+            summaries.append({"cell_id": sweep.cell_id, "timestamp": sweep.timestamp, **summary})
+        return summaries
@@ -2,6 +2,8 @@ import board
 import busio
 import adafruit_tsl2591
 from adafruit_tsl2591 import TSL2591
+from time import sleep
+from monitoring.metrics import REGISTRY
 
 class TSL2591Sensor:
     """
@@ -20,13 +22,17 @@ class TSL2591Sensor:
     INTEGRATIONTIME_600MS = adafruit_tsl2591.INTEGRATIONTIME_600MS
     
     
-    def __init__(self) -> None:
+    def __init__(self, i2c=None) -> None:
         """
         Initializes the I2C connection and sensor instance.
+        
+        Args:
+            i2c: Shared bus object (or mux channel). A new busio.I2C on the
+                 default pins is created if None.
         """
         
         try:            
-            i2c = busio.I2C(board.SCL, board.SDA)
+            i2c = i2c or busio.I2C(board.SCL, board.SDA)
             self.sensor = TSL2591(i2c)
         except RuntimeError as err:
             raise ConnectionError(f"[ERROR] Failed to initialize TSL2591 sensor over I2C: {err}") from err
@@ -42,12 +48,15 @@ class TSL2591Sensor:
             return self.sensor.lux
         except OverflowError:
             print(f"[TSL2591] OverflowError: Saturation reached. Consider reducing gain.")
+            REGISTRY.counter("tsl2591_overflows_total").inc()
             if retry_on_overflow:
                 self.set_gain(self.GAIN_LOW)
                 self.set_integration_time(self.INTEGRATIONTIME_100MS)
                 sleep(0.1) # Gives sensor time to apply new settings
                 try:
-                    return self.sensor.lux
+                    lux = self.sensor.lux
+                    REGISTRY.counter("tsl2591_overflow_recoveries_total").inc()
+                    return lux
                 except OverflowError:
                     print("[TSL2591] Overflow persisted after gain/integration adjustment.")
             return 0.0
@@ -0,0 +1,295 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from database.backend import StorageBackend
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.query_cache import QueryCache
+from logger.sensor_logger import SensorLogger
+from monitoring.metrics import REGISTRY
+
+
+class RecentReadings:
+    """
+    Bounded in-memory buffer of the newest readings, fed from the acquisition thread.
+
+    Every reading gets a sequence number so stream clients can ask for everything
+    after the last one they saw. Appending only takes a short lock and wakes the
+    waiting clients; it never waits on them.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Args:
+            capacity (int): Number of readings kept for stream clients that fall behind.
+        """
+        self._items: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=capacity)
+        self._latest: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.sequence = 0
+
+    def append(self, table: str, row: Dict[str, Any]) -> None:
+        """
+        Reading listener for SensorLogger.subscribe_readings.
+        """
+        row = dict(row)
+        with self._condition:
+            self.sequence += 1
+            self._items.append((self.sequence, table, row))
+            self._latest[(table, row.get("cell_id"))] = row
+            self._condition.notify_all()
+
+    def latest(self, table: str, cell_id: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the newest reading of a table, or of one cell of cell_output.
+        """
+        with self._condition:
+            if cell_id is not None or table == SensorDatabase.get_sensor_table_name():
+                return self._latest.get((table, cell_id))
+            rows = [row for (entry_table, _), row in self._latest.items() if entry_table == table]
+        return max(rows, key=lambda row: row["timestamp"]) if rows else None
+
+    def since(self, sequence: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Returns the buffered readings with a sequence number above `sequence`.
+        """
+        with self._condition:
+            return [item for item in self._items if item[0] > sequence]
+
+    def wait_since(self, sequence: int, timeout: float) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Blocks until readings newer than `sequence` arrive, the timeout expires or the buffer is closed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.sequence > sequence or self._closed, timeout)
+            return [item for item in self._items if item[0] > sequence]
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        """
+        Wakes every waiting stream client so it can exit.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class DataService:
+    """
+    Local read-only HTTP service for live and historical readings.
+
+    Endpoints (all GET, JSON unless noted):
+        /latest?table=<table>[&cell_id=<id>]        newest reading, from memory when possible
+        /range?table=<table>&start=<iso>&end=<iso>  readings between two timestamps
+        /aggregates?table=<table>&start=<iso>&end=<iso>&bucket=<seconds>[&cell_id=<id>]
+        /stream                                     Server-Sent Events of every new reading
+        /health                                     status and cache statistics
+
+    Database reads run on the request thread through their own read-only connection,
+    so with the database in WAL mode they never block the logger. Range and aggregate
+    results go through a shared QueryCache invalidated by the logger's writes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        logger: Optional[SensorLogger] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        recent_capacity: int = 1024,
+        heartbeat_interval: float = 15.0,
+        backend_factory: Optional[Callable[[], StorageBackend]] = None
+    ) -> None:
+        """
+        Args:
+            db_path (str): SQLite database the logger writes to.
+            logger (Optional[SensorLogger]): Running logger; when given, new readings are
+                                             streamed and kept in memory, and its writes
+                                             invalidate cached results.
+            host (str): Interface to bind; local-only by default.
+            port (int): TCP port to listen on (0 picks a free port).
+            recent_capacity (int): Readings kept in memory for /latest and /stream.
+            heartbeat_interval (float): Seconds between keep-alive comments on idle streams.
+            backend_factory (Optional[Callable[[], StorageBackend]]): Opens the backend each
+                                    request reads from, e.g. a ShardedDatabase. Defaults to a
+                                    read-only SensorDatabase on db_path.
+        """
+        self.db_path = db_path
+        self.backend_factory = backend_factory
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self.recent = RecentReadings(recent_capacity)
+        self.cache = QueryCache()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        if logger is not None:
+            logger.subscribe_readings(self.recent.append)
+            logger.subscribe(self.cache.on_write)
+
+    def _reader(self) -> SensorDataReader:
+        # sqlite3 connections belong to the thread that opened them and every
+        # request runs on a fresh thread, so each request opens its own.
+        if self.backend_factory is not None:
+            return SensorDataReader(backend=self.backend_factory(), cache=self.cache)
+        return SensorDataReader(self.db_path, cache=self.cache, read_only=True)
+
+    def latest(self, table: str, cell_id: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the newest reading, preferring readings logged since the service started.
+
+        Raises:
+            ValueError: If an invalid table name is provided.
+        """
+        SensorDatabase.columns_for(table)
+        row = self.recent.latest(table, cell_id)
+        if row is not None:
+            return row
+        reader = self._reader()
+        try:
+            return reader.get_latest_entry(table, cell_id)
+        finally:
+            reader.close()
+
+    def range(self, table: str, start: str, end: str) -> List[Dict]:
+        """
+        Returns the readings of a table between two ISO timestamps (inclusive).
+        """
+        reader = self._reader()
+        try:
+            return reader.get_data_between(table, start, end)
+        finally:
+            reader.close()
+
+    def aggregates(self, table: str, start: str, end: str, bucket_seconds: int, cell_id: Any = None) -> List[Dict]:
+        """
+        Returns bucketed count/mean/min/max of a table, see SensorDataReader.get_aggregates.
+        """
+        reader = self._reader()
+        try:
+            return reader.get_aggregates(table, start, end, bucket_seconds, cell_id=cell_id)
+        finally:
+            reader.close()
+
+    def start(self) -> int:
+        """
+        Starts serving in a daemon thread.
+
+        Returns:
+            int: The port actually bound.
+        """
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                endpoint = url.path.rstrip("/") or "/"
+                REGISTRY.counter("http_requests_total", endpoint=endpoint).inc()
+                if endpoint == "/stream":
+                    self._stream(params)
+                    return
+
+                started = perf_counter()
+                try:
+                    if endpoint == "/latest":
+                        body = service.latest(params.get("table", SensorDatabase.get_sensor_table_name()),
+                                              params.get("cell_id"))
+                    elif endpoint == "/range":
+                        body = service.range(params["table"], params["start"], params["end"])
+                    elif endpoint == "/aggregates":
+                        body = service.aggregates(params["table"], params["start"], params["end"],
+                                                  int(params.get("bucket", 3600)), params.get("cell_id"))
+                    elif endpoint == "/health":
+                        body = {"status": "ok", "sequence": service.recent.sequence, "cache": service.cache.stats()}
+                    else:
+                        self._send_json(404, {"error": f"Unknown endpoint {endpoint}"})
+                        return
+                except KeyError as err:
+                    self._send_json(400, {"error": f"Missing query parameter {err}"})
+                    return
+                except ValueError as err:
+                    self._send_json(400, {"error": str(err)})
+                    return
+                except Exception as err:
+                    REGISTRY.counter("http_errors_total", endpoint=endpoint).inc()
+                    print(f"[HTTP] Request {self.path} failed: {err}")
+                    self._send_json(500, {"error": "Internal error"})
+                    return
+                self._send_json(200, body)
+                REGISTRY.histogram("http_request_seconds", endpoint=endpoint).observe(perf_counter() - started)
+
+            def _send_json(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, params: Dict[str, str]) -> None:
+                # Resume after Last-Event-ID when the browser reconnects, otherwise
+                # start with readings logged from now on.
+                last_id = self.headers.get("Last-Event-ID") or params.get("since")
+                sequence = int(last_id) if last_id and last_id.isdigit() else service.recent.sequence
+                # Ids from before a service restart are ahead of the new numbering;
+                # waiting for them to come round again would stall the client for hours
+                sequence = min(sequence, service.recent.sequence)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                clients = REGISTRY.gauge("http_stream_clients")
+                clients.inc()
+                try:
+                    while not service.recent.closed:
+                        items = service.recent.wait_since(sequence, service.heartbeat_interval)
+                        if items:
+                            chunk = "".join(
+                                f"id: {seq}\nevent: {table}\ndata: {json.dumps(row)}\n\n" for seq, table, row in items
+                            )
+                            sequence = items[-1][0]
+                        else:
+                            chunk = ": keep-alive\n\n"
+                        self.wfile.write(chunk.encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    clients.dec()
+
+            def log_message(self, format: str, *args) -> None:
+                # Dashboards poll frequently; per-request lines would flood the console
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="data-service", daemon=True)
+        self._thread.start()
+        print(f"[HTTP] Serving sensor data on http://{self.host}:{self.port}/")
+        return self.port
+
+    def stop(self) -> None:
+        """
+        Ends open streams, shuts the server down and waits for its thread.
+        """
+        self.recent.close()
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
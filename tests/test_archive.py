@@ -0,0 +1,205 @@
+"""
+Unit tests for compressed archival blocks and transparent archive reads.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+import numpy as np
+from benchmarks.synthetic import generate_database
+from database.archive import (
+    ArchiveStore, decode_block, decode_floats, decode_timestamps, encode_block, encode_floats, encode_timestamps,
+    decode_verbatim_block, encode_verbatim_block
+)
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+
+CELL_TABLE = SensorDatabase.get_cell_output_table_name()
+SENSOR_TABLE = SensorDatabase.get_sensor_table_name()
+FULL_RANGE = ("2025-06-01T00:00:00", "2025-06-03T23:59:59.999999")
+
+
+class TestArchive(TestCase):
+    """
+    Test suite for the archive codecs and ArchiveStore.
+    """
+
+    def setUp(self):
+        """
+        Create a two-day, two-cell synthetic database.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "archive.db")
+        generate_database(self.db_path, days=2, cells=2, rate_per_minute=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _snapshot(self):
+        reader = SensorDataReader(self.db_path, read_only=True)
+        try:
+            return {
+                "cells": reader.get_data_between(CELL_TABLE, *FULL_RANGE),
+                "sensor": reader.get_data_between(SENSOR_TABLE, *FULL_RANGE),
+                "aggregates": reader.get_aggregates(CELL_TABLE, *FULL_RANGE, 3600),
+                "all": reader.get_all_dssc_data(),
+            }
+        finally:
+            reader.close()
+
+    def _archive(self, before: str, **kwargs):
+        db = SensorDatabase(self.db_path)
+        try:
+            store = ArchiveStore(db, **kwargs)
+            return {table: store.archive(table, before) for table in (SENSOR_TABLE, CELL_TABLE)}
+        finally:
+            db.close_conn()
+
+    def test_codecs_are_lossless(self):
+        """
+        Timestamps and floats, including NaN, signed zero and noise, decode bit for bit.
+        """
+        rng = np.random.default_rng(3)
+        micros = np.cumsum(rng.integers(59_000_000, 61_000_000, 500)) + 1_750_000_000_000_000
+        self.assertTrue(np.array_equal(decode_timestamps(encode_timestamps(micros), len(micros)), micros))
+
+        columns = [
+            rng.normal(size=500),
+            np.round(rng.uniform(0, 1, 500), 3),
+            np.repeat([0.0, -0.0, np.nan, 1.5, np.inf], 100),
+        ]
+        for compression in ("zlib", "lzma"):
+            for column in columns:
+                decoded = decode_floats(encode_floats(column, compression), len(column), compression)
+                self.assertTrue(np.array_equal(np.asarray(decoded).view(np.uint64), column.view(np.uint64)))
+
+    def test_block_rejects_timestamps_that_would_change(self):
+        """
+        Timestamps that would not decode to the identical string are refused.
+        """
+        with self.assertRaises(ValueError):
+            encode_block(["2025-06-01T00:00:00+02:00"], [np.zeros(1)])
+        with self.assertRaises(ValueError):
+            encode_block(["2025-06-01T00:00:00.000000"], [np.zeros(1)])
+
+        timestamps = ["2025-06-01T00:00:00", "2025-06-01T00:00:00.250000", "2025-06-01T00:01:00"]
+        micros, columns = decode_block(encode_block(timestamps, [np.array([1.0, 2.0, 3.0])]))
+        self.assertEqual(micros[1] - micros[0], 250_000)
+        self.assertEqual(columns[0].tolist(), [1.0, 2.0, 3.0])
+
+    def test_reads_are_unchanged_by_archiving(self):
+        """
+        Range queries, aggregates and full-table reads return the same results after archiving.
+        """
+        expected = self._snapshot()
+        totals = self._archive("2025-06-02T12:00:00", block_rows=500)
+
+        self.assertEqual(totals[CELL_TABLE]["rows"], 2 * 36 * 60)
+        self.assertEqual(totals[CELL_TABLE]["blocks"], 2 * 5)
+        self.assertGreater(totals[CELL_TABLE]["raw_bytes"] / totals[CELL_TABLE]["stored_bytes"], 5)
+
+        actual = self._snapshot()
+        self.assertEqual(actual["cells"], expected["cells"])
+        self.assertEqual(actual["sensor"], expected["sensor"])
+        self.assertEqual(sorted(actual["all"], key=lambda row: (row["timestamp"], row["cell_id"])),
+                         sorted(expected["all"], key=lambda row: (row["timestamp"], row["cell_id"])))
+        self.assertEqual(len(actual["aggregates"]), len(expected["aggregates"]))
+        for archived, live in zip(actual["aggregates"], expected["aggregates"]):
+            self.assertEqual(archived["count"], live["count"])
+            self.assertAlmostEqual(archived["power_avg"], live["power_avg"], places=9)
+
+        db = SensorDatabase(self.db_path, read_only=True)
+        remaining = db.conn.execute(f"SELECT MIN(timestamp) FROM {CELL_TABLE};").fetchone()[0]
+        db.close_conn()
+        self.assertEqual(remaining, "2025-06-02T12:00:00")
+
+    def test_partial_ranges_stream_in_order(self):
+        """
+        A range inside archived blocks is clipped exactly and streamed in time order.
+        """
+        self._archive("2025-06-03T00:00:00", compression="lzma")
+        reader = SensorDataReader(self.db_path, read_only=True)
+        rows = list(reader.iter_data_between(CELL_TABLE, "2025-06-01T10:00:30", "2025-06-01T10:05:00"))
+        reader.close()
+
+        self.assertEqual(len(rows), 2 * 5)
+        self.assertEqual(rows[0]["timestamp"], "2025-06-01T10:01:00")
+        self.assertEqual(rows[-1]["timestamp"], "2025-06-01T10:05:00")
+        self.assertEqual([row["timestamp"] for row in rows], sorted(row["timestamp"] for row in rows))
+        self.assertEqual({row["cell_id"] for row in rows}, {"cell_1", "cell_2"})
+
+    def test_blocks_with_foreign_timestamps_are_stored_verbatim(self):
+        """
+        A block the compact encoding refuses is archived verbatim instead of stalling its series.
+        """
+        timestamps, columns = decode_verbatim_block(encode_verbatim_block(["a", "b"], [np.array([1.0, np.nan])]))
+        self.assertEqual(timestamps.tolist(), ["a", "b"])
+        self.assertTrue(np.isnan(columns[0][1]))
+
+        db = SensorDatabase(self.db_path)
+        db.insert_data({"timestamp": "2025-06-01T00:00:30+00:00", "lux": 1.5, "temperature": None, "humidity": 40.0})
+        db.close_conn()
+        expected = self._snapshot()
+        totals = self._archive("2025-06-02T00:00:00", block_rows=500)
+
+        self.assertEqual(totals[SENSOR_TABLE]["rows"], 24 * 60 + 1)
+        actual = self._snapshot()
+        self.assertEqual(actual["sensor"], expected["sensor"])
+        self.assertEqual(actual["sensor"][1]["timestamp"], "2025-06-01T00:00:30+00:00")
+        self.assertIsNone(actual["sensor"][1]["temperature"])
+        self.assertEqual(actual["cells"], expected["cells"])
+
+    def test_late_rows_in_overlapping_blocks_stay_in_order(self):
+        """
+        A late reading archived into its own block inside an older block's range is read back in order.
+        """
+        self._archive("2025-06-02T00:00:00", block_rows=500)
+        db = SensorDatabase(self.db_path)
+        db.insert_data({"timestamp": "2025-06-01T10:00:30", "lux": 1.0, "temperature": 20.0, "humidity": 40.0})
+        db.close_conn()
+        self._archive("2025-06-02T00:00:00", block_rows=500)
+
+        reader = SensorDataReader(self.db_path, read_only=True)
+        rows = reader.get_data_between(SENSOR_TABLE, "2025-06-01T00:00:00", "2025-06-01T23:59:59.999999")
+        stats = reader.archive.stats()
+        reader.close()
+
+        self.assertEqual(stats[SENSOR_TABLE]["blocks"], 4)
+        timestamps = [row["timestamp"] for row in rows]
+        self.assertEqual(len(timestamps), 24 * 60 + 1)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(timestamps[601], "2025-06-01T10:00:30")
+
+    def test_latest_entry_falls_back_to_the_archive(self):
+        """
+        Once every row is archived, the latest reading still comes back, per table and per cell.
+        """
+        reader = SensorDataReader(self.db_path, read_only=True)
+        expected = {
+            "sensor": reader.get_latest_entry(SENSOR_TABLE),
+            "cell_1": reader.get_latest_entry(CELL_TABLE, "cell_1"),
+        }
+        reader.close()
+        self._archive("2025-06-04T00:00:00")
+
+        reader = SensorDataReader(self.db_path, read_only=True)
+        self.assertIsNone(reader.db.fetch_latest(SENSOR_TABLE))
+        self.assertEqual(reader.get_latest_entry(SENSOR_TABLE), expected["sensor"])
+        self.assertEqual(reader.get_latest_entry(CELL_TABLE, "cell_1"), expected["cell_1"])
+        reader.close()
+
+    def test_clear_all_removes_archived_blocks(self):
+        """
+        Wiping the database also removes archived readings.
+        """
+        self._archive("2025-06-02T00:00:00")
+        reader = SensorDataReader(self.db_path)
+        reader.clear_all_data(confirm=False)
+        self.assertEqual(reader.get_data_between(CELL_TABLE, *FULL_RANGE), [])
+        self.assertEqual(reader.archive.stats(), {})
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
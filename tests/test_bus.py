@@ -0,0 +1,223 @@
+"""
+Unit tests for the multi-bus topology and TCA9548A channel proxies.
+"""
+
+import threading
+from time import perf_counter, sleep
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+from main import run_cycle
+from sensors.bus import BusTopology, MuxChannel
+
+
+class FakeI2C:
+    """
+    Records every transaction sent to the bus.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.writes = []
+        self.locked = False
+        self.deinit_called = False
+
+    def try_lock(self) -> bool:
+        if self.locked:
+            return False
+        self.locked = True
+        return True
+
+    def unlock(self) -> None:
+        self.locked = False
+
+    def writeto(self, address, buffer, **kwargs) -> None:
+        self.writes.append((address, bytes(buffer)))
+
+    def readfrom_into(self, address, buffer, **kwargs) -> None:
+        buffer[0] = address
+
+    def scan(self):
+        return [0x40, 0x41, 0x70]
+
+    def deinit(self) -> None:
+        self.deinit_called = True
+
+
+class SlowINA219:
+    """
+    INA219 stand-in whose reads take a fixed time, like a real I2C transaction.
+    """
+
+    def __init__(self, bus: str, delay: float, fail: bool = False) -> None:
+        self.bus = bus
+        self.delay = delay
+        self.fail = fail
+        self.threads = set()
+
+    def _read(self, value: float) -> float:
+        self.threads.add(threading.current_thread().name)
+        sleep(self.delay)
+        if self.fail:
+            raise OSError("Remote I/O error")
+        return value
+
+    def read_voltage(self) -> float:
+        return self._read(0.5)
+
+    def read_current(self) -> float:
+        return self._read(2.0)
+
+    def read_power(self) -> float:
+        return self._read(1.0)
+
+
+class TestBusTopology(TestCase):
+    """
+    Test suite for BusTopology, MuxChannel and multi-bus acquisition cycles.
+    """
+
+    def setUp(self):
+        """
+        Create a topology whose buses are FakeI2C objects.
+        """
+        self.created = []
+
+        def factory(name, scl, sda):
+            self.created.append(FakeI2C(name))
+            return self.created[-1]
+
+        self.topology = BusTopology(bus_factory=factory)
+
+    def tearDown(self):
+        self.topology.close()
+
+    def test_bus_object_is_shared(self):
+        """
+        Every device on a bus receives the same bus object, created once.
+        """
+        first = self.topology.i2c("i2c-1")
+        second = self.topology.i2c("i2c-1")
+        self.topology.i2c("i2c-1", (0x70, 2))
+        self.assertIs(first, second)
+        self.assertEqual([bus.name for bus in self.created], ["i2c-1"])
+        self.assertIs(self.topology.i2c("i2c-1", (0x70, 2)), self.topology.i2c("i2c-1", (0x70, 2)))
+
+    def test_mux_switches_only_when_the_channel_changes(self):
+        """
+        Locking a channel selects it once; other multiplexers on the bus are disabled first.
+        """
+        ch0 = self.topology.i2c("i2c-1", (0x70, 0))
+        ch3 = self.topology.i2c("i2c-1", (0x70, 3))
+        other = self.topology.i2c("i2c-1", (0x71, 1))
+        bus = self.topology.bus("i2c-1").i2c
+
+        for channel in (ch0, ch0, ch3, other, ch3):
+            self.assertTrue(channel.try_lock())
+            channel.unlock()
+
+        self.assertEqual(bus.writes, [
+            (0x70, bytes([0b0001])),
+            (0x70, bytes([0b1000])),
+            (0x70, bytes([0])),
+            (0x71, bytes([0b0010])),
+            (0x71, bytes([0])),
+            (0x70, bytes([0b1000])),
+        ])
+        self.assertEqual(ch3.scan(), [0x40, 0x41])
+        with self.assertRaises(ValueError):
+            MuxChannel(self.topology.bus("i2c-1"), 0x70, 8)
+
+    def test_direct_access_disables_mux_channels(self):
+        """
+        A device wired directly to a bus is read with every multiplexer channel disabled,
+        so it does not collide with a muxed device at the same address.
+        """
+        muxed = self.topology.i2c("i2c-1", (0x70, 0))
+        direct = self.topology.i2c("i2c-1")
+        bus = self.topology.bus("i2c-1").i2c
+
+        for device in (muxed, direct, direct, muxed):
+            self.assertTrue(device.try_lock())
+            buffer = bytearray(1)
+            device.readfrom_into(0x40, buffer)
+            device.unlock()
+
+        self.assertEqual(bus.writes, [
+            (0x70, bytes([0b0001])),
+            (0x70, bytes([0])),
+            (0x70, bytes([0b0001])),
+        ])
+        self.assertEqual(direct.scan(), [0x40, 0x41, 0x70])
+
+    def test_extra_bus_needs_pins(self):
+        """
+        Without a custom factory, a bus other than the default must be declared with its pins.
+        """
+        topology = BusTopology()
+        with self.assertRaises(ValueError):
+            topology.i2c("i2c-3")
+        with self.assertRaises(ValueError):
+            topology.add_bus("i2c-3", scl="D5")
+        self.assertEqual(topology.add_bus("i2c-3", "D5", "D6").name, "i2c-3")
+        self.assertEqual(topology.bus().name, "i2c-1")
+
+    def test_buses_are_read_in_parallel(self):
+        """
+        Reads on different buses overlap while reads on one bus share a single thread.
+        """
+        sensors = [SlowINA219(f"i2c-{idx % 3}", delay=0.05) for idx in range(6)]
+        started = perf_counter()
+        results = self.topology.read_all([
+            (idx, sensor.bus, sensor.read_voltage) for idx, sensor in enumerate(sensors)
+        ])
+        elapsed = perf_counter() - started
+
+        self.assertEqual(results, {idx: 0.5 for idx in range(6)})
+        # Sequentially this takes 6 x 50 ms; three buses of two reads need about 100 ms
+        self.assertLess(elapsed, 0.25)
+        for bus in ("i2c-0", "i2c-1", "i2c-2"):
+            threads = set().union(*(sensor.threads for sensor in sensors if sensor.bus == bus))
+            self.assertEqual(len(threads), 1)
+
+    def test_failures_are_returned_per_read(self):
+        """
+        A failing read is returned as its exception without affecting other reads.
+        """
+        results = self.topology.read_all([
+            ("ok", "i2c-1", lambda: 1),
+            ("bad", "i2c-1", SlowINA219("i2c-1", 0, fail=True).read_voltage),
+            ("other", "i2c-2", lambda: 2),
+        ])
+        self.assertEqual(results["ok"], 1)
+        self.assertEqual(results["other"], 2)
+        self.assertIsInstance(results["bad"], OSError)
+
+    def test_run_cycle_logs_multi_bus_readings_in_order(self):
+        """
+        run_cycle logs every cell in sensor order and skips the one that failed.
+        """
+        logger = MagicMock()
+        dht = MagicMock()
+        dht.read.return_value = (21.0, 40.0)
+        tsl = MagicMock()
+        tsl.read_lux.return_value = 100.0
+        tsl.read_ir.return_value = 10
+        tsl.read_full_spectrum.return_value = 110
+        sensors = [
+            SlowINA219("i2c-1", 0.01),
+            SlowINA219("i2c-3", 0.01, fail=True),
+            SlowINA219("i2c-3", 0.01),
+            SlowINA219("i2c-4", 0.01),
+        ]
+
+        run_cycle(dht, tsl, sensors, logger, self.topology)
+
+        logged = [call.kwargs["cell_id"] for call in logger.log_cell_output.call_args_list]
+        self.assertEqual(logged, ["cell_1", "cell_3", "cell_4"])
+        self.assertEqual(logger.log_cell_output.call_args_list[0].kwargs["data"],
+                         {"voltage": 0.5, "current": 2.0, "power": 1.0})
+        self.assertTrue(all(threading.main_thread().name not in sensor.threads for sensor in sensors))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for the change feed and named consumer checkpoints.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase, main
+from database.backend import FeatureUnavailableError
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from logger.sensor_logger import SensorLogger
+
+
+class TestChangeFeed(TestCase):
+    """
+    Test suite for SensorDataReader.changes_since and its checkpoints.
+    """
+
+    def setUp(self):
+        """
+        Log 25 sensor readings and two cells' output through a spooling logger.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "feed.db")
+        self.logger = SensorLogger(db_path=self.db_path, spool_path=os.path.join(self.tmp_dir, "feed.spool"))
+        for minute in range(25):
+            timestamp = f"2025-06-12T10:{minute:02d}:00"
+            self.logger.log_data(lux=float(minute), temperature=20.0, humidity=50.0, timestamp=timestamp)
+            for cell in ("cell_1", "cell_2"):
+                self.logger.log_cell_output(cell, {"voltage": 0.5, "current": 1.0, "power": 0.5}, timestamp)
+        self.logger.flush()
+        self.reader = SensorDataReader(self.db_path)
+
+    def tearDown(self):
+        """
+        Close connections and remove the scratch directory.
+        """
+        self.reader.close()
+        self.logger.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batches_follow_insertion_order(self):
+        """
+        Paging with the returned cursor reads every row exactly once.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        seen, cursor = [], 0
+        while True:
+            batch, cursor = self.reader.changes_since(table, cursor, limit=10)
+            if not batch:
+                break
+            seen.extend(batch)
+
+        self.assertEqual([row["lux"] for row in seen], [float(minute) for minute in range(25)])
+        self.assertEqual(cursor, seen[-1]["seq"])
+        self.assertEqual(set(seen[0]), {"seq", "timestamp", "lux", "temperature", "humidity"})
+
+        self.logger.log_data(lux=99.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T11:00:00")
+        self.logger.flush()
+        batch, _ = self.reader.changes_since(table, cursor)
+        self.assertEqual([row["lux"] for row in batch], [99.0])
+
+    def test_duplicates_do_not_produce_changes(self):
+        """
+        Replaying readings that already exist leaves the feed unchanged.
+        """
+        table = SensorDatabase.get_cell_output_table_name()
+        _, cursor = self.reader.changes_since(table, 0, limit=1000)
+        self.logger.log_cell_output("cell_1", {"voltage": 0.5, "current": 1.0, "power": 0.5}, "2025-06-12T10:00:00")
+        self.logger.flush()
+        self.assertEqual(self.reader.changes_since(table, cursor), ([], cursor))
+
+    def test_sequence_survives_clear_all(self):
+        """
+        Rows written after a wipe are still newer than any cursor from before it.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        _, cursor = self.reader.changes_since(table, 0, limit=1000)
+        self.reader.clear_all_data(confirm=False)
+        self.logger.log_data(lux=1.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T10:00:00")
+        self.logger.flush()
+
+        batch, next_cursor = self.reader.changes_since(table, cursor)
+        self.assertEqual(len(batch), 1)
+        self.assertGreater(next_cursor, cursor)
+
+    def test_named_checkpoints_are_persisted(self):
+        """
+        A consumer resumes from its committed checkpoint in a new reader.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        batch, cursor = self.reader.read_changes("export", table, limit=20)
+        self.assertEqual(len(batch), 20)
+        self.reader.commit_changes("export", table, cursor)
+        # Not committing means the batch is served again
+        self.assertEqual(len(self.reader.read_changes("dashboard", table, limit=20)[0]), 20)
+
+        reader = SensorDataReader(self.db_path)
+        batch, _ = reader.read_changes("export", table)
+        reader.close()
+        self.assertEqual([row["lux"] for row in batch], [20.0, 21.0, 22.0, 23.0, 24.0])
+
+    def test_other_backends_report_the_feed_as_unavailable(self):
+        """
+        Backends without sequence numbers raise FeatureUnavailableError.
+        """
+        store = ColumnarStore(os.path.join(self.tmp_dir, "columns"))
+        reader = SensorDataReader(backend=store)
+        table = SensorDatabase.get_sensor_table_name()
+        with self.assertRaises(FeatureUnavailableError):
+            reader.changes_since(table)
+        with self.assertRaises(FeatureUnavailableError):
+            reader.read_changes("export", table)
+        with self.assertRaises(FeatureUnavailableError):
+            reader.commit_changes("export", table, 1)
+        store.close_conn()
+
+    def test_legacy_database_is_migrated(self):
+        """
+        A database without a seq column logs at once and is numbered in batches afterwards.
+        """
+        legacy_path = os.path.join(self.tmp_dir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("CREATE TABLE sensor_data (timestamp TEXT PRIMARY KEY, lux REAL, temperature REAL, humidity REAL);")
+        conn.executemany("INSERT INTO sensor_data VALUES (?, ?, ?, ?);",
+                         [(f"2025-06-01T00:0{minute}:00", float(minute), 20.0, 40.0) for minute in range(3)])
+        conn.commit()
+        conn.close()
+
+        db = SensorDatabase(legacy_path)
+        db.insert_data({"timestamp": "2025-06-01T00:05:00", "lux": 5.0, "temperature": 20.0, "humidity": 40.0})
+        with self.assertRaises(FeatureUnavailableError):
+            db.fetch_changes(SensorDatabase.get_sensor_table_name(), 0, 10)
+        self.assertFalse(db.migrate_change_feed(batch_rows=2))
+        self.assertTrue(db.migrate_change_feed(batch_rows=2))
+        db.close_conn()
+
+        reader = SensorDataReader(legacy_path, read_only=True)
+        batch, cursor = reader.changes_since(SensorDatabase.get_sensor_table_name())
+        reader.close()
+        self.assertEqual([(row["seq"], row["lux"]) for row in batch], [(1, 0.0), (2, 1.0), (3, 2.0), (4, 5.0)])
+        self.assertEqual(cursor, 4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Unit tests for the per-sensor circuit breakers.
+"""
+
+from time import perf_counter, sleep
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+from main import run_cycle
+from monitoring.metrics import REGISTRY
+from sensors.circuit_breaker import BreakerRegistry, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """
+    Monotonic clock advanced by hand.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FaultyINA219:
+    """
+    INA219 stand-in that hangs for `delay` seconds and fails while `broken` is set.
+    """
+
+    def __init__(self, broken: bool = False, delay: float = 0.0) -> None:
+        self.broken = broken
+        self.delay = delay
+        self.reads = 0
+
+    def _read(self, value: float) -> float:
+        self.reads += 1
+        if self.broken:
+            sleep(self.delay)
+            raise OSError("Remote I/O error")
+        return value
+
+    def read_voltage(self) -> float:
+        return self._read(0.5)
+
+    def read_current(self) -> float:
+        return self._read(2.0)
+
+    def read_power(self) -> float:
+        return self._read(1.0)
+
+
+def failing():
+    raise OSError("Remote I/O error")
+
+
+class TestCircuitBreaker(TestCase):
+    """
+    Test suite for CircuitBreaker, BreakerRegistry and breaker-guarded acquisition cycles.
+    """
+
+    def setUp(self):
+        """
+        Create a breaker on a fake clock: opens after 3 failures, 60 s doubling to at most 200 s.
+        """
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "test_device", failure_threshold=3, base_backoff=60, max_backoff=200, clock=self.clock
+        )
+
+    def fail(self, times: int = 1) -> None:
+        for _ in range(times):
+            with self.assertRaises(OSError):
+                self.breaker.call(failing)
+
+    def test_opens_after_consecutive_failures_and_skips_reads(self):
+        """
+        The breaker opens on the threshold and then rejects reads without calling them.
+        """
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.call(lambda: 5), 5)
+        self.fail(3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        read = MagicMock(return_value=1)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.call(read)
+        read.assert_not_called()
+        self.assertAlmostEqual(ctx.exception.retry_in, 60)
+        self.assertEqual(self.breaker.snapshot()["skipped"], 1)
+        self.assertEqual(self.breaker.snapshot()["trips"], 1)
+
+    def test_backoff_doubles_up_to_the_maximum(self):
+        """
+        Every failed probe doubles the backoff, capped at max_backoff.
+        """
+        self.fail(3)
+        backoffs = [self.breaker.backoff]
+        for _ in range(3):
+            self.clock.now += self.breaker.backoff
+            self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+            self.fail()
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            backoffs.append(self.breaker.backoff)
+        self.assertEqual(backoffs, [60, 120, 200, 200])
+        self.assertEqual(self.breaker.trips, 1)
+
+    def test_successful_probe_closes_the_breaker(self):
+        """
+        A successful probe closes the breaker and the next failure streak starts from scratch.
+        """
+        self.fail(3)
+        self.clock.now += 60
+        self.assertEqual(self.breaker.call(lambda: 7), 7)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.backoff, 0)
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_state_gauge_reports_the_half_open_probe(self):
+        """
+        sensor_circuit_state reads 2 while open, 1 during a probe and 0 once closed.
+        """
+        gauge = REGISTRY.gauge("sensor_circuit_state", sensor="test_device")
+        self.fail(3)
+        self.assertEqual(gauge.value, 2)
+        self.clock.now += 60
+        during_probe = []
+        self.breaker.call(lambda: during_probe.append(gauge.value))
+        self.assertEqual(during_probe, [1])
+        self.assertEqual(gauge.value, 0)
+
+    def test_none_counts_as_failure_when_configured(self):
+        """
+        Drivers that return None on failure trip a breaker created with none_is_failure.
+        """
+        registry = BreakerRegistry(failure_threshold=2, clock=self.clock)
+        registry.get("dht11", none_is_failure=True)
+        for _ in range(2):
+            self.assertIsNone(registry.call("dht11", lambda: None))
+            self.assertIsNone(registry.call("tsl2591", lambda: None))
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["dht11"]["state"], CircuitBreaker.OPEN)
+        self.assertEqual(snapshot["tsl2591"]["state"], CircuitBreaker.CLOSED)
+        with self.assertRaises(ValueError):
+            CircuitBreaker("bad", failure_threshold=0)
+
+    def test_cycle_time_is_bounded_with_faulty_devices(self):
+        """
+        Once their breakers open, hanging devices are no longer touched and the cycle is fast.
+        """
+        registry = BreakerRegistry(failure_threshold=2, base_backoff=60, clock=self.clock)
+        logger = MagicMock()
+        dht = MagicMock()
+        dht.read.return_value = None
+        tsl = MagicMock()
+        tsl.read_lux.return_value = 100.0
+        sensors = [FaultyINA219(), FaultyINA219(broken=True, delay=0.05), FaultyINA219(broken=True, delay=0.05)]
+
+        for _ in range(2):
+            run_cycle(dht, tsl, sensors, logger, breakers=registry)
+        self.assertEqual(registry.snapshot("ina219_cell_2")["ina219_cell_2"]["state"], CircuitBreaker.OPEN)
+        self.assertEqual(registry.snapshot("dht11")["dht11"]["state"], CircuitBreaker.OPEN)
+
+        reads_before = [sensor.reads for sensor in sensors]
+        dht_reads_before = dht.read.call_count
+        logger.reset_mock()
+        started = perf_counter()
+        run_cycle(dht, tsl, sensors, logger, breakers=registry)
+        elapsed = perf_counter() - started
+
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual([sensor.reads for sensor in sensors], [reads_before[0] + 3, reads_before[1], reads_before[2]])
+        self.assertEqual(dht.read.call_count, dht_reads_before)
+        logged = [call.kwargs["cell_id"] for call in logger.log_cell_output.call_args_list]
+        self.assertEqual(logged, ["cell_1"])
+
+        # After the backoff a repaired device is probed, recovers and is logged again
+        sensors[1].broken = False
+        self.clock.now += 60
+        logger.reset_mock()
+        run_cycle(dht, tsl, sensors, logger, breakers=registry)
+        dht.read.assert_called_with(retries=1)
+        logged = [call.kwargs["cell_id"] for call in logger.log_cell_output.call_args_list]
+        self.assertEqual(logged, ["cell_1", "cell_2"])
+        self.assertEqual(registry.snapshot("ina219_cell_3")["ina219_cell_3"]["backoff_seconds"], 120)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Unit tests for the memory-mapped columnar storage backend.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+import numpy as np
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.timestamps import iso_to_micros
+from logger.sensor_logger import SensorLogger
+
+
+class TestColumnarStore(TestCase):
+    """
+    Test suite for ColumnarStore used through SensorLogger and SensorDataReader.
+    """
+
+    def setUp(self):
+        """
+        Create a store in a scratch directory and log readings across two days.
+        """
+        self.root_path = tempfile.mkdtemp()
+        self.store = ColumnarStore(self.root_path)
+        self.logger = SensorLogger(backend=self.store)
+        self.reader = SensorDataReader(backend=self.store)
+
+        self.timestamps = [
+            "2025-06-12T23:58:00",
+            "2025-06-12T23:59:00",
+            "2025-06-13T00:00:00",
+            "2025-06-13T00:01:00.250000",
+        ]
+        for i, timestamp in enumerate(self.timestamps):
+            self.logger.log_data(lux=100.0 + i, temperature=20.5, humidity=40.0, timestamp=timestamp)
+            for cell in ("cell_1", "cell_2"):
+                self.logger.log_cell_output(
+                    cell_id=cell, data={"voltage": 0.5, "current": 1.25 + i, "power": 0.625}, timestamp=timestamp
+                )
+
+    def tearDown(self):
+        """
+        Close the store and remove its files.
+        """
+        self.store.close_conn()
+        shutil.rmtree(self.root_path)
+
+    def test_rows_are_chunked_per_day(self):
+        """
+        Each series gets one directory per day.
+        """
+        self.assertEqual(self.store._day_dirs(self.store._series_dir(SensorDatabase._SENSOR_TABLE)),
+                         ["2025-06-12", "2025-06-13"])
+
+    def test_get_data_between_spans_days(self):
+        """
+        Range queries cross day boundaries and keep chronological order.
+        """
+        rows = self.reader.get_data_between(SensorDatabase._SENSOR_TABLE, self.timestamps[1], self.timestamps[3])
+        self.assertEqual([row["timestamp"] for row in rows], self.timestamps[1:])
+        self.assertEqual([row["lux"] for row in rows], [101.0, 102.0, 103.0])
+
+        cells = self.reader.get_data_between(SensorDatabase._CELL_OUTPUT_TABLE, self.timestamps[0], self.timestamps[1])
+        self.assertEqual([row["cell_id"] for row in cells], ["cell_1", "cell_2", "cell_1", "cell_2"])
+
+    def test_read_range_within_a_day_is_zero_copy(self):
+        """
+        A single-day range slice is a view of the memory-mapped file.
+        """
+        data = self.store.read_range(
+            SensorDatabase._CELL_OUTPUT_TABLE,
+            iso_to_micros(self.timestamps[2]),
+            iso_to_micros(self.timestamps[3]),
+            cell_id="cell_1",
+        )
+        self.assertIsInstance(data["current"], np.memmap)
+        self.assertEqual(data["current"].dtype, np.float32)
+        np.testing.assert_allclose(data["current"], [3.25, 4.25])
+
+    def test_latest_entry_and_dataframes(self):
+        """
+        The latest entry and DataFrame export work on the columnar backend.
+        """
+        latest = self.reader.get_latest_entry(SensorDatabase._SENSOR_TABLE)
+        self.assertEqual(latest["timestamp"], self.timestamps[-1])
+
+        frames = self.reader.show_all_dataframes(print_dfs=False)
+        self.assertEqual(len(frames["sensor_data"]), 4)
+        self.assertEqual(len(frames["cell_output"]), 8)
+
+    def test_out_of_order_append_is_still_found(self):
+        """
+        Rows appended out of order (e.g. after a clock step back) are still returned sorted.
+        """
+        self.logger.log_data(lux=1.0, temperature=1.0, humidity=1.0, timestamp="2025-06-13T00:00:30")
+        rows = self.reader.get_data_between(SensorDatabase._SENSOR_TABLE, "2025-06-13T00:00:00", "2025-06-13T00:02:00")
+        self.assertEqual([row["lux"] for row in rows], [102.0, 1.0, 103.0])
+
+    def test_rollback_discards_uncommitted_rows_and_duplicates_are_ignored(self):
+        """
+        Uncommitted appends are truncated on rollback; replays skip rows already stored.
+        """
+        record = {"timestamp": "2025-06-13T00:05:00", "lux": 1.0, "temperature": 2.0, "humidity": 3.0}
+        self.store.insert_data_many([record], commit=False)
+        self.store.rollback()
+        self.assertEqual(len(self.reader.get_all_data()), 4)
+
+        replay = [{"timestamp": self.timestamps[-1], "lux": 0.0, "temperature": 0.0, "humidity": 0.0}, record]
+        self.store.insert_data_many(replay, ignore_duplicates=True)
+        self.assertEqual(len(self.reader.get_all_data()), 5)
+
+    def test_rollback_truncates_chunks_closed_on_day_rollover(self):
+        """
+        An uncommitted batch spanning two days is fully undone, including the chunk it left.
+        """
+        batch = [
+            {"timestamp": "2025-06-13T23:59:00", "lux": 1.0, "temperature": 2.0, "humidity": 3.0},
+            {"timestamp": "2025-06-14T00:00:00", "lux": 1.0, "temperature": 2.0, "humidity": 3.0},
+        ]
+        self.store.insert_data_many(batch, commit=False)
+        self.store.rollback()
+        self.assertEqual(len(self.reader.get_all_data()), 4)
+
+    def test_torn_append_is_repaired_when_the_chunk_is_reopened(self):
+        """
+        Value columns left longer than the timestamps by a crash are trimmed before appending.
+        """
+        self.store.close_conn()
+        chunk_dir = os.path.join(self.root_path, SensorDatabase._SENSOR_TABLE, "2025-06-13")
+        for field in ("lux", "temperature", "humidity"):
+            with open(os.path.join(chunk_dir, f"{field}.f32"), "ab") as handle:
+                handle.write(np.float32(99.0).tobytes())
+
+        self.store = ColumnarStore(self.root_path)
+        self.store.insert_data({"timestamp": "2025-06-13T00:02:00", "lux": 1.0, "temperature": 2.0, "humidity": 3.0})
+        rows = self.store.fetch_all(SensorDatabase._SENSOR_TABLE)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1][1:], (1.0, 2.0, 3.0))
+
+    def test_ignore_duplicates_keeps_older_rows_that_are_not_stored(self):
+        """
+        Backfilled rows older than the newest stored one are kept unless their key is stored.
+        """
+        backfill = [
+            {"timestamp": "2025-06-12T23:58:30", "lux": 7.0, "temperature": 0.0, "humidity": 0.0},
+            {"timestamp": self.timestamps[1], "lux": 0.0, "temperature": 0.0, "humidity": 0.0},
+        ]
+        self.store.insert_data_many(backfill, ignore_duplicates=True)
+        rows = self.reader.get_data_between(SensorDatabase._SENSOR_TABLE, "2025-06-12T23:58:00", "2025-06-12T23:59:00")
+        self.assertEqual([row["lux"] for row in rows], [100.0, 7.0, 101.0])
+
+        cells = [{"timestamp": self.timestamps[0], "cell_id": "cell_2", "voltage": 0.0, "current": 0.0, "power": 0.0},
+                 {"timestamp": "2025-06-12T23:00:00", "cell_id": "cell_2", "voltage": 0.1, "current": 0.2, "power": 0.3}]
+        self.store.insert_cell_output_many(cells, ignore_duplicates=True)
+        self.assertEqual(len(self.store.fetch_all(SensorDatabase._CELL_OUTPUT_TABLE)), 9)
+
+
+if __name__ == "__main__":
+    main()
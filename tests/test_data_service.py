@@ -0,0 +1,179 @@
+"""
+Unit tests for the local HTTP/SSE data service.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from unittest import TestCase, main
+from database.sharded import ShardedDatabase
+from logger.sensor_logger import SensorLogger
+from service.data_service import DataService
+
+
+class TestDataService(TestCase):
+    """
+    Test suite for DataService running next to a spooling SensorLogger.
+    """
+
+    def setUp(self):
+        """
+        Seed an hour of readings and start the service on a free port.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "service.db")
+        self.logger = SensorLogger(db_path=self.db_path, spool_path=os.path.join(self.tmp_dir, "service.spool"))
+        for minute in range(60):
+            timestamp = f"2025-06-12T10:{minute:02d}:00"
+            self.logger.log_data(lux=float(minute), temperature=20.0, humidity=50.0, timestamp=timestamp)
+            self.logger.log_cell_output("cell_1", {"voltage": 0.5, "current": float(minute), "power": 1.0}, timestamp)
+        self.logger.flush()
+
+        self.service = DataService(self.db_path, self.logger, port=0, heartbeat_interval=0.2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.port = self.service.start()
+
+    def tearDown(self):
+        """
+        Stop the service, close the logger and remove the scratch directory.
+        """
+        self.service.stop()
+        self.logger.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def _get(self, path: str):
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}{path}", timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_range_and_aggregates_read_committed_history(self):
+        """
+        Range and aggregate queries return the rows already in SQLite.
+        """
+        rows = self._get("/range?table=sensor_data&start=2025-06-12T10:00:00&end=2025-06-12T10:09:00")
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[-1]["lux"], 9.0)
+
+        buckets = self._get(
+            "/aggregates?table=cell_output&start=2025-06-12T10:00:00&end=2025-06-12T10:59:00&bucket=1800&cell_id=cell_1"
+        )
+        self.assertEqual([bucket["count"] for bucket in buckets], [30, 30])
+
+    def test_latest_prefers_readings_not_yet_ingested(self):
+        """
+        A reading still in the spool is already visible on /latest.
+        """
+        self.assertEqual(self._get("/latest?table=sensor_data")["timestamp"], "2025-06-12T10:59:00")
+        self.logger.log_data(lux=123.0, temperature=21.0, humidity=40.0, timestamp="2025-06-12T11:00:00")
+
+        latest = self._get("/latest?table=sensor_data")
+        self.assertEqual(latest["lux"], 123.0)
+        self.assertEqual(self._get("/latest?table=cell_output&cell_id=cell_1")["current"], 59.0)
+
+    def test_latest_per_cell_on_a_sharded_backend(self):
+        """
+        /latest for one cell goes through the backend API, so sharded databases work too.
+        """
+        sharded_path = os.path.join(self.tmp_dir, "sharded.db")
+        db = ShardedDatabase(sharded_path)
+        db.insert_cell_output_many([
+            {"timestamp": timestamp, "cell_id": cell, "voltage": 0.5, "current": current, "power": 1.0}
+            for timestamp, cell, current in (
+                ("2025-05-31T23:00:00", "cell_2", 1.0),
+                ("2025-06-01T01:00:00", "cell_1", 2.0),
+                ("2025-06-01T00:30:00", "cell_2", 3.0),
+            )
+        ])
+        db.close_conn()
+
+        service = DataService(sharded_path, port=0, backend_factory=lambda: ShardedDatabase(sharded_path))
+        with contextlib.redirect_stdout(io.StringIO()):
+            port = service.start()
+        try:
+            url = f"http://127.0.0.1:{port}/latest?table=cell_output&cell_id=cell_2"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                latest = json.loads(response.read())
+        finally:
+            service.stop()
+        self.assertEqual((latest["timestamp"], latest["current"]), ("2025-06-01T00:30:00", 3.0))
+
+    def test_invalid_requests_return_client_errors(self):
+        """
+        Unknown tables and missing parameters are reported as 400, unknown paths as 404.
+        """
+        for path, status in (("/range?table=users&start=a&end=b", 400), ("/range?table=sensor_data", 400),
+                             ("/nothing", 404)):
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                self._get(path)
+            self.assertEqual(raised.exception.code, status)
+
+    def test_stream_delivers_new_readings(self):
+        """
+        /stream pushes each new reading as a Server-Sent Event.
+        """
+        received = []
+        connected = threading.Event()
+
+        def consume() -> None:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/stream", timeout=5) as response:
+                connected.set()
+                for line in response:
+                    if line.startswith(b"data: "):
+                        received.append(json.loads(line[len(b"data: "):]))
+                        if len(received) == 2:
+                            return
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        self.assertTrue(connected.wait(5))
+        self.logger.log_data(lux=1.0, temperature=22.0, humidity=45.0, timestamp="2025-06-12T11:00:00")
+        self.logger.log_cell_output("cell_2", {"voltage": 0.4, "current": 2.0, "power": 0.8}, "2025-06-12T11:00:00")
+        consumer.join(5)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(received[0]["lux"], 1.0)
+        self.assertEqual(received[1]["cell_id"], "cell_2")
+
+    def test_stream_resumes_after_a_service_restart(self):
+        """
+        A Last-Event-ID from before a restart, ahead of the new sequence, still gets new readings.
+        """
+        received = []
+        connected = threading.Event()
+
+        def consume() -> None:
+            request = urllib.request.Request(f"http://127.0.0.1:{self.port}/stream", headers={"Last-Event-ID": "987654"})
+            with urllib.request.urlopen(request, timeout=5) as response:
+                connected.set()
+                for line in response:
+                    if line.startswith(b"data: "):
+                        received.append(json.loads(line[len(b"data: "):]))
+                        return
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        self.assertTrue(connected.wait(5))
+        self.logger.log_data(lux=7.0, temperature=22.0, humidity=45.0, timestamp="2025-06-12T11:00:00")
+        consumer.join(5)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(received[0]["lux"], 7.0)
+
+    def test_cached_windows_are_invalidated_by_ingest(self):
+        """
+        A replayed write refreshes cached ranges that overlap it.
+        """
+        path = "/range?table=sensor_data&start=2025-06-12T10:50:00&end=2025-06-12T11:30:00"
+        self.assertEqual(len(self._get(path)), 10)
+        self.logger.log_data(lux=5.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T11:00:00")
+        self.logger.flush()
+        self.assertEqual(len(self._get(path)), 11)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for I-V sweeps against simulated loads.
+"""
+
+import os
+import shutil
+import tempfile
+from time import perf_counter
+from unittest import TestCase, main
+import numpy as np
+from database.backend import FeatureUnavailableError
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from sensors.iv_sweep import (
+    IVChannel, IVSweeper, SimulatedCell, SimulatedINA219, SimulatedLoad, analyze_iv
+)
+
+
+def _channel(cell_id: str, bus: str, cell: SimulatedCell, noise_ma: float = 0.0) -> IVChannel:
+    load = SimulatedLoad(cell)
+    return IVChannel(cell_id, SimulatedINA219(load, cell_id, noise_ma=noise_ma), load, bus)
+
+
+class TestIVSweep(TestCase):
+    """
+    Test suite for IVSweeper, analyze_iv and sweep storage.
+    """
+
+    def setUp(self):
+        """
+        Create a scratch directory for the database.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_analysis_recovers_the_model_parameters(self):
+        """
+        Voc, Isc and the maximum power point match the single-diode model.
+        """
+        cell = SimulatedCell(isc_ma=5.0, voc=0.7)
+        sweep = IVSweeper([_channel("cell_1", "i2c-1", cell)], points=120, settle_seconds=0).sweep_all()[0]
+        result = analyze_iv(sweep.voltage, sweep.current)
+
+        dense_v = np.linspace(0, 0.7, 20001)
+        dense_p = dense_v * np.array([cell.current_at(v) for v in dense_v])
+        self.assertAlmostEqual(result["voc"], 0.7, places=2)
+        self.assertAlmostEqual(result["isc"], 5.0, places=2)
+        self.assertAlmostEqual(result["pmax"], dense_p.max(), delta=0.01 * dense_p.max())
+        self.assertAlmostEqual(result["vmp"], dense_v[dense_p.argmax()], delta=0.01)
+        self.assertTrue(0.5 < result["fill_factor"] < 0.85)
+
+    def test_noisy_sweep_stays_close(self):
+        """
+        Averaging and fitting keep the figures of merit stable under measurement noise.
+        """
+        cell = SimulatedCell(isc_ma=3.0, voc=0.65)
+        sweeper = IVSweeper([_channel("cell_1", "i2c-1", cell, noise_ma=0.02)], points=100,
+                            settle_seconds=0, samples_per_point=4)
+        result = analyze_iv(*sweeper.sweep_all()[0][2:])
+        self.assertAlmostEqual(result["voc"], 0.65, delta=0.01)
+        self.assertAlmostEqual(result["isc"], 3.0, delta=0.05)
+
+    def test_buses_are_swept_concurrently(self):
+        """
+        Six cells on two buses take about as long as one bus, and loads are released afterwards.
+        """
+        channels = [_channel(f"cell_{idx}", f"i2c-{idx % 2}", SimulatedCell()) for idx in range(1, 7)]
+        sweeper = IVSweeper(channels, points=40, settle_seconds=0.005)
+
+        started = perf_counter()
+        sweeps = sweeper.sweep_all()
+        elapsed = perf_counter() - started
+
+        self.assertEqual([sweep.cell_id for sweep in sweeps], [f"cell_{idx}" for idx in range(1, 7)])
+        # One cell at a time would take 6 x 40 x 5 ms = 1.2 s
+        self.assertLess(elapsed, 0.6)
+        self.assertTrue(all(channel.load.level == 0.0 for channel in channels))
+
+    def test_failing_bus_does_not_stop_the_others(self):
+        """
+        A sensor error on one bus only drops that bus's sweeps.
+        """
+        class BrokenSensor:
+            def read_voltage(self):
+                raise OSError("I2C transaction failed")
+
+        broken = IVChannel("cell_9", BrokenSensor(), SimulatedLoad(SimulatedCell()), "i2c-3")
+        sweeper = IVSweeper([_channel("cell_1", "i2c-1", SimulatedCell()), broken], points=10, settle_seconds=0)
+        sweeps = sweeper.sweep_all()
+        self.assertEqual([sweep.cell_id for sweep in sweeps], ["cell_1"])
+
+    def test_sweeps_are_stored_as_float32_arrays(self):
+        """
+        Stored sweeps round-trip through the database with their figures of merit.
+        """
+        db_path = os.path.join(self.tmp_dir, "iv.db")
+        db = SensorDatabase(db_path)
+        channels = [_channel(f"cell_{idx}", "i2c-1", SimulatedCell(isc_ma=idx)) for idx in (1, 2)]
+        summaries = IVSweeper(channels, points=50, settle_seconds=0).sweep_and_store(db)
+        db.close_conn()
+
+        reader = SensorDataReader(db_path, read_only=True)
+        stored = reader.get_iv_sweeps(cell_id="cell_2")
+        reader.close()
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(stored[0]["voltage"].dtype, np.float32)
+        self.assertEqual(len(stored[0]["current"]), 50)
+        self.assertAlmostEqual(stored[0]["isc"], summaries[1]["isc"])
+        self.assertAlmostEqual(stored[0]["current"][-1], 2.0, places=2)
+
+        store = ColumnarStore(os.path.join(self.tmp_dir, "columns"))
+        with self.assertRaises(FeatureUnavailableError):
+            SensorDataReader(backend=store).get_iv_sweeps()
+        store.close_conn()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for typed DataFrame loading in SensorDataReader.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+import numpy as np
+import pandas as pd
+from database.archive import ArchiveStore
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.quality import QualityValidator
+
+SENSOR = SensorDatabase.get_sensor_table_name()
+CELL = SensorDatabase.get_cell_output_table_name()
+
+
+class TestLoadDataFrame(TestCase):
+    """
+    Test suite for SensorDataReader.load_dataframe.
+    """
+
+    def setUp(self):
+        """
+        Seed five minutes of readings for two cells, inserted newest first.
+        """
+        self.dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.dir, "typed.db")
+        self.db = SensorDatabase(self.db_path)
+        for minute in reversed(range(5)):
+            timestamp = f"2025-06-01T10:0{minute}:00.{minute * 100000:06d}" if minute else "2025-06-01T10:00:00"
+            self.db.insert_data({"timestamp": timestamp, "lux": 10.0 * minute, "temperature": 20.0, "humidity": None})
+            for cell in ("cell_1", "cell_2"):
+                self.db.insert_cell_output(cell, {"voltage": 0.5, "current": float(minute), "power": 0.1 * minute}, timestamp)
+        self.reader = SensorDataReader(self.db_path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.db.close_conn()
+        shutil.rmtree(self.dir)
+
+    def test_long_layout_is_typed_and_ordered(self):
+        """
+        Timestamps are datetime64[ns] in time order, cell_id is categorical and NULLs become NaN.
+        """
+        cells = self.reader.load_dataframe(CELL)
+        self.assertEqual(list(cells.columns), ["timestamp", "cell_id", "voltage", "current", "power", "quality"])
+        self.assertEqual(cells["timestamp"].dtype, np.dtype("datetime64[ns]"))
+        self.assertIsInstance(cells["cell_id"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(cells["cell_id"].cat.categories), ["cell_1", "cell_2"])
+        self.assertTrue(cells["timestamp"].is_monotonic_increasing)
+        self.assertEqual(cells["current"].tolist(), [0.0, 0.0, 1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 4.0])
+        self.assertEqual(cells["timestamp"].iloc[2], pd.Timestamp("2025-06-01T10:01:00.1"))
+
+        sensor = self.reader.load_dataframe(SENSOR, float32=True)
+        self.assertEqual(sensor["lux"].dtype, np.float32)
+        self.assertTrue(sensor["humidity"].isna().all())
+        # Humidity is missing everywhere; rows inserted newest first are not flagged for it,
+        # so an unordered full-table scan and an ordered range query agree
+        self.assertEqual(sensor["quality"].tolist(), [QualityValidator.MISSING] * 5)
+        bounded = self.reader.load_dataframe(SENSOR, "2025-06-01T10:00:00", "2025-06-01T10:04:00.400000")
+        self.assertEqual(bounded["quality"].tolist(), sensor["quality"].tolist())
+
+    def test_projection_and_range(self):
+        """
+        Only the requested columns and the inclusive time range are loaded.
+        """
+        df = self.reader.load_dataframe(CELL, "2025-06-01T10:01:00", "2025-06-01T10:03:00.300000", columns=["power"])
+        self.assertEqual(list(df.columns), ["timestamp", "cell_id", "power", "quality"])
+        self.assertEqual(len(df), 6)
+        with self.assertRaises(ValueError):
+            self.reader.load_dataframe(CELL, columns=["lux"])
+        with self.assertRaises(ValueError):
+            self.reader.load_dataframe("iv_sweeps")
+        empty = self.reader.load_dataframe(SENSOR, "2030-01-01T00:00:00", "2030-01-02T00:00:00")
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty["timestamp"].dtype, np.dtype("datetime64[ns]"))
+
+    def test_wide_layout(self):
+        """
+        The wide layout has a DatetimeIndex, with cells pivoted into (column, cell_id) columns.
+        """
+        sensor = self.reader.load_dataframe(SENSOR, columns=["lux"], layout="wide")
+        self.assertIsInstance(sensor.index, pd.DatetimeIndex)
+        self.assertEqual(list(sensor.columns), ["lux", "quality"])
+
+        cells = self.reader.load_dataframe(CELL, columns=["current", "power"], layout="wide", validate=False)
+        self.assertEqual(cells.shape, (5, 4))
+        self.assertEqual(cells[("current", "cell_2")].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+        with self.assertRaises(ValueError):
+            self.reader.load_dataframe(CELL, layout="tall")
+
+    def test_columnar_backend(self):
+        """
+        Other backends load the same typed frames, open-ended or bounded.
+        """
+        store = ColumnarStore(os.path.join(self.dir, "columns"))
+        store.insert_data_many(self.reader.get_all_data())
+        store.insert_cell_output_many(self.reader.get_all_dssc_data())
+        reader = SensorDataReader(backend=store)
+        try:
+            cells = reader.load_dataframe(CELL)
+            self.assertEqual(cells["current"].tolist(), self.reader.load_dataframe(CELL)["current"].tolist())
+            self.assertEqual(list(cells["cell_id"].cat.categories), ["cell_1", "cell_2"])
+            sensor = reader.load_dataframe(SENSOR, start="2025-06-01T10:02:00", columns=["lux"], layout="wide")
+            self.assertEqual(sensor["lux"].tolist(), [20.0, 30.0, 40.0])
+        finally:
+            store.close_conn()
+
+    def test_matches_untyped_frames_including_archive(self):
+        """
+        Archived rows are merged in, and values match show_all_dataframes.
+        """
+        ArchiveStore(self.db, block_rows=2).archive(CELL, "2025-06-01T10:02:00")
+        typed = self.reader.load_dataframe(CELL, validate=False)
+        untyped = self.reader.show_all_dataframes(print_dfs=False)["cell_output"]
+        untyped = untyped.assign(timestamp=pd.to_datetime(untyped["timestamp"], format="ISO8601"))
+        untyped = untyped.sort_values(["timestamp", "cell_id"], ignore_index=True)
+
+        self.assertEqual(len(typed), 10)
+        pd.testing.assert_frame_equal(
+            typed.astype({"cell_id": object}), untyped, check_dtype=False
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ class TestSensorLogging(TestCase):
         """
         Teardown: Clean up DB file and connections
         """
+        self.logger.close()
         self.db.close_conn()
         if os.path.exists(self.test_db_path):
             os.remove(self.test_db_path)
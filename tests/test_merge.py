@@ -0,0 +1,183 @@
+"""
+Unit tests for the incremental multi-device merge.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import timedelta
+from unittest import TestCase, main
+from benchmarks.synthetic import DEFAULT_START, generate_database, synthetic_sensor_rows
+from database.archive import ArchiveStore
+from database.db import SensorDatabase
+from database.merge import DeviceMerger
+from database.spool import SpoolWriter
+
+
+class TestDeviceMerger(TestCase):
+    """
+    Test suite for DeviceMerger with synthetic device databases and spools.
+    """
+
+    def setUp(self):
+        """
+        Create two devices with identical timestamps and one starting half a day later.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.devices = {name: os.path.join(self.tmp_dir, f"{name}.db") for name in ("pi_a", "pi_b", "pi_c")}
+        generate_database(self.devices["pi_a"], days=1, cells=2, rate_per_minute=1)
+        generate_database(self.devices["pi_b"], days=1, cells=2, rate_per_minute=1)
+        generate_database(self.devices["pi_c"], days=1, cells=3, rate_per_minute=1,
+                          start=DEFAULT_START + timedelta(hours=12))
+        self.merger = DeviceMerger(os.path.join(self.tmp_dir, "central.db"), max_workers=3)
+
+    def tearDown(self):
+        """
+        Close the central database and remove the scratch directory.
+        """
+        self.merger.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def _count(self, table: str, device_id: str) -> int:
+        return self.merger.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE device_id = ?;", (device_id,)).fetchone()[0]
+
+    def test_devices_with_identical_timestamps_are_kept_apart(self):
+        """
+        Every device's rows are copied and tagged, even where timestamps coincide.
+        """
+        results = self.merger.merge(self.devices.items())
+
+        self.assertEqual(results["pi_a"], {"sensor_data": 1440, "cell_output": 2880})
+        self.assertEqual(results["pi_b"], {"sensor_data": 1440, "cell_output": 2880})
+        self.assertEqual(results["pi_c"], {"sensor_data": 1440, "cell_output": 4320})
+        self.assertEqual(self._count("sensor_data", "pi_a"), 1440)
+        self.assertEqual(self.merger.high_water_marks()[("pi_c", "cell_output")], 4320)
+
+    def test_second_run_copies_only_new_rows(self):
+        """
+        After the first run, only rows appended to a device are copied.
+        """
+        self.merger.merge(self.devices.items())
+        generate_database(self.devices["pi_a"], days=1, cells=2, rate_per_minute=1,
+                          start=DEFAULT_START + timedelta(days=1))
+
+        results = self.merger.merge(self.devices.items())
+
+        self.assertEqual(results["pi_a"], {"sensor_data": 1440, "cell_output": 2880})
+        self.assertEqual(results["pi_b"], {"sensor_data": 0, "cell_output": 0})
+        self.assertEqual(self._count("cell_output", "pi_a"), 5760)
+
+    def test_overlapping_and_duplicate_rows_are_ignored(self):
+        """
+        A spool repeating rows already merged from the database only adds the new ones,
+        and rows re-inserted into a wiped device database are not duplicated.
+        """
+        self.merger.merge([("pi_a", self.devices["pi_a"])])
+
+        spool_path = os.path.join(self.tmp_dir, "pi_a.spool")
+        spool = SpoolWriter(spool_path, fsync_policy=SpoolWriter.FSYNC_NEVER)
+        for row in synthetic_sensor_rows(days=1, rate_per_minute=1)[-10:]:
+            spool.append_data(row)
+        spool.append_data({"timestamp": (DEFAULT_START + timedelta(days=2)).isoformat(),
+                           "lux": 1.0, "temperature": 20.0, "humidity": 40.0})
+        spool.close()
+        results = self.merger.merge([("pi_a", spool_path)])
+        self.assertEqual(results["pi_a"]["sensor_data"], 1)
+
+        db = SensorDatabase(self.devices["pi_a"])
+        db.clear_all()
+        db.insert_data_many(synthetic_sensor_rows(days=1, rate_per_minute=1)[:100])
+        db.close_conn()
+        results = self.merger.merge([("pi_a", self.devices["pi_a"])])
+        self.assertEqual(results["pi_a"]["sensor_data"], 0)
+        self.assertEqual(self._count("sensor_data", "pi_a"), 1441)
+        self.assertEqual(self.merger.high_water_marks()[("pi_a", "sensor_data")], 1540)
+
+    def test_spool_truncated_and_regrown_is_merged_again(self):
+        """
+        Records written after the logger truncated the spool are merged, even once
+        the spool has grown past its size at the previous run.
+        """
+        spool_path = os.path.join(self.tmp_dir, "pi_a.spool")
+        rows = synthetic_sensor_rows(days=1, rate_per_minute=1)
+        spool = SpoolWriter(spool_path, fsync_policy=SpoolWriter.FSYNC_NEVER)
+        for row in rows[:3]:
+            spool.append_data(row)
+        spool.close()
+        self.assertEqual(self.merger.merge([("pi_a", spool_path)])["pi_a"]["sensor_data"], 3)
+
+        # The logger flushed and truncated the spool, then buffered more readings than before
+        os.truncate(spool_path, 0)
+        spool = SpoolWriter(spool_path, fsync_policy=SpoolWriter.FSYNC_NEVER)
+        for row in rows[3:8]:
+            spool.append_data(row)
+        spool.close()
+        results = self.merger.merge([("pi_a", spool_path)])
+
+        self.assertEqual(results["pi_a"]["sensor_data"], 5)
+        self.assertEqual(self._count("sensor_data", "pi_a"), 8)
+
+    def test_rows_archived_before_the_merge_are_copied(self):
+        """
+        Rows a device moved into its archive are merged, whether or not an earlier
+        run already copied them from the live table.
+        """
+        self.merger.merge([("pi_b", self.devices["pi_b"])])
+        db = SensorDatabase(self.devices["pi_a"])
+        store = ArchiveStore(db, block_rows=500)
+        cutoff = (DEFAULT_START + timedelta(hours=12)).isoformat()
+        store.archive("sensor_data", cutoff)
+        store.archive("cell_output", cutoff)
+        db.close_conn()
+
+        results = self.merger.merge(self.devices.items())
+        self.assertEqual(results["pi_a"], {"sensor_data": 1440, "cell_output": 2880})
+
+        db = SensorDatabase(self.devices["pi_b"])
+        ArchiveStore(db).archive("sensor_data", cutoff)
+        db.close_conn()
+        results = self.merger.merge([("pi_b", self.devices["pi_b"])])
+        self.assertEqual(results["pi_b"], {"sensor_data": 0, "cell_output": 0})
+        self.assertEqual(self._count("sensor_data", "pi_b"), 1440)
+
+    def test_legacy_database_reset_is_recopied(self):
+        """
+        A device database without a change feed falls back to rowids and is recopied after a wipe.
+        """
+        legacy_path = os.path.join(self.tmp_dir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("CREATE TABLE sensor_data (timestamp TEXT PRIMARY KEY, lux REAL, temperature REAL, humidity REAL);")
+        conn.execute("CREATE TABLE cell_output (timestamp TEXT, cell_id INTEGER, voltage REAL, current REAL, power REAL, "
+                     "PRIMARY KEY (timestamp, cell_id));")
+        conn.executemany("INSERT INTO sensor_data VALUES (?, ?, ?, ?);",
+                         [(f"2025-06-01T00:{minute:02d}:00", 1.0, 20.0, 40.0) for minute in range(50)])
+        conn.commit()
+        self.merger.merge([("pi_old", legacy_path)])
+
+        conn.execute("DELETE FROM sensor_data;")
+        conn.executemany("INSERT INTO sensor_data VALUES (?, ?, ?, ?);",
+                         [(f"2025-06-01T01:{minute:02d}:00", 1.0, 20.0, 40.0) for minute in range(5)])
+        conn.commit()
+        conn.close()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            results = self.merger.merge([("pi_old", legacy_path)])
+        self.assertIn("was reset", output.getvalue())
+        self.assertEqual(results["pi_old"]["sensor_data"], 5)
+        self.assertEqual(self._count("sensor_data", "pi_old"), 55)
+
+    def test_unreadable_device_does_not_block_the_others(self):
+        """
+        A missing device file is reported and skipped.
+        """
+        sources = list(self.devices.items()) + [("pi_gone", os.path.join(self.tmp_dir, "missing.db"))]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            results = self.merger.merge(sources)
+        self.assertIn("Skipping pi_gone", output.getvalue())
+        self.assertEqual(sorted(results), ["pi_a", "pi_b", "pi_c"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the metrics registry and its Prometheus endpoint.
+"""
+
+from time import perf_counter
+from unittest import TestCase, main
+from urllib.request import urlopen
+from monitoring.metrics import MetricsRegistry, SummaryReporter
+from monitoring.server import MetricsServer
+
+
+class TestMetrics(TestCase):
+    """
+    Test suite for counters, histograms, summaries and the metrics server.
+    """
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_timer_records_into_labelled_histogram(self):
+        """
+        Timers with the same name and labels share one histogram.
+        """
+        for _ in range(3):
+            with self.registry.timer("sensor_read_seconds", sensor="dht11"):
+                pass
+        with self.registry.timer("sensor_read_seconds", sensor="tsl2591"):
+            pass
+
+        histograms = self.registry.summary()["histograms"]
+        self.assertEqual(histograms['sensor_read_seconds{sensor="dht11"}']["count"], 3)
+        self.assertEqual(histograms['sensor_read_seconds{sensor="tsl2591"}']["count"], 1)
+
+    def test_prometheus_rendering_has_cumulative_buckets(self):
+        """
+        Bucket lines are cumulative and end with +Inf equal to the count.
+        """
+        histogram = self.registry.histogram("db_commit_seconds")
+        histogram.observe(0.002)
+        histogram.observe(120.0)
+        self.registry.counter("dht11_retries_total").inc(2)
+
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE dht11_retries_total counter", text)
+        self.assertIn("dht11_retries_total 2", text)
+        self.assertIn('db_commit_seconds_bucket{le="0.005"} 1', text)
+        self.assertIn('db_commit_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("db_commit_seconds_count 2", text)
+
+    def test_summary_reporter_respects_interval(self):
+        """
+        The reporter only emits once the interval has elapsed.
+        """
+        reporter = SummaryReporter(self.registry, interval=3600)
+        self.assertIsNone(reporter.maybe_report())
+        reporter.interval = 0
+        self.assertIn("counters", reporter.maybe_report())
+
+    def test_span_overhead_is_a_few_microseconds(self):
+        """
+        An empty timed span stays cheap enough to leave on in production.
+        """
+        iterations = 20000
+        started = perf_counter()
+        for _ in range(iterations):
+            with self.registry.timer("overhead_seconds", stage="test"):
+                pass
+        per_span = (perf_counter() - started) / iterations
+        self.assertLess(per_span, 20e-6)
+
+    def test_server_exposes_metrics_endpoint(self):
+        """
+        The background server returns the Prometheus text on /metrics.
+        """
+        self.registry.counter("acquisition_overruns_total").inc()
+        server = MetricsServer(self.registry, port=0)
+        port = server.start()
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+        finally:
+            server.stop()
+        self.assertIn("acquisition_overruns_total 1", body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for process-pool analytics over day/cell partitions.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_database
+from database.archive import ArchiveStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.partitioned import PartitionedExecutor
+
+
+class TestPartitionedExecutor(TestCase):
+    """
+    Test suite for PartitionedExecutor against the single-threaded reader.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a three-day, two-cell synthetic database shared by all tests.
+        """
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.tmp_dir, "partitioned.db")
+        generate_database(cls.db_path, days=3, cells=2, rate_per_minute=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_partitions_split_by_day_and_cell(self):
+        """
+        cell_output is split per day and cell, sensor_data per day, clipped to the range.
+        """
+        executor = PartitionedExecutor(self.db_path, max_workers=2)
+        partitions = executor.partitions(SensorDatabase.get_cell_output_table_name())
+        self.assertEqual(len(partitions), 6)
+        self.assertEqual([(p.day, p.cell_id) for p in partitions[:2]], [("2025-06-01", "cell_1"), ("2025-06-01", "cell_2")])
+
+        clipped = executor.partitions(SensorDatabase.get_sensor_table_name(), "2025-06-02T12:00:00", "2025-06-03T06:00:00")
+        self.assertEqual([(p.start, p.end) for p in clipped],
+                         [("2025-06-02T12:00:00", "2025-06-02T23:59:59.999999"),
+                          ("2025-06-03T00:00:00", "2025-06-03T06:00:00")])
+
+    def test_aggregates_match_reader_for_any_worker_count(self):
+        """
+        Parallel results equal the single-call aggregation and do not depend on the worker count.
+        """
+        table = SensorDatabase.get_cell_output_table_name()
+        reader = SensorDataReader(self.db_path, read_only=True)
+        expected = reader.get_aggregates(table, "2025-06-01T00:00:00", "2025-06-03T23:59:59", 3600)
+        reader.close()
+
+        serial = PartitionedExecutor(self.db_path, max_workers=1).aggregate(table, 3600)
+        parallel = PartitionedExecutor(self.db_path, max_workers=3).aggregate(table, 3600)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(parallel), len(expected))
+        for want, got in zip(expected, parallel):
+            self.assertEqual((want["bucket_start"], want["cell_id"], want["count"]),
+                             (got["bucket_start"], got["cell_id"], got["count"]))
+            self.assertAlmostEqual(want["power_avg"], got["power_avg"])
+
+        with self.assertRaises(ValueError):
+            PartitionedExecutor(self.db_path).aggregate(table, 7 * 3600)
+
+    def test_exports_match_the_source_rows(self):
+        """
+        The CSV is time-ordered with a single header, and .npz files hold every row.
+        """
+        executor = PartitionedExecutor(self.db_path, max_workers=2)
+        table = SensorDatabase.get_cell_output_table_name()
+        csv_path = os.path.join(self.tmp_dir, "export", "cell_output.csv")
+        self.assertEqual(executor.export_csv(table, csv_path), 3 * 1440 * 2)
+
+        df = pd.read_csv(csv_path)
+        self.assertEqual(list(df.columns), list(SensorDatabase.CELL_COLUMNS))
+        self.assertTrue(df["timestamp"].is_monotonic_increasing)
+        self.assertFalse(os.path.exists(csv_path + ".parts"))
+
+        files = executor.export_columnar(table, os.path.join(self.tmp_dir, "npz"))
+        self.assertEqual(len(files), 6)
+        archive = np.load(os.path.join(self.tmp_dir, "npz", "cell_output_2025-06-02_cell_2.npz"))
+        self.assertEqual(archive["timestamp"].dtype, np.int64)
+        self.assertEqual(len(archive["power"]), 1440)
+        self.assertTrue((archive["cell_id"] == "cell_2").all())
+
+    def test_archived_history_is_included(self):
+        """
+        Partitions, aggregates and exports cover archived blocks exactly as if they were live.
+        """
+        table = SensorDatabase.get_cell_output_table_name()
+        db_path = os.path.join(self.tmp_dir, "archived.db")
+        shutil.copyfile(self.db_path, db_path)
+        before = PartitionedExecutor(db_path, max_workers=1)
+        expected_partitions = before.partitions(table)
+        expected_aggregates = before.aggregate(table, 3600)
+        expected_csv = os.path.join(self.tmp_dir, "archived", "expected.csv")
+        before.export_csv(table, expected_csv)
+
+        db = SensorDatabase(db_path)
+        ArchiveStore(db, block_rows=500).archive(table, "2025-06-02T12:00:00")
+        db.close_conn()
+        executor = PartitionedExecutor(db_path, max_workers=2)
+
+        self.assertEqual(executor.partitions(table), expected_partitions)
+        aggregates = executor.aggregate(table, 3600)
+        self.assertEqual([(row["bucket_start"], row["cell_id"], row["count"]) for row in aggregates],
+                         [(row["bucket_start"], row["cell_id"], row["count"]) for row in expected_aggregates])
+        csv_path = os.path.join(self.tmp_dir, "archived", "cell_output.csv")
+        self.assertEqual(executor.export_csv(table, csv_path), 3 * 1440 * 2)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), pd.read_csv(expected_csv))
+        files = executor.export_columnar(table, os.path.join(self.tmp_dir, "archived", "npz"))
+        self.assertEqual(sum(files.values()), 3 * 1440 * 2)
+
+    def test_efficiency_uses_nearest_light_reading(self):
+        """
+        Efficiency is cell power over incident power, skipping dark readings.
+        """
+        db_path = os.path.join(self.tmp_dir, "efficiency.db")
+        db = SensorDatabase(db_path)
+        db.insert_data_many([
+            {"timestamp": "2025-06-01T12:00:00", "lux": 11600.0, "temperature": 25.0, "humidity": 40.0},
+            {"timestamp": "2025-06-01T13:00:00", "lux": 0.0, "temperature": 25.0, "humidity": 40.0},
+        ])
+        db.insert_cell_output_many([
+            {"timestamp": "2025-06-01T12:00:05", "cell_id": "cell_1", "voltage": 0.5, "current": 2.0, "power": 1.0},
+            {"timestamp": "2025-06-01T13:00:05", "cell_id": "cell_1", "voltage": 0.0, "current": 0.0, "power": 0.0},
+        ])
+        db.close_conn()
+
+        rows = PartitionedExecutor(db_path, max_workers=1).efficiency(area_cm2=1.0, lux_per_w_m2=116.0)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["samples"], rows[0]["illuminated_samples"]), (2, 1))
+        # 100 W/m² on 1 cm² is 10 mW incident; 1 mW out
+        self.assertAlmostEqual(rows[0]["mean_efficiency"], 0.1)
+        self.assertAlmostEqual(rows[0]["energy_wh"], 0.0005)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the signal-triggered profiling hooks.
+"""
+
+import glob
+import os
+import pstats
+import shutil
+import signal
+import sys
+import tempfile
+import tracemalloc
+from time import monotonic
+from unittest import TestCase, main, skipUnless
+from monitoring.profiling import ProfilingHooks
+
+
+def _busy_work() -> int:
+    return sum(i * i for i in range(20000))
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    """
+    Keeps the main thread executing bytecode so pending signal handlers run.
+    """
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        if condition():
+            return True
+        _busy_work()
+    return False
+
+
+@skipUnless(ProfilingHooks.supported(), "requires SIGUSR1/SIGUSR2")
+class TestProfilingHooks(TestCase):
+    """
+    Test suite for ProfilingHooks driven by real signals.
+    """
+
+    def setUp(self):
+        """
+        Install hooks writing to a scratch directory, with short sessions.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.hooks = ProfilingHooks(self.tmp_dir, duration=0.3)
+        self.hooks.install()
+
+    def tearDown(self):
+        self.hooks.uninstall()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_idle_hooks_trace_nothing(self):
+        """
+        Installing the hooks neither sets a profiler nor starts tracemalloc.
+        """
+        self.assertIsNone(sys.getprofile())
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_sigusr1_profiles_for_the_configured_duration(self):
+        """
+        A CPU session started by SIGUSR1 stops by itself and leaves readable stats.
+        """
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertTrue(_wait_for(lambda: self.hooks.cpu_active, 1.0))
+        self.assertTrue(_wait_for(lambda: glob.glob(os.path.join(self.tmp_dir, "cpu-*.txt"))))
+        self.assertFalse(self.hooks.cpu_active)
+
+        (prof,) = glob.glob(os.path.join(self.tmp_dir, "cpu-*.prof"))
+        functions = {name for _, _, name in pstats.Stats(prof).stats}
+        self.assertIn("_busy_work", functions)
+
+    def test_second_signal_ends_a_session_early(self):
+        """
+        Sending the signal twice ends the session before the timer does.
+        """
+        self.hooks.duration = 30.0
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertTrue(_wait_for(lambda: self.hooks.cpu_active, 1.0))
+        _busy_work()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertTrue(_wait_for(lambda: not self.hooks.cpu_active, 1.0))
+        self.assertEqual(len(glob.glob(os.path.join(self.tmp_dir, "cpu-*.prof"))), 1)
+
+    def test_sigusr2_writes_an_allocation_diff(self):
+        """
+        A memory session reports allocations made while it ran and stops tracing afterwards.
+        """
+        retained = []
+        os.kill(os.getpid(), signal.SIGUSR2)
+        self.assertTrue(_wait_for(lambda: self.hooks.memory_active, 1.0))
+        retained.append([bytearray(1024) for _ in range(2000)])
+        self.assertTrue(_wait_for(lambda: glob.glob(os.path.join(self.tmp_dir, "mem-*.txt"))))
+        _wait_for(lambda: not tracemalloc.is_tracing(), 1.0)
+
+        (report,) = glob.glob(os.path.join(self.tmp_dir, "mem-*.txt"))
+        with open(report) as handle:
+            content = handle.read()
+        self.assertIn("test_profiling.py", content)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(len(retained[0]), 2000)
+
+    def test_uninstall_restores_handlers(self):
+        """
+        Uninstalling puts the previous signal handlers back.
+        """
+        self.hooks.uninstall()
+        self.assertEqual(signal.getsignal(signal.SIGUSR1), signal.SIG_DFL)
+        self.assertEqual(signal.getsignal(signal.SIGUSR2), signal.SIG_DFL)
+
+
+if __name__ == "__main__":
+    main()
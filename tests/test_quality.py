@@ -0,0 +1,119 @@
+"""
+Unit tests for vectorized data-quality validation.
+"""
+
+from time import perf_counter
+from unittest import TestCase, main
+import numpy as np
+import pandas as pd
+from database.quality import ColumnRule, QualityValidator
+
+Q = QualityValidator
+
+
+def minutes(*values):
+    return np.array([f"2025-06-01T10:{value:02d}:00" for value in values], dtype="datetime64[ns]")
+
+
+class TestQualityValidator(TestCase):
+    """
+    Test suite for QualityValidator.
+    """
+
+    def setUp(self):
+        """
+        Create a validator with the default rules.
+        """
+        self.validator = QualityValidator()
+
+    def test_range_missing_and_spike(self):
+        """
+        Out-of-range and spike values become NaN and are flagged; steady readings pass.
+        """
+        data = {
+            "timestamp": minutes(0, 1, 2, 3, 4, 5, 6),
+            "lux": np.array([100.0, 120.0, -5.0, 110.0, np.nan, 105.0, 100.0]),
+            "temperature": np.array([21.0, 21.0, 22.0, 45.0, 21.0, 22.0, 21.0]),
+            "humidity": np.array([40.0, 41.0, 40.0, 40.0, 40.0, 140.0, 40.0]),
+        }
+        result = self.validator.validate("sensor_data", data)
+
+        self.assertEqual(result["quality"].tolist(), [0, 0, Q.OUT_OF_RANGE, Q.SPIKE, Q.MISSING, Q.OUT_OF_RANGE, 0])
+        self.assertTrue(np.isnan(result["lux"][2]))
+        self.assertTrue(np.isnan(result["temperature"][3]))
+        self.assertTrue(np.isnan(result["humidity"][5]))
+        self.assertEqual(result["temperature"][2], 22.0)
+        # The input is left untouched
+        self.assertEqual(data["temperature"][3], 45.0)
+
+    def test_overflow_zeros_are_saturated_but_darkness_is_not(self):
+        """
+        A 0.0 lux after bright light is an overflow; a 0.0 after dusk is darkness.
+        """
+        data = {
+            "timestamp": minutes(0, 1, 2, 3, 4, 5, 6),
+            "lux": np.array([40000.0, 0.0, 0.0, 42000.0, 300.0, 0.0, 0.0]),
+        }
+        result = self.validator.validate("sensor_data", data)
+        self.assertEqual(result["quality"].tolist(), [0, Q.SATURATED, Q.SATURATED, 0, 0, 0, 0])
+        self.assertEqual(np.isnan(result["lux"]).tolist(), [False, True, True, False, False, False, False])
+
+    def test_reorder_and_dedupe_per_cell(self):
+        """
+        Rows are sorted back into time order per cell and repeated readings are dropped.
+        """
+        cells = pd.Categorical(["cell_1", "cell_2", "cell_1", "cell_2", "cell_1", "cell_1"])
+        data = {
+            "timestamp": minutes(0, 0, 2, 2, 1, 2),
+            "cell_id": cells,
+            "voltage": np.array([0.5, 0.6, 0.52, 0.62, 0.51, 0.99]),
+        }
+        result = self.validator.validate("cell_output", data)
+
+        self.assertEqual(list(result["cell_id"]), ["cell_1", "cell_2", "cell_1", "cell_1", "cell_2"])
+        self.assertEqual(result["timestamp"].tolist(), minutes(0, 0, 1, 2, 2).tolist())
+        self.assertEqual(result["voltage"].tolist(), [0.5, 0.6, 0.51, 0.52, 0.62])
+        self.assertEqual(result["quality"].tolist(), [0, 0, 0, Q.DUPLICATE, 0])
+
+    def test_spike_windows_stay_within_each_cell(self):
+        """
+        With a spike rule on cells, each cell is filtered against its own history only.
+        """
+        validator = QualityValidator({"cell_output": {"current": ColumnRule(spike_mads=5.0, spike_min_delta=0.5)}})
+        times = np.repeat(minutes(*range(7)), 2)
+        data = {
+            "timestamp": times,
+            "cell_id": np.array(["cell_1", "cell_2"] * 7),
+            "current": np.array([1.0, 10.0] * 7),
+        }
+        data["current"][6] = 5.0
+        result = validator.validate("cell_output", data)
+
+        self.assertEqual(np.flatnonzero(result["quality"]).tolist(), [6])
+        self.assertEqual(Q.describe(result["quality"])["spike"], 1)
+        with self.assertRaises(ValueError):
+            QualityValidator(window=4)
+
+    def test_throughput(self):
+        """
+        A million sensor rows with both spike filters validate in well under a second.
+        """
+        count = 1_000_000
+        rng = np.random.default_rng(1)
+        data = {
+            "timestamp": np.arange(count).astype("datetime64[s]").astype("datetime64[ns]"),
+            "lux": rng.uniform(0, 50000, count),
+            "temperature": 21 + rng.normal(0, 0.5, count),
+            "humidity": 40 + rng.normal(0, 1, count),
+        }
+        self.validator.validate("sensor_data", {key: value[:1000] for key, value in data.items()})
+        started = perf_counter()
+        result = self.validator.validate("sensor_data", data)
+        elapsed = perf_counter() - started
+
+        self.assertEqual(len(result["quality"]), count)
+        self.assertLess(elapsed, 2.0)
+
+
+if __name__ == "__main__":
+    main()
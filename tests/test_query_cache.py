@@ -0,0 +1,159 @@
+"""
+Unit tests for the SensorDataReader query cache and write-aware invalidation.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.query_cache import QueryCache
+from logger.sensor_logger import SensorLogger
+
+
+class TestQueryCache(TestCase):
+    """
+    Test suite for QueryCache used through SensorDataReader and SensorLogger.
+    """
+
+    def setUp(self):
+        """
+        Seed an hour of per-minute readings and wire the cache to the logger.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "cache.db")
+        self.cache = QueryCache()
+        self.logger = SensorLogger(db_path=self.db_path)
+        self.logger.subscribe(self.cache.on_write)
+        self.reader = SensorDataReader(self.db_path, cache=self.cache)
+
+        for minute in range(60):
+            timestamp = f"2025-06-12T10:{minute:02d}:00"
+            self.logger.log_data(lux=float(minute), temperature=20.0, humidity=50.0, timestamp=timestamp)
+            self.logger.log_cell_output("cell_1", {"voltage": 0.5, "current": float(minute), "power": 1.0}, timestamp)
+
+    def tearDown(self):
+        """
+        Close connections and remove the scratch directory.
+        """
+        self.reader.close()
+        self.logger.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_repeated_query_is_served_from_cache(self):
+        """
+        The second identical query is a hit and returns the same object.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        first = self.reader.get_data_between(table, "2025-06-12T10:00:00", "2025-06-12T10:09:00")
+        second = self.reader.get_data_between(table, "2025-06-12T10:00:00", "2025-06-12T10:09:00")
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_only_windows_overlapping_new_data_are_invalidated(self):
+        """
+        A new reading drops the open window and the latest entry but keeps closed windows.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        self.reader.get_data_between(table, "2025-06-12T10:00:00", "2025-06-12T10:09:00")
+        self.reader.get_data_between(table, "2025-06-12T10:50:00", "2025-06-12T11:00:00")
+        self.reader.get_latest_entry(table)
+
+        self.logger.log_data(lux=999.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T10:59:30")
+
+        self.assertEqual(self.cache.stats()["entries"], 1)
+        recent = self.reader.get_data_between(table, "2025-06-12T10:50:00", "2025-06-12T11:00:00")
+        self.assertEqual(recent[-1]["lux"], 999.0)
+        self.assertEqual(self.reader.get_latest_entry(table)["lux"], 999.0)
+
+    def test_cell_writes_do_not_invalidate_sensor_entries(self):
+        """
+        Invalidation is scoped to the table that was written.
+        """
+        self.reader.get_latest_entry(SensorDatabase.get_sensor_table_name())
+        self.logger.log_cell_output("cell_1", {"voltage": 0.5, "current": 1.0, "power": 1.0}, "2025-06-12T11:00:00")
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+    def test_result_loaded_across_an_invalidation_is_not_cached(self):
+        """
+        A write landing while a query runs keeps the query's possibly stale result out of the cache.
+        """
+        table = SensorDatabase.get_sensor_table_name()
+        rows_between = self.reader._rows_between
+
+        def write_during_load(*args):
+            rows = rows_between(*args)
+            self.logger.log_data(lux=999.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T10:59:30")
+            return rows
+
+        self.reader._rows_between = write_during_load
+        stale = self.reader.get_data_between(table, "2025-06-12T10:50:00", "2025-06-12T11:00:00")
+        self.reader._rows_between = rows_between
+
+        self.assertEqual(len(stale), 10)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        fresh = self.reader.get_data_between(table, "2025-06-12T10:50:00", "2025-06-12T11:00:00")
+        self.assertEqual(fresh[-1]["lux"], 999.0)
+
+    def test_aggregates_match_between_sqlite_and_pandas_paths(self):
+        """
+        Bucketed aggregates agree between the SQL and the backend-agnostic implementation.
+        """
+        store = ColumnarStore(os.path.join(self.tmp_dir, "columns"))
+        rows = self.reader.get_all_dssc_data()
+        store.insert_cell_output_many(rows)
+        columnar_reader = SensorDataReader(backend=store)
+
+        table = SensorDatabase.get_cell_output_table_name()
+        sql = self.reader.get_aggregates(table, "2025-06-12T10:00:00", "2025-06-12T10:59:00", 600, cell_id="cell_1")
+        frame = columnar_reader.get_aggregates(table, "2025-06-12T10:00:00", "2025-06-12T10:59:00", 600, cell_id="cell_1")
+        columnar_reader.close()
+
+        self.assertEqual(len(sql), 6)
+        self.assertEqual(sql[0]["bucket_start"], "2025-06-12T10:00:00")
+        self.assertEqual(sql[0]["count"], 10)
+        self.assertAlmostEqual(sql[0]["current_avg"], 4.5)
+        self.assertEqual(sql[0]["current_max"], 9.0)
+        for expected, actual in zip(sql, frame):
+            self.assertEqual(expected["bucket_start"], actual["bucket_start"])
+            self.assertEqual(expected["count"], actual["count"])
+            self.assertAlmostEqual(expected["current_avg"], actual["current_avg"], places=5)
+
+    def test_spooled_writes_invalidate_when_replayed(self):
+        """
+        With a spool, invalidation happens when readings reach SQLite.
+        """
+        spool_logger = SensorLogger(db_path=self.db_path, spool_path=os.path.join(self.tmp_dir, "cache.spool"))
+        spool_logger.subscribe(self.cache.on_write)
+        table = SensorDatabase.get_sensor_table_name()
+
+        self.reader.get_latest_entry(table)
+        spool_logger.log_data(lux=5.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T12:00:00")
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+        spool_logger.flush()
+        self.assertEqual(self.reader.get_latest_entry(table)["timestamp"], "2025-06-12T12:00:00")
+        spool_logger.close()
+
+    def test_lru_eviction_respects_entry_and_byte_limits(self):
+        """
+        Least recently used entries are evicted first and oversized results are not cached.
+        """
+        cache = QueryCache(max_entries=2, max_bytes=10_000)
+        cache.put("a", [1], "sensor_data", "2025")
+        cache.put("b", [2], "sensor_data", "2025")
+        cache.get("a")
+        cache.put("c", [3], "sensor_data", "2025")
+        self.assertTrue(cache.get("a")[0])
+        self.assertFalse(cache.get("b")[0])
+
+        cache.put("big", list(range(100_000)), "sensor_data", "2025")
+        self.assertFalse(cache.get("big")[0])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Unit tests for the replay engine and the logger's virtual clock.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import TestCase, main
+from database.columnar import ColumnarStore
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from logger.replay import ReplayEngine, VirtualClock, csv_events, reader_events
+from logger.sensor_logger import SensorLogger
+
+SENSOR = SensorDatabase.get_sensor_table_name()
+CELL = SensorDatabase.get_cell_output_table_name()
+
+
+class FakeTime:
+    """
+    Wall clock that only moves when something sleeps.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def timer(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestReplay(TestCase):
+    """
+    Test suite for ReplayEngine, its event sources and VirtualClock.
+    """
+
+    def setUp(self):
+        """
+        Create a source database with ten minutes of sensor and two-cell readings.
+        """
+        self.dir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.dir, "source.db")
+        db = SensorDatabase(self.source_path)
+        db.insert_data_many([
+            {"timestamp": f"2025-06-01T10:{minute:02d}:00", "lux": 100.0 + minute, "temperature": 21.0, "humidity": 40.0}
+            for minute in range(10)
+        ])
+        db.insert_cell_output_many([
+            {"timestamp": f"2025-06-01T10:{minute:02d}:00", "cell_id": f"cell_{cell}",
+             "voltage": 0.5, "current": 1.0 + cell, "power": 0.5 * (1.0 + cell)}
+            for minute in range(10) for cell in (1, 2)
+        ])
+        db.close_conn()
+        self.source = SensorDataReader(self.source_path, read_only=True)
+
+    def tearDown(self):
+        self.source.close()
+        shutil.rmtree(self.dir)
+
+    def scratch(self, name: str = "scratch", spool: bool = True):
+        """
+        Returns a VirtualClock and a logger on a scratch database that uses it.
+        """
+        clock = VirtualClock()
+        spool_path = os.path.join(self.dir, f"{name}.spool") if spool else None
+        logger = SensorLogger(db_path=os.path.join(self.dir, f"{name}.db"), spool_path=spool_path, clock=clock)
+        return clock, logger
+
+    def test_fast_replay_reproduces_the_history(self):
+        """
+        An unpaced replay through the spool writes the same rows with their original timestamps.
+        """
+        clock, logger = self.scratch()
+        stats = ReplayEngine(logger, clock, flush_every=7).run(reader_events(self.source))
+        logger.close()
+
+        self.assertEqual(stats["rows"], {SENSOR: 10, CELL: 20})
+        self.assertEqual(stats["virtual_seconds"], 540)
+        replayed = SensorDataReader(os.path.join(self.dir, "scratch.db"), read_only=True)
+        try:
+            self.assertEqual(replayed.get_all_data(), self.source.get_all_data())
+            self.assertEqual(
+                sorted(replayed.get_all_dssc_data(), key=lambda row: (row["timestamp"], row["cell_id"])),
+                sorted(self.source.get_all_dssc_data(), key=lambda row: (row["timestamp"], row["cell_id"])),
+            )
+        finally:
+            replayed.close()
+
+    def test_replays_from_a_columnar_source(self):
+        """
+        Open-ended replays also work on backends that parse the range bounds.
+        """
+        store = ColumnarStore(os.path.join(self.dir, "columns"))
+        store.insert_data_many(self.source.get_all_data())
+        store.insert_cell_output_many(self.source.get_all_dssc_data())
+        clock, logger = self.scratch(spool=False)
+        stats = ReplayEngine(logger, clock).run(reader_events(SensorDataReader(backend=store)))
+        logger.close()
+        store.close_conn()
+
+        self.assertEqual(stats["rows"], {SENSOR: 10, CELL: 20})
+        self.assertEqual(clock(), datetime(2025, 6, 1, 10, 9))
+
+    def test_listeners_see_virtual_time(self):
+        """
+        Readings logged without a timestamp are stamped by the logger's clock, in time order.
+        """
+        clock, logger = self.scratch(spool=False)
+        seen = []
+        logger.subscribe_readings(lambda table, row: seen.append((table, row["timestamp"])))
+        ReplayEngine(logger, clock).run(reader_events(self.source, "2025-06-01T10:02:00", "2025-06-01T10:03:00"))
+        logger.close()
+
+        self.assertEqual(seen, [
+            (SENSOR, "2025-06-01T10:02:00"), (CELL, "2025-06-01T10:02:00"), (CELL, "2025-06-01T10:02:00"),
+            (SENSOR, "2025-06-01T10:03:00"), (CELL, "2025-06-01T10:03:00"), (CELL, "2025-06-01T10:03:00"),
+        ])
+        self.assertEqual(clock(), datetime(2025, 6, 1, 10, 3))
+
+    def test_scaled_replay_paces_rows(self):
+        """
+        At 60x, rows one minute apart are replayed one wall-clock second apart; max_gap caps pauses.
+        """
+        fake = FakeTime()
+        clock, logger = self.scratch(spool=False)
+        events = list(reader_events(self.source, "2025-06-01T10:00:00", "2025-06-01T10:02:00"))
+        ReplayEngine(logger, clock, speed=60, sleep_fn=fake.sleep, timer=fake.timer).run(events)
+        self.assertEqual([round(delay, 6) for delay in fake.sleeps], [1.0, 1.0])
+
+        logger.close()
+
+        fake = FakeTime()
+        clock, logger = self.scratch("capped", spool=False)
+        stats = ReplayEngine(logger, clock, speed=60, max_gap=30, sleep_fn=fake.sleep, timer=fake.timer).run(events)
+        logger.close()
+        self.assertEqual([round(delay, 6) for delay in fake.sleeps], [0.5, 0.5])
+        self.assertEqual(stats["speedup"], 120.0)
+
+    def test_csv_export_replays(self):
+        """
+        CSV exports replay like the database they were exported from.
+        """
+        sensor_file = os.path.join(self.dir, "export", "sensor_data.csv")
+        cell_file = os.path.join(self.dir, "export", "cell_output.csv")
+        self.source.export_to_csv(sensor_file, cell_file, confirm=False)
+
+        clock, logger = self.scratch()
+        stats = ReplayEngine(logger, clock).run(csv_events(sensor_file, cell_file))
+        logger.close()
+
+        self.assertEqual(stats["rows"], {SENSOR: 10, CELL: 20})
+        replayed = SensorDataReader(os.path.join(self.dir, "scratch.db"), read_only=True)
+        try:
+            self.assertEqual(replayed.get_all_data(), self.source.get_all_data())
+        finally:
+            replayed.close()
+
+    def test_invalid_settings_are_rejected(self):
+        """
+        The engine needs a positive speed and a logger stamped by the replay clock.
+        """
+        clock, logger = self.scratch(spool=False)
+        try:
+            with self.assertRaises(ValueError):
+                ReplayEngine(logger, clock, speed=0)
+            with self.assertRaises(ValueError):
+                ReplayEngine(logger, VirtualClock())
+        finally:
+            logger.close()
+        live = SensorLogger(db_path=os.path.join(self.dir, "live.db"))
+        self.assertEqual(live.clock, datetime.now)
+        live.close()
+
+
+if __name__ == "__main__":
+    main()
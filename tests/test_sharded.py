@@ -0,0 +1,129 @@
+"""
+Unit tests for the monthly sharded SQLite backend.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase, main
+from database.data_access import SensorDataReader
+from database.db import SensorDatabase
+from database.sharded import ShardedDatabase
+
+CELL_TABLE = SensorDatabase.get_cell_output_table_name()
+SENSOR_TABLE = SensorDatabase.get_sensor_table_name()
+
+
+def _cell_rows(start: datetime, days: int, step_hours: int = 6):
+    rows = []
+    for step in range(days * 24 // step_hours):
+        timestamp = (start + timedelta(hours=step * step_hours)).isoformat()
+        for cell in (1, 2):
+            rows.append({"timestamp": timestamp, "cell_id": f"cell_{cell}",
+                         "voltage": 0.5 + step / 1000, "current": float(cell), "power": 0.5 * cell})
+    return rows
+
+
+class TestShardedDatabase(TestCase):
+    """
+    Test suite for ShardedDatabase writes, rollover and federated reads.
+    """
+
+    def setUp(self):
+        """
+        Create a scratch directory for the shards.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "sensor_data.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_writes_roll_over_to_a_new_file_per_month(self):
+        """
+        Readings land in the shard of their month and finished shards are closed cleanly.
+        """
+        db = ShardedDatabase(self.db_path)
+        db.insert_cell_output_many(_cell_rows(datetime(2025, 5, 30), days=4))
+        db.insert_data({"timestamp": "2025-07-01T00:00:00", "lux": 1.0, "temperature": 20.0, "humidity": 40.0})
+
+        self.assertEqual(db.shard_months(), ["2025-05", "2025-06", "2025-07"])
+        self.assertEqual(os.path.basename(db.shard_path("2025-06")), "sensor_data_2025-06.db")
+        # Closed shards are self-contained files without a write-ahead log
+        self.assertFalse(os.path.exists(db.shard_path("2025-05") + "-wal"))
+        self.assertFalse(os.path.exists(db.shard_path("2025-06") + "-wal"))
+
+        may = SensorDatabase(db.shard_path("2025-05"), read_only=True)
+        self.assertEqual(may.conn.execute(f"SELECT COUNT(*) FROM {CELL_TABLE};").fetchone()[0], 2 * 4 * 2)
+        may.close_conn()
+        db.close_conn()
+
+    def test_federated_reads_match_a_single_database(self):
+        """
+        Range, full and latest reads across shards equal the unsharded database.
+        """
+        rows = _cell_rows(datetime(2025, 1, 25), days=100)
+        sharded = ShardedDatabase(self.db_path)
+        single = SensorDatabase(os.path.join(self.tmp_dir, "single.db"))
+        for offset in range(0, len(rows), 97):
+            sharded.insert_cell_output_many(rows[offset:offset + 97])
+            single.insert_cell_output_many(rows[offset:offset + 97])
+
+        start, end = "2025-02-20T00:00:00", "2025-04-10T12:00:00"
+        self.assertEqual(sharded.fetch_between(CELL_TABLE, start, end), single.fetch_between(CELL_TABLE, start, end))
+        self.assertEqual(sorted(sharded.fetch_all(CELL_TABLE)), sorted(single.fetch_all(CELL_TABLE)))
+        self.assertEqual(sharded.fetch_latest(CELL_TABLE)[0], single.fetch_latest(CELL_TABLE)[0])
+        self.assertIsNone(sharded.fetch_latest(SENSOR_TABLE))
+        sharded.close_conn()
+        single.close_conn()
+
+    def test_only_overlapping_shards_are_opened(self):
+        """
+        A damaged shard outside the requested range does not affect the query.
+        """
+        db = ShardedDatabase(self.db_path)
+        db.insert_cell_output_many(_cell_rows(datetime(2025, 3, 1), days=61))
+        db.close_conn()
+        with open(db.shard_path("2025-03"), "wb") as handle:
+            handle.write(b"not a database")
+
+        rows = db.fetch_between(CELL_TABLE, "2025-04-01T00:00:00", "2025-04-30T23:59:59")
+        self.assertEqual(len(rows), 30 * 4 * 2)
+        db.close_conn()
+
+    def test_more_shards_than_sqlite_can_attach(self):
+        """
+        Queries spanning more than ten months are split into batches and stay in time order.
+        """
+        db = ShardedDatabase(self.db_path)
+        rows = _cell_rows(datetime(2024, 1, 1), days=420, step_hours=24)
+        db.insert_cell_output_many(rows)
+        self.assertEqual(len(db.shard_months()), 14)
+
+        fetched = db.fetch_between(CELL_TABLE, "2024-01-01T00:00:00", "2025-12-31T00:00:00")
+        self.assertEqual(len(fetched), len(rows))
+        self.assertEqual([row[0] for row in fetched], sorted(row[0] for row in fetched))
+        db.close_conn()
+
+    def test_reader_works_on_top_of_shards(self):
+        """
+        SensorDataReader queries and aggregates transparently across shards.
+        """
+        writer = ShardedDatabase(self.db_path)
+        writer.insert_cell_output_many(_cell_rows(datetime(2025, 5, 31), days=2))
+        writer.close_conn()
+
+        reader = SensorDataReader(backend=ShardedDatabase(self.db_path))
+        rows = reader.get_data_between(CELL_TABLE, "2025-05-31T12:00:00", "2025-06-01T06:00:00")
+        self.assertEqual([row["timestamp"] for row in rows[::2]],
+                         ["2025-05-31T12:00:00", "2025-05-31T18:00:00", "2025-06-01T00:00:00", "2025-06-01T06:00:00"])
+        aggregates = reader.get_aggregates(CELL_TABLE, "2025-05-31T00:00:00", "2025-06-01T23:59:59", 86400, "cell_2")
+        self.assertEqual([(entry["bucket_start"], entry["count"]) for entry in aggregates],
+                         [("2025-05-31T00:00:00", 4), ("2025-06-01T00:00:00", 4)])
+        self.assertEqual(reader.get_latest_entry(CELL_TABLE)["timestamp"], "2025-06-01T18:00:00")
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
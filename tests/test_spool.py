@@ -0,0 +1,183 @@
+"""
+Unit tests for the append-only spool and its replayer, including simulated crashes.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from unittest import TestCase, main
+from unittest.mock import patch
+from database.db import SensorDatabase
+from database.spool import SpoolWriter, SpoolReplayer
+from logger.sensor_logger import SensorLogger
+
+
+class TestSpool(TestCase):
+    """
+    Test suite for SpoolWriter, SpoolReplayer, and spooled SensorLogger writes.
+    """
+
+    def setUp(self):
+        """
+        Create a scratch directory holding the spool, checkpoint and database.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.spool_path = os.path.join(self.tmp_dir, "sensor_data.spool")
+        self.db_path = os.path.join(self.tmp_dir, "sensor_data.db")
+        self.db = SensorDatabase(db_path=self.db_path)
+
+    def tearDown(self):
+        """
+        Close connections and remove the scratch directory.
+        """
+        self.db.close_conn()
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_records(self, count: int) -> None:
+        writer = SpoolWriter(self.spool_path, fsync_policy=SpoolWriter.FSYNC_NEVER)
+        for i in range(count):
+            timestamp = f"2025-06-12T10:{i // 60:02d}:{i % 60:02d}"
+            writer.append_data({"timestamp": timestamp, "lux": 100.0 + i, "temperature": 22.5, "humidity": 40.0})
+            writer.append_cell_output("cell_1", {"voltage": 0.5, "current": 1.25, "power": 0.625}, timestamp)
+        writer.close()
+
+    def _count(self, table: str) -> int:
+        return self.db.conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+
+    def test_pack_unpack_round_trip(self):
+        """
+        A packed record decodes back to the same values, including None fields.
+        """
+        record = SpoolWriter.pack(
+            SpoolWriter.KIND_CELL, "2025-06-12T10:00:00.123456", (0.5, None, 1.5), cell_id="cell_2"
+        )
+        self.assertEqual(len(record), SpoolWriter.RECORD_SIZE)
+
+        row = SpoolWriter.unpack(record)
+        self.assertEqual(row["timestamp"], "2025-06-12T10:00:00.123456")
+        self.assertEqual(row["cell_id"], "cell_2")
+        self.assertEqual(row["voltage"], 0.5)
+        self.assertIsNone(row["current"])
+        self.assertEqual(row["power"], 1.5)
+
+    def test_corrupt_record_is_rejected(self):
+        """
+        A record with a flipped byte fails its checksum.
+        """
+        record = bytearray(SpoolWriter.pack(SpoolWriter.KIND_SENSOR, "2025-06-12T10:00:00", (1.0, 2.0, 3.0)))
+        record[20] ^= 0xFF
+        self.assertIsNone(SpoolWriter.unpack(bytes(record)))
+
+    def test_replay_ingests_in_batches_and_resumes(self):
+        """
+        Replay ingests every record and a second replay finds nothing new.
+        """
+        self._write_records(120)
+        replayer = SpoolReplayer(self.spool_path, self.db, batch_size=50)
+
+        self.assertEqual(replayer.replay(), 240)
+        self.assertEqual(self._count(SensorDatabase.get_sensor_table_name()), 120)
+        self.assertEqual(self._count(SensorDatabase.get_cell_output_table_name()), 120)
+        self.assertEqual(replayer.replay(), 0)
+
+    def test_short_writes_are_completed(self):
+        """
+        Records accepted a few bytes at a time by write() are still written whole.
+        """
+        real_write = os.write
+        with patch("database.spool.os.write", side_effect=lambda fd, data: real_write(fd, bytes(data[:7]))):
+            self._write_records(3)
+
+        self.assertEqual(os.path.getsize(self.spool_path), 6 * SpoolWriter.RECORD_SIZE)
+        self.assertEqual(SpoolReplayer(self.spool_path, self.db).replay(), 6)
+        self.assertEqual(self._count(SensorDatabase.get_sensor_table_name()), 3)
+
+    def test_torn_tail_is_ignored_then_discarded(self):
+        """
+        Simulated kill mid-write: half a record at the tail is neither ingested nor kept.
+        """
+        self._write_records(10)
+        partial = SpoolWriter.pack(SpoolWriter.KIND_SENSOR, "2025-06-12T11:00:00", (1.0, 2.0, 3.0))
+        with open(self.spool_path, "ab") as handle:
+            handle.write(partial[: SpoolWriter.RECORD_SIZE // 2])
+
+        replayer = SpoolReplayer(self.spool_path, self.db)
+        self.assertEqual(replayer.replay(), 20)
+
+        SpoolWriter(self.spool_path).close()
+        self.assertEqual(os.path.getsize(self.spool_path) % SpoolWriter.RECORD_SIZE, 0)
+
+    def test_crash_before_checkpoint_does_not_duplicate(self):
+        """
+        Simulated crash after commit but before the checkpoint write: replay is idempotent.
+        """
+        self._write_records(30)
+        replayer = SpoolReplayer(self.spool_path, self.db, batch_size=1000)
+
+        with patch.object(SpoolReplayer, "save_checkpoint", side_effect=OSError("power lost")):
+            with self.assertRaises(OSError):
+                replayer.replay()
+
+        self.assertEqual(replayer.load_checkpoint(), 0)
+        self.assertEqual(replayer.replay(), 60)
+        self.assertEqual(self._count(SensorDatabase.get_sensor_table_name()), 30)
+
+    def test_locked_database_keeps_readings_spooled(self):
+        """
+        SensorLogger.flush defers ingestion while the DB is locked and loses nothing.
+        """
+        logger = SensorLogger(db_path=self.db_path, spool_path=self.spool_path)
+        logger.db.conn.execute("PRAGMA busy_timeout = 0;")
+        logger.log_data(lux=1.0, temperature=20.0, humidity=50.0, timestamp="2025-06-12T10:00:00")
+
+        self.db.conn.execute("BEGIN EXCLUSIVE;")
+        self.assertEqual(logger.flush(), 0)
+        self.db.conn.rollback()
+
+        self.assertEqual(logger.flush(), 1)
+        self.assertEqual(logger.spool.size(), 0)
+        logger.close()
+        self.assertEqual(self._count(SensorDatabase.get_sensor_table_name()), 1)
+
+    def test_killed_writer_process_loses_no_complete_record(self):
+        """
+        A writer process killed with SIGKILL leaves only whole, replayable records behind.
+        """
+        script = textwrap.dedent(
+            f"""
+            import sys
+            sys.path.insert(0, {os.getcwd()!r})
+            from database.spool import SpoolWriter
+            writer = SpoolWriter({self.spool_path!r}, fsync_policy=SpoolWriter.FSYNC_NEVER)
+            i = 0
+            while True:
+                writer.append_data({{
+                    "timestamp": "2025-06-12T10:00:00.%06d" % (i % 1000000),
+                    "lux": float(i), "temperature": 20.0, "humidity": 40.0,
+                }})
+                i += 1
+            """
+        )
+        process = subprocess.Popen([sys.executable, "-c", script])
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if os.path.exists(self.spool_path) and os.path.getsize(self.spool_path) > 200 * SpoolWriter.RECORD_SIZE:
+                break
+            time.sleep(0.01)
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+
+        complete = os.path.getsize(self.spool_path) // SpoolWriter.RECORD_SIZE
+        replayer = SpoolReplayer(self.spool_path, self.db)
+        self.assertEqual(replayer.replay(), complete)
+        self.assertEqual(replayer.corrupt_records, 0)
+        self.assertEqual(self._count(SensorDatabase.get_sensor_table_name()), min(complete, 1000000))
+
+
+if __name__ == "__main__":
+    main()
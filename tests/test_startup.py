@@ -0,0 +1,120 @@
+"""
+Unit tests for unattended start-up in main.py and the background maintenance worker.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+from time import monotonic
+from unittest import TestCase, main
+from unittest.mock import patch
+import main as entry_point
+from benchmarks.synthetic import FakeDHT11, FakeTSL2591, FakeINA219, generate_database
+from database.maintenance import BackgroundWorker
+from database.db import SensorDatabase
+from monitoring.metrics import REGISTRY
+
+
+class TestUnattendedStartup(TestCase):
+    """
+    Test suite for the non-interactive start-up path.
+    """
+
+    def setUp(self):
+        """
+        Create a synthetic database in a scratch directory.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "sensor_data.db")
+        self.export_dir = os.path.join(self.tmp_dir, "export")
+        generate_database(self.db_path, days=3, cells=3, rate_per_minute=1)
+        self.sensors = (FakeDHT11(), FakeTSL2591(), [FakeINA219(f"cell_{idx}") for idx in range(1, 4)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _run_main(self, *flags: str) -> str:
+        argv = ["--db", self.db_path, "--spool", os.path.join(self.tmp_dir, "sensor_data.spool"), "--cycles", "1", *flags]
+        output = io.StringIO()
+        with patch.object(entry_point, "setup_sensors", return_value=self.sensors), \
+                patch.object(entry_point, "_PROCESS_START", monotonic()), \
+                patch("builtins.input", side_effect=AssertionError("unattended start-up must not prompt")), \
+                contextlib.redirect_stdout(output):
+            entry_point.main(argv)
+        return output.getvalue()
+
+    def test_logs_first_sample_quickly_without_prompting(self):
+        """
+        Acquisition starts without any prompt and the export still completes in the background.
+        """
+        output = self._run_main("--export", "--export-dir", self.export_dir, "--maintenance")
+
+        self.assertLess(REGISTRY.gauge("time_to_first_sample_seconds").value, 2.0)
+        self.assertTrue(os.path.exists(os.path.join(self.export_dir, "sensor_data.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.export_dir, "cell_output.csv")))
+        self.assertIn("Integrity check passed", output)
+
+        db = SensorDatabase(self.db_path)
+        count = db.conn.execute(f"SELECT COUNT(*) FROM {SensorDatabase.get_sensor_table_name()};").fetchone()[0]
+        db.close_conn()
+        self.assertEqual(count, 3 * 1440 + 1)
+
+    def test_clear_flag_wipes_without_prompt(self):
+        """
+        --clear deletes existing rows before the first cycle logs new ones.
+        """
+        self._run_main("--clear")
+
+        db = SensorDatabase(self.db_path)
+        count = db.conn.execute(f"SELECT COUNT(*) FROM {SensorDatabase.get_cell_output_table_name()};").fetchone()[0]
+        db.close_conn()
+        self.assertEqual(count, 3)
+
+    def test_interactive_setup_survives_declined_prompt(self):
+        """
+        Declining the legacy prompt no longer trips over an unbound reader.
+        """
+        with patch("builtins.input", return_value="no"), contextlib.redirect_stdout(io.StringIO()) as output:
+            entry_point.run_interactive_setup(self.db_path)
+        self.assertIn("Data export aborted by user.", output.getvalue())
+
+    def test_legacy_database_is_migrated_after_logging_starts(self):
+        """
+        A database from before the change feed is numbered by the background worker.
+        """
+        legacy_path = os.path.join(self.tmp_dir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("CREATE TABLE sensor_data (timestamp TEXT PRIMARY KEY, lux REAL, temperature REAL, humidity REAL);")
+        conn.executemany("INSERT INTO sensor_data VALUES (?, 1.0, 20.0, 40.0);",
+                         [(f"2025-06-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",) for i in range(50000)])
+        conn.commit()
+        conn.close()
+        self.db_path = legacy_path
+
+        output = self._run_main()
+        self.assertIn("Change feed migration", output)
+        db = SensorDatabase(legacy_path)
+        changes = db.fetch_changes(SensorDatabase.get_sensor_table_name(), 0, 100000)
+        db.close_conn()
+        self.assertEqual([row[0] for row in changes], list(range(1, 50002)))
+
+    def test_worker_isolates_failing_tasks(self):
+        """
+        A failing background task is counted and does not stop later tasks.
+        """
+        worker = BackgroundWorker(self.db_path)
+        ran = []
+        worker.submit("broken", lambda: 1 / 0)
+        worker.submit("healthy", lambda: ran.append(True))
+        with contextlib.redirect_stdout(io.StringIO()):
+            worker.start()
+            worker.stop(timeout=10)
+        self.assertEqual((worker.failed, worker.completed), (1, 1))
+        self.assertEqual(ran, [True])
+
+
+if __name__ == "__main__":
+    main()